@@ -0,0 +1,100 @@
+"""Runs the benchmark suite and checks it against the stored baseline
+
+Run with `python -m benchmarks` from the repository root. The process exits
+with status 1 when any case is slower than its baseline, relative to the
+calibration case, by more than the threshold plus the noise measured in
+both, and `--update-baseline` records the new results instead, over three
+passes of the suite so the noise includes drift between passes. As relative
+costs still shift between interpreters and processors, the gate is skipped
+with a warning when the baseline was recorded on another machine or Python
+version.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from typing import List
+import argparse
+import json
+import os
+import platform
+import sys
+from benchmarks.suite import Timing, cases, combine, regressions, sample
+
+BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument("--baseline", default=BASELINE,
+                        help="the JSON file of baseline results")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="write the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="the allowed slowdown, as a fraction")
+    parser.add_argument("--filter", default="",
+                        help="only run cases whose name contains this")
+    parser.add_argument("--passes", type=int, default=None,
+                        help="the number of passes over the suite, three "
+                        "when updating the baseline and one otherwise")
+    parser.add_argument("--runs", type=int, default=5,
+                        help="the number of runs the median is taken over")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="the number of timing loops per run")
+    parser.add_argument("--budget", type=float, default=0.02,
+                        help="the seconds to spend on each timing loop")
+    args = parser.parse_args(argv)
+
+    host = {"python": platform.python_version(),
+            "machine": platform.machine()}
+    try:
+        with open(args.baseline) as fh:
+            stored = json.load(fh)
+    except FileNotFoundError:
+        stored = dict(host, results={})
+    baseline = {name: Timing(**timing)
+                for name, timing in stored["results"].items()}
+    comparable = all(stored.get(key) == value for key, value in host.items())
+
+    passes = args.passes or (3 if args.update_baseline else 1)
+    selected = [case for case in cases() if args.filter in case.name]
+    timings = {case.name: [] for case in selected}
+    for _ in range(passes):
+        for case in selected:
+            timings[case.name].append(sample(case, args.runs, args.repeat,
+                                             args.budget))
+
+    results = {}
+    for name, samples in timings.items():
+        timing = results[name] = combine(samples)
+        before = baseline.get(name)
+        change = (f"{timing.relative / before.relative - 1:+7.1%}"
+                  if before and before.relative else "    new")
+        print(f"{name:<24} {timing.cost:10.1f} ns "
+              f"±{timing.noise:6.1%} {change}")
+
+    if args.update_baseline:
+        if not comparable:
+            # Times from another host cannot be mixed with these
+            baseline.clear()
+        baseline.update(results)
+        with open(args.baseline, "w") as fh:
+            json.dump(dict(host, results={
+                name: timing._asdict()
+                for name, timing in sorted(baseline.items())}), fh, indent=2)
+            fh.write("\n")
+        return 0
+
+    if not comparable:
+        print(f"WARNING the baseline was recorded on Python "
+              f"{stored.get('python')} ({stored.get('machine')}), not "
+              f"{host['python']} ({host['machine']}), skipping the gate",
+              file=sys.stderr)
+        return 0
+    slower = regressions(results, baseline, args.threshold)
+    for name, ratio in slower.items():
+        print(f"REGRESSION {name}: {ratio:.2f}x baseline", file=sys.stderr)
+    return 1 if slower else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
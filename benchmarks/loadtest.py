@@ -0,0 +1,92 @@
+"""Measures the throughput and latency of a roll service under load
+
+Run with `python -m benchmarks.loadtest` from the repository root, which
+starts a local service in the same process unless `--port` or `--unix` name
+a running one.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from typing import List, Optional
+import argparse
+import asyncio
+import time
+from tabletoprandom.abstract.deck import Deck
+from tabletoprandom.service.client import RollClient
+from tabletoprandom.service.server import DEFAULT_HOST, RollService
+
+
+async def _session(client: RollClient, args: argparse.Namespace,
+                   latencies: List[float]) -> None:
+    for _ in range(args.requests):
+        start = time.perf_counter()
+        if args.deck:
+            await client.draw(args.deck, args.n)
+        else:
+            await client.roll(args.die, args.n)
+        latencies.append(time.perf_counter() - start)
+
+
+async def _connect(args: argparse.Namespace) -> RollClient:
+    if args.unix:
+        return await RollClient.connect_unix(args.unix)
+    return await RollClient.connect(args.host, args.port)
+
+
+async def run(args: argparse.Namespace) -> None:
+    service: Optional[RollService] = None
+    if args.port is None and args.unix is None:
+        # The local deck is large enough never to run out
+        cards = range(args.clients * args.requests * args.n)
+        service = RollService(decks={args.deck: Deck(cards)})
+        server = await service.start(args.host, 0)
+        args.port = server.sockets[0].getsockname()[1]
+    clients = [await _connect(args) for _ in range(args.connections)]
+    latencies: List[float] = []
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        _session(clients[i % len(clients)], args, latencies)
+        for i in range(args.clients)
+    ))
+    elapsed = time.perf_counter() - start
+    for client in clients:
+        await client.close()
+    if service is not None:
+        server.close()
+        await server.wait_closed()
+
+    latencies.sort()
+    total = len(latencies)
+    print(f"{total} requests in {elapsed:.2f} s, "
+          f"{total / elapsed:,.0f} requests/s, "
+          f"{total * args.n / elapsed:,.0f} results/s")
+    for q in (0.5, 0.9, 0.99):
+        latency = latencies[min(int(q * total), total - 1)]
+        print(f"p{q * 100:g} latency {latency * 1e3:.2f} ms")
+    if service is not None:
+        print(f"{service.requests} requests served by {service.batches} "
+              f"batches, {service.requests / service.batches:.1f} per batch")
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.loadtest")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int,
+                        help="the port of a running service")
+    parser.add_argument("--unix", help="the socket of a running service")
+    parser.add_argument("--connections", type=int, default=4)
+    parser.add_argument("--clients", type=int, default=200,
+                        help="the number of concurrent game sessions")
+    parser.add_argument("--requests", type=int, default=50,
+                        help="the number of requests each session makes")
+    parser.add_argument("--die", default="3d6",
+                        help="the die or notation each request rolls")
+    parser.add_argument("--deck", help="draw from this deck instead")
+    parser.add_argument("-n", type=int, default=1,
+                        help="the results asked for by each request")
+    asyncio.run(run(parser.parse_args(argv)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""Measures the per-call cost of rolling and querying the built in dice
+
+Run with `python -m benchmarks.roll_cost` from the repository root. Each
+traditional die is timed against a reference die that rebuilds its set of
+faces on every call, as dice did before their faces were indexed once on
+construction, and the speedup of the indexed die is reported alongside.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from typing import Dict, Optional, Set
+import random
+import timeit
+from tabletoprandom.dice.traditional import TraditionalDie
+from tabletoprandom.dice.enumdie import EnumDie, IntEnumDie
+from tabletoprandom.dice.enumdie import ElementValue, FudgeValue
+
+
+class RebuiltDie:
+    """A reference die that, like the original dice, builds a new set of
+    its faces for every roll and lookup"""
+
+    def __init__(self, n: int) -> None:
+        self.num_faces = n
+
+    @property
+    def faces(self) -> Set[int]:
+        return set(range(1, self.num_faces + 1))
+
+    def roll(self) -> int:
+        return random.choice(tuple(self.faces))
+
+    def probability(self, face: int) -> float:
+        return 1 / self.num_faces if face in self.faces else 0.0
+
+    @property
+    def mode(self) -> Set[int]:
+        return self.faces
+
+    @property
+    def best_roll(self) -> int:
+        return max(self.faces)
+
+    @property
+    def worst_roll(self) -> int:
+        return min(self.faces)
+
+
+DICE = {
+    "d6": TraditionalDie(6),
+    "d20": TraditionalDie(20),
+    "d100": TraditionalDie(100),
+    "dE": EnumDie(ElementValue),
+    "dF": IntEnumDie(FudgeValue),
+}
+
+REFERENCES = {
+    "d6": RebuiltDie(6),
+    "d20": RebuiltDie(20),
+    "d100": RebuiltDie(100),
+}
+
+STATEMENTS = {
+    "roll": "die.roll()",
+    "probability": "die.probability(face)",
+    "mode": "die.mode",
+}
+
+NUMERIC_STATEMENTS = {
+    "best_roll": "die.best_roll",
+    "worst_roll": "die.worst_roll",
+}
+
+
+def measure(statement: str, die, repeat: int = 5, number: int = 100000
+            ) -> float:
+    """Returns the best per-call time of `statement` in nanoseconds"""
+    namespace = {"die": die, "face": next(iter(die.faces))}
+    timer = timeit.Timer(statement, globals=namespace)
+    return min(timer.repeat(repeat, number)) / number * 1e9
+
+
+def compare(repeat: int = 5, number: int = 100000
+            ) -> Dict[str, Dict[str, Optional[float]]]:
+    """Returns the cost of every statement on every die, with the cost on
+    its reference die where one exists, as pairs of nanoseconds"""
+    results = {}
+    for name, die in DICE.items():
+        statements = dict(STATEMENTS)
+        if hasattr(die, "best_roll"):
+            statements.update(NUMERIC_STATEMENTS)
+        reference = REFERENCES.get(name)
+        results[name] = {
+            label: (measure(statement, die, repeat, number),
+                    None if reference is None
+                    else measure(statement, reference, repeat, number))
+            for label, statement in statements.items()
+        }
+    return results
+
+
+def main() -> None:
+    for name, costs in compare().items():
+        for label, (cost, before) in costs.items():
+            line = f"{name:>5} {label:<12} {cost:8.1f} ns"
+            if before is not None:
+                line += f"  was {before:8.1f} ns, {before / cost:5.1f}x"
+            print(line)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,216 @@
+"""The benchmark cases for the roll, draw and shuffle hot paths
+
+Each case times one statement against objects built by its setup, and
+reports the cost of a single operation in nanoseconds, so cases that drain a
+whole deck per statement divide by the number of cards drawn. A case with a
+`reset` runs it, untimed, before every statement, so draining a deck is not
+charged for refilling it; refilling is timed by its own case instead.
+
+The gate compares `sample`s rather than single timings: each case is timed
+over several runs, every run alongside a fixed calibration case, and the
+median ratio of the two is kept with the spread of the runs, and baselines
+`combine` several passes of the whole suite to also capture how the host
+drifts over minutes. Dividing by the calibration cancels out the host
+slowing down as a whole, and the spread lets `regressions` tell a real
+slowdown from noise.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from array import array
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence
+import random
+import statistics
+import timeit
+from tabletoprandom.abstract.deck import Deck
+from tabletoprandom.dice.traditional import TraditionalDie
+from tabletoprandom.dice.enumdie import EnumDie, IntEnumDie
+from tabletoprandom.dice.enumdie import ElementValue, FudgeValue
+
+DIE_SIZES = (4, 6, 20, 100)
+DECK_SIZES = (52, 520, 5200)
+ROLLS = 100
+PEEK = 5
+SEED = 1
+
+
+class Case(NamedTuple):
+    """A single benchmark, `statement` is run in the namespace returned by
+    `setup` and counts as `operations` operations, after an untimed `reset`
+    when one is given"""
+    name: str
+    statement: str
+    setup: Callable[[], Dict[str, object]]
+    operations: int = 1
+    reset: Optional[str] = None
+
+
+class Timing(NamedTuple):
+    """The median cost of one operation of a case over several runs, in
+    nanoseconds and as a multiple of the calibration case timed alongside
+    it, and the relative noise of the runs"""
+    cost: float
+    relative: float
+    noise: float
+
+
+def _die(n: int) -> Callable[[], Dict[str, object]]:
+    def setup() -> Dict[str, object]:
+        die = TraditionalDie(n, rng=random.Random(SEED))
+        return {"die": die, "face": 1, "rng": random.Random(SEED),
+                "buffer": array('l', [0]) * ROLLS}
+    return setup
+
+
+def _enum_die(face_enum, die_type) -> Callable[[], Dict[str, object]]:
+    def setup() -> Dict[str, object]:
+        die = die_type(face_enum, rng=random.Random(SEED))
+        return {"die": die, "face": next(iter(face_enum)),
+                "face_enum": face_enum, "die_type": die_type,
+                "rng": random.Random(SEED)}
+    return setup
+
+
+def _deck(size: int) -> Callable[[], Dict[str, object]]:
+    def setup() -> Dict[str, object]:
+        # Cards repeat every 52, as a stack of standard decks would
+        deck = Deck((i % 52 for i in range(size)), rng=random.Random(SEED))
+        deck.shuffle()
+        return {"deck": deck, "draw": deck.draw, "size": size}
+    return setup
+
+
+def _calibration() -> Dict[str, object]:
+    return {"values": random.Random(SEED).sample(range(64), 64)}
+
+
+CALIBRATION = Case("calibration", "sorted(values)", _calibration)
+"""A case that does not depend on this package, timed alongside every case
+to measure how fast the host is running at the time"""
+
+
+def cases() -> List[Case]:
+    """Returns every benchmark case in a stable order"""
+    found = []
+    for n in DIE_SIZES:
+        setup = _die(n)
+        found += [
+            Case(f"roll/d{n}", "die.roll()", setup),
+            Case(f"rolls/d{n}x{ROLLS}", f"for _ in die.rolls({ROLLS}): pass",
+                 setup, ROLLS),
+            Case(f"roll_array/d{n}x{ROLLS}", f"die.roll_array({ROLLS})",
+                 setup, ROLLS),
+            Case(f"rolls_into/d{n}x{ROLLS}", "die.rolls_into(buffer)",
+                 setup, ROLLS),
+            Case(f"quick_roll/d{n}", f"die.quick_roll({n}, rng)", setup),
+            Case(f"probability/d{n}", "die.probability(face)", setup),
+            Case(f"mode/d{n}", "die.mode", setup),
+            Case(f"best_roll/d{n}", "die.best_roll", setup),
+        ]
+    for face_enum, die_type in ((ElementValue, EnumDie),
+                                (FudgeValue, IntEnumDie)):
+        setup = _enum_die(face_enum, die_type)
+        name = face_enum.__name__
+        found += [
+            Case(f"roll/{name}", "die.roll()", setup),
+            Case(f"quick_roll/{name}", "die_type.quick_roll(face_enum, rng)",
+                 setup),
+        ]
+    for size in DECK_SIZES:
+        setup = _deck(size)
+        found += [
+            Case(f"draw/deck{size}", "for _ in range(size): draw()",
+                 setup, size, "deck.reset()"),
+            Case(f"draw_many/deck{size}", "deck.draw_many(size)",
+                 setup, size, "deck.reset()"),
+            Case(f"reset/deck{size}", "deck.reset()", setup,
+                 reset="deck.draw_many(size)"),
+            Case(f"shuffle/deck{size}", "deck.shuffle()", setup),
+            Case(f"peek/deck{size}", f"deck.peek({PEEK})", setup),
+            Case(f"pool/deck{size}", "deck.pool[0]", setup),
+        ]
+    return found
+
+
+def _timer(case: Case, budget: float, number: int = None
+           ) -> Callable[[], float]:
+    """Returns a function timing one loop of `number` statements of a case,
+    or of enough to take about `budget` seconds, in nanoseconds per
+    operation"""
+    timer = timeit.Timer(case.statement, case.reset or "pass",
+                         globals=case.setup())
+
+    def loop(number: int) -> float:
+        if case.reset is None:
+            return timer.timeit(number)
+        # The timer runs its setup, the reset, before starting the clock
+        return sum(timer.timeit(1) for _ in range(number))
+
+    if number is None:
+        if case.reset is None:
+            number, elapsed = timer.autorange()
+        else:
+            number, elapsed = 1, loop(1)
+        number = max(int(number * budget / max(elapsed, 1e-9)), 1)
+    scale = 1e9 / number / case.operations
+    return lambda: loop(number) * scale
+
+
+def measure(case: Case, repeat: int = 5, budget: float = 0.2,
+            number: int = None) -> float:
+    """Returns the best cost of one operation of a case in nanoseconds,
+    timing loops of `number` statements, or loops sized to take about
+    `budget` seconds each when `number` is not given"""
+    loop = _timer(case, budget, number)
+    return min(loop() for _ in range(repeat))
+
+
+def sample(case: Case, runs: int = 5, repeat: int = 3, budget: float = 0.02
+           ) -> Timing:
+    """Returns the median timing of a case over `runs` runs, each the best
+    of `repeat` loops, with loops of the calibration case interleaved so
+    that both see the same load on the host
+
+    The noise is the median absolute deviation of the runs, which unlike
+    their range is not set by a single unlucky run."""
+    loop = _timer(case, budget)
+    calibrate = _timer(CALIBRATION, budget)
+    costs, ratios = [], []
+    for _ in range(runs):
+        pairs = [(loop(), calibrate()) for _ in range(repeat)]
+        cost = min(cost for cost, _ in pairs)
+        costs.append(cost)
+        ratios.append(cost / min(calibration for _, calibration in pairs))
+    relative = statistics.median(ratios)
+    noise = statistics.median(abs(ratio - relative) for ratio in ratios)
+    return Timing(statistics.median(costs), relative, noise / relative)
+
+
+def combine(timings: Sequence[Timing]) -> Timing:
+    """Returns the median of timings of the same case from separate passes
+    of the suite, whose noise is the larger of their own noise and the
+    largest relative deviation of a pass from the median, as the load on the
+    host drifts more between passes than between the runs of one pass"""
+    relative = statistics.median(timing.relative for timing in timings)
+    drift = max(abs(timing.relative - relative) for timing in timings)
+    noise = max(drift / relative,
+                statistics.median(timing.noise for timing in timings))
+    return Timing(statistics.median(timing.cost for timing in timings),
+                  relative, noise)
+
+
+def regressions(results: Dict[str, Timing], baseline: Dict[str, Timing],
+                threshold: float) -> Dict[str, float]:
+    """Returns the ratio of result to baseline, relative to the calibration,
+    for every case that is slower than its baseline by more than
+    `threshold`, a fraction, plus the noise of both the result and the
+    baseline"""
+    slower = {}
+    for name, result in results.items():
+        before = baseline.get(name)
+        if before is None or not before.relative:
+            continue
+        ratio = result.relative / before.relative
+        if ratio > 1 + threshold + before.noise + result.noise:
+            slower[name] = ratio
+    return slower
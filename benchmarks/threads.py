@@ -0,0 +1,131 @@
+"""Stress tests rolling and drawing from shared objects across threads
+
+Run with `python -m benchmarks.threads` from the repository root. Every
+case is run by 1, 2, 4 and 8 threads sharing one thread safe die or locked
+deck, and the total throughput is reported alongside its scaling over a
+single thread. With the GIL, rolls cannot scale past a single thread and
+locked decks serialise by design. Per-thread generators share no state
+between threads, so rolls may scale on a free-threaded build of CPython,
+but that has not been measured; run this there before relying on it.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from time import perf_counter
+from typing import Callable, Dict, List, NamedTuple
+import argparse
+import sys
+import threading
+from tabletoprandom.abstract.concurrency import LockedDeck
+from tabletoprandom.abstract.concurrency import ThreadSafeRollable
+from tabletoprandom.abstract.streams import RandomStreams
+from tabletoprandom.decks.indexed import IndexedDeck
+from tabletoprandom.dice.magical import MagicalDie
+from tabletoprandom.dice.traditional import TraditionalDie
+
+THREADS = (1, 2, 4, 8)
+SEED = 1
+
+
+class StressCase(NamedTuple):
+    """A stress case, `work` is called with the shared object and returns
+    the number of operations it performed"""
+    name: str
+    shared: Callable[[], object]
+    work: Callable[[object], int]
+
+
+def _roll(die: ThreadSafeRollable) -> int:
+    roll = die.roll
+    for _ in range(1000):
+        roll()
+    return 1000
+
+
+def _roll_array(die: ThreadSafeRollable) -> int:
+    die.roll_array(1000)
+    return 1000
+
+
+def _draw(deck: LockedDeck) -> int:
+    draw = deck.draw
+    for _ in range(100):
+        draw()
+    deck.replace_all()
+    return 100
+
+
+def cases() -> List[StressCase]:
+    streams = RandomStreams(SEED)
+    return [
+        StressCase("roll/d20", lambda: ThreadSafeRollable(
+            TraditionalDie(20), streams.child(0)), _roll),
+        StressCase("roll/magical", lambda: ThreadSafeRollable(
+            MagicalDie(20, charge=10 ** 6), streams.child(1)), _roll),
+        StressCase("roll_array/d20", lambda: ThreadSafeRollable(
+            TraditionalDie(20), streams.child(2)), _roll_array),
+        StressCase("draw/indexed", lambda: LockedDeck(
+            IndexedDeck(range(52 * 6), rng=streams.stream(0))), _draw),
+    ]
+
+
+def run(case: StressCase, threads: int, duration: float = 0.5) -> float:
+    """Returns the total operations per second of `threads` threads all
+    working on one shared object for about `duration` seconds"""
+    shared = case.shared()
+    totals = [0] * threads
+    barrier = threading.Barrier(threads + 1)
+    stop = threading.Event()
+
+    def worker(index: int) -> None:
+        barrier.wait()
+        count = 0
+        while not stop.is_set():
+            count += case.work(shared)
+        totals[index] = count
+
+    workers = [threading.Thread(target=worker, args=(i,))
+               for i in range(threads)]
+    for thread in workers:
+        thread.start()
+    barrier.wait()
+    start = perf_counter()
+    stop.wait(duration)
+    stop.set()
+    for thread in workers:
+        thread.join()
+    return sum(totals) / (perf_counter() - start)
+
+
+def gil_enabled() -> bool:
+    """Returns whether the interpreter is running with the GIL"""
+    is_enabled = getattr(sys, "_is_gil_enabled", None)
+    return True if is_enabled is None else is_enabled()
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.threads")
+    parser.add_argument("--filter", default="",
+                        help="only run cases whose name contains this")
+    parser.add_argument("--duration", type=float, default=0.5,
+                        help="the seconds to run each thread count for")
+    parser.add_argument("--threads", type=int, nargs="+", default=THREADS,
+                        help="the thread counts to run")
+    args = parser.parse_args(argv)
+
+    print(f"GIL {'enabled' if gil_enabled() else 'disabled'}")
+    for case in cases():
+        if args.filter not in case.name:
+            continue
+        results: Dict[int, float] = {}
+        for threads in args.threads:
+            results[threads] = run(case, threads, args.duration)
+            base = results[args.threads[0]]
+            print(f"{case.name:<16} {threads:>3} threads "
+                  f"{results[threads]:>14,.0f} op/s "
+                  f"{results[threads] / base:>6.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -12,7 +12,7 @@ setuptools.setup(
     long_description=long_description,
     long_description_content_type="text/markdown",
     url="https://github.com/Kairosite/Tabletop-Randomness",
-    packages=setuptools.find_packages(),
+    packages=setuptools.find_packages(exclude=["benchmarks"]),
     classifiers=[
         "Development Status :: 1 - Planning",
         "Intended Audience :: Developers",
@@ -22,4 +22,7 @@ setuptools.setup(
         "Topic :: Games/Entertainment :: Board Games",
     ],
     python_requires='>=3.8',
+    extras_require={
+        "numpy": ["numpy"],
+    },
 )
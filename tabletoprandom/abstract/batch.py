@@ -0,0 +1,173 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from array import array
+from typing import Callable, Sequence, Tuple
+import random
+import struct
+import sys
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover - exercised without numpy installed
+    numpy = None
+
+HAS_NUMPY = numpy is not None
+"""Whether the vectorised numpy backend is available"""
+
+CHUNK = 1 << 16
+"""The most values produced at once when filling a buffer"""
+
+INTEGER_FORMATS = frozenset("bBhHiIlLqQnN")
+
+_BYTE_ORDERS = {"<": "little", ">": "big", "!": "big"}
+
+
+def int_array(values: Sequence[int]):
+    """Packs a sequence of integers into the preferred integer array type
+
+    Returns a numpy `int64` array when numpy is installed, or an `array('l')`
+    otherwise."""
+    if HAS_NUMPY:
+        return numpy.asarray(values, dtype=numpy.int64)
+    return array('l', values)
+
+
+def randint_array(low: int, high: int, n: int, rng=random):
+    """Returns `n` uniform random integers from `low` to `high` inclusive
+
+    Parameters
+    ----------
+    low : int
+        The lowest value that may be generated
+    high : int
+        The highest value that may be generated
+    n : int
+        The number of values requested, values below one give an empty array
+    rng : random.Random
+        The generator the values are drawn from, the numpy backend is seeded
+        from this generator so seeding it reproduces the output of both
+        backends
+
+    Returns
+    -------
+    numpy.ndarray or array
+        A numpy `int64` array when numpy is installed, otherwise an
+        `array('l')`
+    """
+    n = max(n, 0)
+    if HAS_NUMPY:
+        generator = numpy.random.default_rng(rng.getrandbits(64))
+        return generator.integers(low, high, size=n, endpoint=True,
+                                  dtype=numpy.int64)
+    return array('l', rng.choices(range(low, high + 1), k=n))
+
+
+def _native_format(view: memoryview) -> str:
+    """Returns the native array typecode of a memoryview's integer format,
+    resolving the standard sizes of formats with a byte order prefix"""
+    code = view.format.lstrip("@=<>!")
+    if code not in INTEGER_FORMATS:
+        raise TypeError(f"The buffer must hold integers, not {view.format!r}")
+    order = _BYTE_ORDERS.get(view.format[:1])
+    if order is not None and order != sys.byteorder:
+        raise TypeError(f"The buffer must be in native byte order, not "
+                        f"{view.format!r}")
+    if view.format[:1] in "@" + code:
+        return code
+    # Prefixed formats use standard sizes, which may differ from the native
+    # size of the same code, such as 4 byte `<l` against 8 byte `l`
+    for native in ("bhilq" if code.islower() else "BHILQ"):
+        if struct.calcsize(native) == view.itemsize:
+            return native
+    raise TypeError(f"The buffer must hold integers, not {view.format!r}")
+
+
+def integer_bounds(code: str) -> Tuple[int, int]:
+    """Returns the smallest and largest integer a native typecode holds"""
+    bits = 8 * struct.calcsize(code)
+    if code.islower():
+        return -(1 << (bits - 1)), (1 << (bits - 1)) - 1
+    return 0, (1 << bits) - 1
+
+
+def _extent(values: Sequence[int]) -> Tuple[int, int]:
+    if HAS_NUMPY and isinstance(values, numpy.ndarray):
+        return int(values.min()), int(values.max())
+    return min(values), max(values)
+
+
+def writable_view(buffer) -> memoryview:
+    """Returns a flat, writable memoryview of a buffer of integers
+
+    Buffers whose format has a byte order prefix, such as ctypes arrays, are
+    viewed with the equivalent native typecode. Raises a `TypeError` for a
+    read-only buffer, one that does not hold integers or one that is not in
+    native byte order, and a `ValueError` for a multidimensional or prefixed
+    buffer that is not contiguous."""
+    view = memoryview(buffer)
+    if view.readonly:
+        raise TypeError("The buffer must be writable")
+    code = _native_format(view)
+    if view.ndim != 1 or code != view.format:
+        if not view.c_contiguous:
+            raise ValueError("A multidimensional buffer must be contiguous")
+        view = view.cast("B").cast(code)
+    return view
+
+
+def fill(buffer, produce: Callable[[int], Sequence[int]],
+         chunk: int = CHUNK) -> int:
+    """Fills a writable buffer of integers in place from a producer
+
+    Parameters
+    ----------
+    buffer : buffer
+        Any writable object supporting the buffer protocol whose items are
+        integers, such as an `array`, a `memoryview` or a numpy array,
+        multidimensional buffers are filled in C order
+    produce : Callable[[int], Sequence[int]]
+        Returns up to the requested number of integers, at most `chunk` are
+        requested at once and filling stops early if it returns fewer
+    chunk : int
+        The most integers requested from the producer at once, bounding the
+        memory used alongside the buffer
+
+    Returns
+    -------
+    int
+        The number of items of the buffer filled, from the start
+
+    Raises
+    ------
+    ValueError
+        If a value does not fit the buffer's integer type, checked for each
+        chunk before it is written, so earlier chunks are already filled
+    """
+    view = writable_view(buffer)
+    total = len(view)
+    low, high = integer_bounds(view.format)
+    # Numpy writes any integer sequence straight into the buffer, otherwise
+    # chunks are packed to the buffer's type first
+    target = numpy.asarray(view) if HAS_NUMPY else view
+    filled = 0
+    while filled < total:
+        size = min(chunk, total - filled)
+        values = produce(size)
+        produced = len(values)
+        if produced:
+            smallest, largest = _extent(values)
+            if smallest < low or largest > high:
+                raise ValueError(
+                    f"The values {smallest} to {largest} do not fit a "
+                    f"buffer of {view.format!r}, which holds {low} to {high}")
+        if HAS_NUMPY:
+            target[filled:filled + produced] = values
+        else:
+            if getattr(values, "typecode", None) != view.format:
+                values = array(view.format, values)
+            view[filled:filled + produced] = memoryview(values)
+        filled += produced
+        if produced < size:
+            break
+    return filled
@@ -0,0 +1,250 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from collections import Counter as counter
+from functools import wraps
+from typing import Counter, Dict, List, Mapping, MutableSequence, Sequence
+from typing import TypeVar
+import random
+import threading
+from tabletoprandom.abstract.primitives import FiniteDrawable, Rollable
+from tabletoprandom.abstract.streams import RandomStreams
+
+T = TypeVar('T')
+
+
+class _Last(threading.local):
+    value = None
+
+
+class ThreadLocalRandom:
+    """A stand-in for a `random.Random` that gives every thread its own
+    generator, so threads never contend for or corrupt a shared generator
+
+    Each thread is handed the next unused stream of `streams` the first time
+    it draws, so runs are reproducible for a fixed seed and a fixed order in
+    which threads first draw. Every method of `random.Random` is available
+    and is called on the generator of the thread that looks it up, so bound
+    methods should not be handed between threads. The methods dice and decks
+    draw from are defined directly, and the rest are found by attribute
+    lookup."""
+
+    def __init__(self, streams: RandomStreams = None) -> None:
+        self.streams = RandomStreams() if streams is None else streams
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    @property
+    def generator(self) -> random.Random:
+        """Returns the generator of the current thread"""
+        try:
+            return self._local.generator
+        except AttributeError:
+            with self._lock:
+                generator = self.streams.spawn()[0]
+            self._local.generator = generator
+            return generator
+
+    def random(self) -> float:
+        return self.generator.random()
+
+    def getrandbits(self, k: int) -> int:
+        return self.generator.getrandbits(k)
+
+    def randrange(self, *args, **kwargs) -> int:
+        return self.generator.randrange(*args, **kwargs)
+
+    def randint(self, a: int, b: int) -> int:
+        return self.generator.randint(a, b)
+
+    def uniform(self, a: float, b: float) -> float:
+        return self.generator.uniform(a, b)
+
+    def choice(self, seq: Sequence[T]) -> T:
+        return self.generator.choice(seq)
+
+    def choices(self, population: Sequence[T], *args, **kwargs) -> List[T]:
+        return self.generator.choices(population, *args, **kwargs)
+
+    def sample(self, population: Sequence[T], *args, **kwargs) -> List[T]:
+        return self.generator.sample(population, *args, **kwargs)
+
+    def shuffle(self, x: MutableSequence) -> None:
+        self.generator.shuffle(x)
+
+    def __getattr__(self, name: str):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self.generator, name)
+
+    def __repr__(self) -> str:
+        return f"ThreadLocalRandom({self.streams!r})"
+
+
+class ThreadSafeRollable(Rollable[T]):
+    """Wraps a rollable so that it can be rolled from many threads at once
+
+    The wrapped rollable is given a `ThreadLocalRandom` to roll from and
+    `last_roll` is tracked per thread, so single rolls take no lock and
+    write no state shared between threads, while `roll_array` also leaves
+    the wrapped rollable's own `last_roll` to whichever thread wrote last.
+    Anything else is read from the wrapped rollable, which should hold no
+    other mutable state, except for magical dice whose charge is spent
+    atomically.
+
+    The wrapped rollable itself is changed to roll from the thread local
+    generator, so any other code rolling it directly also rolls from the
+    wrapper's streams until `unwrap` restores its previous generator.
+
+    Attributes:
+        rollable: the wrapped rollable
+    """
+    __slots__ = ('rollable', '_last', '_previous_rng')
+
+    def __init__(self, rollable: Rollable[T], streams: RandomStreams = None
+                 ) -> None:
+        self._last = _Last()
+        super().__init__(ThreadLocalRandom(streams))
+        self.rollable = rollable
+        self._previous_rng = rollable.rng
+        rollable.rng = self.rng
+
+    def unwrap(self) -> Rollable[T]:
+        """Restores the wrapped rollable's own generator and returns it, the
+        wrapper must not be rolled afterwards"""
+        self.rollable.rng = self._previous_rng
+        return self.rollable
+
+    @property
+    def last_roll(self) -> T:
+        """Returns the last roll made by the current thread"""
+        return self._last.value
+
+    @last_roll.setter
+    def last_roll(self, value: T) -> None:
+        self._last.value = value
+
+    def __roll__(self) -> T:
+        return self.rollable.__roll__()
+
+    def roll(self) -> T:
+        value = self._last.value = self.rollable.__roll__()
+        return value
+
+    def roll_array(self, n: int):
+        """Returns the results of `n` rolls of the wrapped rollable in a
+        single call, using its vectorised roller"""
+        results = self.rollable.roll_array(n)
+        if len(results):
+            self._last.value = results[-1]
+        return results
+
+    __next__ = roll
+
+    def __getattr__(self, name: str):
+        if name.startswith('_') or name == 'rollable':
+            raise AttributeError(name)
+        return getattr(self.rollable, name)
+
+    def __str__(self) -> str:
+        return str(self.rollable)
+
+
+class LockedDeck(FiniteDrawable[T]):
+    """Wraps a finite drawable, such as a deck, so that it can be drawn from
+    many threads at once
+
+    Every operation on the wrapped deck holds `lock`, a reentrant lock that
+    callers can also hold to group several operations atomically, such as
+    peeking and then drawing. `last_draw` is tracked per thread, and `pool`,
+    `drawn` and `peek` return copies taken under the lock rather than views.
+    Any other method of the wrapped deck is called under the lock.
+
+    Attributes:
+        deck: the wrapped deck
+        lock: the lock held by every operation on the deck
+    """
+
+    def __init__(self, deck: FiniteDrawable[T]) -> None:
+        super().__init__(deck.rng)
+        self.deck = deck
+        self.lock = threading.RLock()
+        self._last = _Last()
+
+    @property
+    def last_draw(self) -> T:
+        """Returns the last card drawn by the current thread"""
+        return self._last.value
+
+    @last_draw.setter
+    def last_draw(self, value: T) -> None:
+        self._last.value = value
+
+    def __draw__(self) -> T:
+        with self.lock:
+            return self.deck.__draw__()
+
+    def draw_many(self, n: int) -> List[T]:
+        """Draws up to `n` cards at once while holding the lock, so they
+        are a contiguous run of the deck"""
+        with self.lock:
+            cards = self.deck.draw_many(n)
+        if cards:
+            self._last.value = cards[-1]
+        return cards
+
+    @property
+    def drawn(self) -> Counter[T]:
+        """Returns a copy of the counter of cards drawn from the deck"""
+        with self.lock:
+            return counter(self.deck.drawn)
+
+    @property
+    def pool(self) -> Mapping[T, int]:
+        """Returns a copy of the undrawn cards of the deck"""
+        with self.lock:
+            return dict(self.deck.pool)
+
+    def peek(self, n: int = 1) -> List[T]:
+        """Returns a copy of the top N cards of the deck"""
+        with self.lock:
+            return list(self.deck.peek(n))
+
+    def replace(self, card: T) -> Dict[T, int]:
+        with self.lock:
+            return dict(self.deck.replace(card))
+
+    def replace_all(self) -> Dict[T, int]:
+        with self.lock:
+            return dict(self.deck.replace_all())
+
+    def probability_exactly(self, targets: Mapping[T, int], draws: int
+                            ) -> float:
+        with self.lock:
+            return self.deck.probability_exactly(targets, draws)
+
+    def probability_at_least(self, targets: Mapping[T, int], draws: int
+                             ) -> float:
+        with self.lock:
+            return self.deck.probability_at_least(targets, draws)
+
+    def __len__(self) -> int:
+        with self.lock:
+            return len(self.deck)
+
+    def __getattr__(self, name: str):
+        if name.startswith('_') or name in ('deck', 'lock'):
+            raise AttributeError(name)
+        attribute = getattr(self.deck, name)
+        if not callable(attribute):
+            return attribute
+
+        @wraps(attribute)
+        def locked(*args, **kwargs):
+            with self.lock:
+                return attribute(*args, **kwargs)
+
+        return locked
+
+    def __str__(self) -> str:
+        return str(self.deck)
@@ -1,64 +1,158 @@
 from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
-from typing import Counter, TypeVar, Deque, List, Iterable
-import random
+from typing import Counter, TypeVar, Deque, List, Iterable, Mapping
+from typing import NamedTuple, Tuple
 from collections import deque
 from collections import Counter as counter
+from itertools import islice
+from types import MappingProxyType
+import random
 from tabletoprandom.abstract.primitives import FiniteDrawable
 
 T = TypeVar('T')
 
 
+class DeckState(NamedTuple):
+    """The state of a `Deck` saved by a snapshot"""
+    cards: List[T]
+    initial: Tuple[T, ...]
+    drawn: Mapping[T, int]
+
+
 class Deck(FiniteDrawable[T]):
+    """A deck of cards drawn in order from the top
+
+    The undrawn pool and the drawn counter are maintained incrementally as
+    cards are drawn and returned, so `len`, `pool` and replacing cards cost
+    no more than the cards touched. The initial order of the deck is kept so
+    that `reset` can restore it in a single copy.
+    """
     deck: Deque[T]
-    drawn: Counter[T]
+
+    def __init__(self, cards: Iterable[T] = (), rng: random.Random = None
+                 ) -> None:
+        super().__init__(rng)
+        self._initial = tuple(cards)
+        self._initial_pool = counter(self._initial)
+        self.deck = deque(self._initial)
+        self._pool = counter(self._initial_pool)
+        self._pool_view = MappingProxyType(self._pool)
+        self._drawn = counter()
+
+    @property
+    def drawn(self) -> Counter[T]:
+        """Returns a counter of the cards currently drawn from the deck"""
+        return self._drawn
 
     @property
-    def pool(self) -> Counter[T]:
+    def pool(self) -> Mapping[T, int]:
         """Returns all the drawable, i.e. undrawn elements as an unordered
-        set"""
-        return counter(self.deck)
+        set, given as a read-only view that follows the deck"""
+        return self._pool_view
 
     def __draw__(self) -> T:
         """Draws a card from the top of the deck"""
-        card = self.deck.popleft()
-        self.drawn.update([card])
+        try:
+            card = self.deck.popleft()
+        except IndexError:
+            raise StopIteration
+        remaining = self._pool[card] - 1
+        if remaining:
+            self._pool[card] = remaining
+        else:
+            del self._pool[card]
+        self._drawn[card] += 1
         return card
 
+    def draw_many(self, n: int) -> List[T]:
+        """Draws up to `n` cards from the top of the deck at once"""
+        popleft = self.deck.popleft
+        cards = [popleft() for _ in range(min(n, len(self.deck)))]
+        if cards:
+            pool = self._pool
+            pool.subtract(cards)
+            for card in set(cards):
+                if not pool[card]:
+                    del pool[card]
+            self._drawn.update(cards)
+            self.last_draw = cards[-1]
+        return cards
+
     def shuffle(self) -> None:
         """Shuffles the deck in place"""
         deck_list = list(self.deck)
-        random.shuffle(deck_list)
+        self.rng.shuffle(deck_list)
         self.deck = deque(deck_list)
 
     def return_cards(self, cards: Iterable[T], place_top: bool = False
-                     ) -> Counter[T]:
+                     ) -> Mapping[T, int]:
         """Returns an iterable of cards to the deck, they are returned to the
         bottom of the deck unless the `place_top` flag is set"""
+        cards = list(cards)
         if place_top:
             self.deck.extendleft(cards)
         else:
             self.deck.extend(cards)
-        self.drawn.subtract(cards)
+        self._pool.update(cards)
+        self._drawn.subtract(cards)
         return self.pool
 
     def return_card(self, card: T, place_top: bool = False
-                    ) -> Counter[T]:
+                    ) -> Mapping[T, int]:
         """Returns a single card to the deck, it is returned to the bottom of
         the deck unless the `place_top` flag is set"""
         return self.return_cards([card], place_top)
 
     replace = return_card
 
-    def replace_all(self) -> Counter[T]:
+    def replace_all(self) -> Mapping[T, int]:
         """Returns all drawn cards to the bottom of the deck and refreshes the
         drawn counter"""
-        pool = self.return_cards(self.drawn.elements())
-        self.drawn = counter()
-        return pool
+        drawn = +self._drawn
+        self.deck.extend(drawn.elements())
+        self._pool.update(drawn)
+        self._drawn.clear()
+        return self.pool
+
+    def reset(self) -> Mapping[T, int]:
+        """Restores the deck to its initial order and contents, discarding
+        any cards returned to it that it did not start with, and clears the
+        drawn counter"""
+        self.deck = deque(self._initial)
+        self._pool.clear()
+        self._pool.update(self._initial_pool)
+        self._drawn.clear()
+        return self.pool
 
     def peek(self, n: int = 1) -> List[T]:
         """Returns the top N elements of the list"""
-        n = min(n, len(self.deck))
-        return [self.deck[i] for i in range(n)]
+        return list(islice(self.deck, max(n, 0)))
+
+    def __len__(self) -> int:
+        return len(self.deck)
+
+    def _snapshot_state(self) -> DeckState:
+        """Returns the undrawn cards from the top, the initial cards and the
+        drawn counts, the state a snapshot saves"""
+        return DeckState(list(self.deck), self._initial, dict(self._drawn))
+
+    @classmethod
+    def _from_snapshot_state(cls, state: DeckState,
+                             rng: random.Random = None) -> 'Deck[T]':
+        """Returns a deck restored from the state of `_snapshot_state`"""
+        deck = cls(state.initial, rng)
+        deck.deck = deque(state.cards)
+        deck._pool.clear()
+        deck._pool.update(deck.deck)
+        deck._drawn.update(state.drawn)
+        return deck
+
+    def __getstate__(self) -> dict:
+        state = dict(self.__dict__)
+        del state['_pool_view']
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._pool_view = MappingProxyType(self._pool)
@@ -3,9 +3,12 @@ from __future__ import division
 from __future__ import print_function
 import abc
 import random
-from typing import Set, Sized, TypeVar, List
+from typing import FrozenSet, Iterable, Sized, TypeVar, List, TYPE_CHECKING
 from tabletoprandom.abstract.primitives import Rollable
 
+if TYPE_CHECKING:
+    from tabletoprandom.stats.moments import Moments
+
 T = TypeVar('T')
 
 
@@ -13,16 +16,44 @@ class Die(Rollable[T], Sized, abc.ABC):
     """A base class for dice to inherit from, defining some expectations
 
     Adds the basic die class with `faces`, `mode` and `probability` functions.
+    The faces of a die are indexed once on construction, by `_index_faces`,
+    into an immutable set and a tuple that every roll and lookup shares.
+    Subclasses may instead override `faces`, in which case the tables are
+    built from it the first time they are needed.
     """
+    __slots__ = ('_faces', '_face_tuple', '_face_order', '_moments')
+    _TABLES = frozenset(('_faces', '_face_tuple', '_face_order', '_moments'))
+
+    def __getattr__(self, name: str):
+        # Only reached when normal lookup fails, so indexed dice pay nothing
+        if name in self._TABLES and type(self).faces is not Die.faces:
+            self._index_faces(self.faces)
+            return object.__getattribute__(self, name)
+        if name == 'rng':
+            # Subclasses that skip `Rollable.__init__` roll with the global
+            # generator, as they did before dice had their own
+            return random
+        raise AttributeError(
+            f"{type(self).__name__!r} object has no attribute {name!r}")
+
+    def _index_faces(self, faces: Iterable[T]) -> None:
+        """Builds the immutable face tables of the die, expected to be called
+        once from the constructor of a concrete die"""
+        # The tuple keeps the given order, rather than the hash order of the
+        # set, so seeded rolls are the same in every process
+        self._face_tuple = tuple(dict.fromkeys(faces))
+        self._faces = frozenset(self._face_tuple)
+        self._face_order = None
+        self._moments = None
+
     @property
-    @abc.abstractmethod
-    def faces(self) -> Set[T]:
-        """Returns a set containing all the faces of the die"""
-        pass
+    def faces(self) -> FrozenSet[T]:
+        """Returns an immutable set containing all the faces of the die"""
+        return self._faces
 
     @property
     @abc.abstractmethod
-    def mode(self) -> Set[T]:
+    def mode(self) -> FrozenSet[T]:
         """Returns a set containing the most commonly rolled side(s)"""
         pass
 
@@ -54,11 +85,12 @@ T = TypeVar('T')
 
 class FairDie(Die[T]):
     """An inheritable class that implements the behaviour of a fair die"""
+    __slots__ = ()
     is_fair = True
 
     def __roll__(self) -> T:
         """Returns a face from a fair roll of the die"""
-        return random.choice(tuple(self.faces))
+        return self.rng.choice(self._face_tuple)
 
     def probability(self, face: T) -> float:
         """Returns the probability of a given value, or face, being rolled
@@ -82,7 +114,7 @@ class FairDie(Die[T]):
             return 0.0
 
     @property
-    def mode(self) -> Set[T]:
+    def mode(self) -> FrozenSet[T]:
         """Returns a set containing the most commonly rolled side(s)"""
         return self.faces
 
@@ -93,6 +125,7 @@ T = TypeVar('T')
 class MonotonicDie(Die[T]):
     """A base class for Monotonic Dice, those with orderable sides defining
     expectations"""
+    __slots__ = ()
 
     @property
     @abc.abstractmethod
@@ -119,18 +152,80 @@ N = TypeVar('N', float, int)
 class NumericDie(MonotonicDie[N]):
     """A base class for Numeric Dice to inherit from that provides relevant
     definitions"""
+    __slots__ = ()
+
+    def _index_faces(self, faces: Iterable[N]) -> None:
+        """Builds the immutable face tables of the die, including the
+        ascending face order"""
+        super()._index_faces(faces)
+        self._face_order = tuple(sorted(self._faces))
+
+    @property
+    def face_order(self) -> List[N]:
+        """Returns an ordered list of the die's faces"""
+        return list(self._face_order)
+
+    def _compute_moments(self) -> 'Moments':
+        """Calculates the moments of a roll of the die, override with a
+        closed form where one exists"""
+        # Imported here so the abstract dice do not depend on stats
+        from tabletoprandom.stats.moments import Moments
+        return Moments.from_probabilities(
+            (x, self.probability(x)) for x in self._face_order
+        )
+
+    @property
+    def moments(self) -> 'Moments':
+        """Returns the moments of a roll of the die, calculated once and
+        cached, which can be added together for pools of dice"""
+        if self._moments is None:
+            self._moments = self._compute_moments()
+        return self._moments
 
     @property
     def mean(self) -> float:
-        """Calculates and returns the geometric mean of the die"""
-        return sum([self.probability(x) * x for x in self.faces])
+        """Returns the geometric mean of the die"""
+        return self.moments.mean
+
+    @property
+    def variance(self) -> float:
+        """Returns the variance of a roll of the die"""
+        return self.moments.variance
+
+    @property
+    def std(self) -> float:
+        """Returns the standard deviation of a roll of the die"""
+        return self.moments.std
+
+    @property
+    def skewness(self) -> float:
+        """Returns the skewness of a roll of the die"""
+        return self.moments.skewness
+
+    def percentile(self, q: float) -> N:
+        """Returns the lowest face with at least a `q` chance of rolling at
+        or below it"""
+        if not 0.0 <= q <= 1.0:
+            raise ValueError("A percentile must be between 0 and 1")
+        cumulative = 0.0
+        for face in self._face_order:
+            cumulative += self.probability(face)
+            # Allow for the rounding of the cumulative sum
+            if cumulative >= q - 1e-12:
+                return face
+        return self._face_order[-1]
+
+    @property
+    def median(self) -> N:
+        """Returns the lower median face of the die"""
+        return self.percentile(0.5)
 
     @property
     def best_roll(self) -> N:
         """Returns the best, maximum, roll of the die"""
-        return max(self.faces)
+        return self._face_order[-1]
 
     @property
     def worst_roll(self) -> N:
         """Returns the worst, minimum, roll of the die"""
-        return min(self.faces)
+        return self._face_order[0]
@@ -0,0 +1,235 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from functools import wraps
+from time import perf_counter_ns
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+from weakref import WeakKeyDictionary
+import threading
+from tabletoprandom.abstract.primitives import Drawable, Rollable
+
+ROLL_METHODS = ('roll', '__next__', 'roll_array', 'rolls_into')
+DRAW_METHODS = ('draw', '__next__', 'draw_many', 'draws_into')
+HISTOGRAM_BUCKETS = 64
+
+
+class Counters:
+    """Counts of the operations performed by one object or one kind of
+    object while instrumentation is enabled
+
+    Attributes:
+        calls: the number of roll or draw operations called
+        items: the number of results those operations produced
+        nanoseconds: the total time spent in them, when timing is enabled
+        histogram: the number of timed calls in each power of two bucket of
+            nanoseconds, bucket `i` holding calls taking under `2 ** i`
+    """
+    __slots__ = ('calls', 'items', 'nanoseconds', 'histogram')
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.items = 0
+        self.nanoseconds = 0
+        self.histogram = [0] * HISTOGRAM_BUCKETS
+
+    def record(self, items: int, elapsed: Optional[int]) -> None:
+        self.calls += 1
+        self.items += items
+        if elapsed is not None:
+            self.nanoseconds += elapsed
+            self.histogram[min(elapsed.bit_length(),
+                               HISTOGRAM_BUCKETS - 1)] += 1
+
+    def as_dict(self) -> Dict[str, object]:
+        """Returns the counters as plain values, with the histogram given
+        sparsely as a mapping of bucket upper bounds to counts"""
+        return {
+            "calls": self.calls,
+            "items": self.items,
+            "nanoseconds": self.nanoseconds,
+            "histogram": {2 ** i: count
+                          for i, count in enumerate(self.histogram) if count},
+        }
+
+    def __repr__(self) -> str:
+        return (f"Counters(calls={self.calls}, items={self.items}, "
+                f"nanoseconds={self.nanoseconds})")
+
+
+class Event(NamedTuple):
+    """A single instrumented operation, as passed to callbacks
+
+    `elapsed` is the duration in nanoseconds, or `None` without timing."""
+    subject: object
+    kind: str
+    method: str
+    items: int
+    elapsed: Optional[int]
+
+
+class _State(threading.local):
+    depth = 0
+
+
+_local = _State()
+_patched: List[Tuple[type, str, Callable]] = []
+_objects: 'WeakKeyDictionary[object, Counters]' = WeakKeyDictionary()
+_totals: Dict[str, Counters] = {"roll": Counters(), "draw": Counters()}
+_callbacks: List[Callable[[Event], None]] = []
+_timing = False
+# Guards every counter and the per object table, which are shared by all
+# threads, so no counts are lost when objects are used from many threads
+_lock = threading.Lock()
+
+
+def _subclasses(base: type) -> List[type]:
+    found = [base]
+    for cls in found:
+        found.extend(sub for sub in cls.__subclasses__() if sub not in found)
+    return found
+
+
+def _one(result: object) -> int:
+    return 1
+
+
+def _returned(result: int) -> int:
+    return result
+
+
+def _counter(name: str) -> Callable[[object], int]:
+    """Returns how to count the items produced by a method from its result,
+    which is a single item, a sequence of items or a count of the items
+    written into a buffer"""
+    if name.endswith('_into'):
+        return _returned
+    if name.endswith(('_array', '_many')):
+        return len
+    return _one
+
+
+def _instrument(method: Callable, kind: str,
+                count: Callable[[object], int]) -> Callable:
+    name = method.__name__
+
+    @wraps(method)
+    def instrumented(self, *args, **kwargs):
+        # Only the outermost operation is counted, so bulk paths built on
+        # other instrumented methods are not counted twice
+        if _local.depth:
+            return method(self, *args, **kwargs)
+        _local.depth = 1
+        start = perf_counter_ns() if _timing else None
+        try:
+            result = method(self, *args, **kwargs)
+        finally:
+            _local.depth = 0
+        elapsed = None if start is None else perf_counter_ns() - start
+        items = count(result)
+        with _lock:
+            _totals[kind].record(items, elapsed)
+            try:
+                counters = _objects[self]
+            except KeyError:
+                counters = _objects[self] = Counters()
+            counters.record(items, elapsed)
+        if _callbacks:
+            event = Event(self, kind, name, items, elapsed)
+            for callback in _callbacks:
+                callback(event)
+        return result
+
+    return instrumented
+
+
+def enable(timing: bool = False) -> None:
+    """Starts counting the rolls and draws of every rollable and drawable
+
+    The roll and draw methods of every subclass defined so far are replaced
+    with counting versions, and put back by `disable`, so nothing is paid
+    for instrumentation while it is disabled. Classes defined after this
+    call are not instrumented until it is called again.
+
+    Parameters
+    ----------
+    timing : bool
+        Whether to time each operation and fill the timing histograms
+    """
+    global _timing
+    disable()
+    _timing = timing
+    for base, kind, names in ((Rollable, "roll", ROLL_METHODS),
+                              (Drawable, "draw", DRAW_METHODS)):
+        for cls in _subclasses(base):
+            for name in names:
+                method = cls.__dict__.get(name)
+                if method is None:
+                    continue
+                _patched.append((cls, name, method))
+                setattr(cls, name,
+                        _instrument(method, kind, _counter(name)))
+
+
+def disable() -> None:
+    """Restores the uninstrumented methods, keeping the counts so far"""
+    while _patched:
+        cls, name, method = _patched.pop()
+        setattr(cls, name, method)
+
+
+def is_enabled() -> bool:
+    """Returns whether instrumentation is currently enabled"""
+    return bool(_patched)
+
+
+def reset() -> None:
+    """Clears every per object and global counter"""
+    with _lock:
+        _objects.clear()
+        for kind in _totals:
+            _totals[kind] = Counters()
+
+
+def counters(subject: object) -> Counters:
+    """Returns the counters of a single die, deck or other object, which
+    are all zero if it has not been used while instrumented"""
+    with _lock:
+        return _objects.get(subject) or Counters()
+
+
+def totals(kind: str) -> Counters:
+    """Returns the global counters of either `"roll"` or `"draw"`"""
+    try:
+        return _totals[kind]
+    except KeyError:
+        raise ValueError(f"Unknown kind of operation {kind!r}")
+
+
+def subscribe(callback: Callable[[Event], None]) -> None:
+    """Calls `callback` with an `Event` after every instrumented operation"""
+    _callbacks.append(callback)
+
+
+def unsubscribe(callback: Callable[[Event], None]) -> None:
+    """Stops calling a callback given to `subscribe`"""
+    _callbacks.remove(callback)
+
+
+def snapshot() -> Dict[str, object]:
+    """Returns a JSON serialisable copy of every counter, for export to a
+    metrics pipeline, objects are identified by type, string and id"""
+    with _lock:
+        total_counts = {kind: total.as_dict()
+                        for kind, total in _totals.items()}
+        object_counts = [(subject, counter.as_dict())
+                         for subject, counter in _objects.items()]
+    return {
+        "enabled": is_enabled(),
+        "timing": _timing,
+        "totals": total_counts,
+        "objects": [
+            dict(type=type(subject).__name__, name=str(subject),
+                 id=id(subject), **counts)
+            for subject, counts in object_counts
+        ],
+    }
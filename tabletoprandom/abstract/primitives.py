@@ -2,7 +2,9 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 import abc
-from typing import Iterable, Counter, Sized, TypeVar
+import random
+from typing import Iterable, Counter, List, Mapping, Sequence, Sized, TypeVar
+from tabletoprandom.abstract.batch import fill
 
 T = TypeVar('T')
 
@@ -14,8 +16,15 @@ class Rollable(Iterable[T], abc.ABC):
     cannot be instansiated, it is an iterable, and supports a number of basic
     functions once the member `__roll__` function is implemented, likely not
     the default class to subclass unless working on some very unique mechanics.
+
+    Rolls are drawn from the `rng` attribute, a `random.Random` given on
+    construction, which defaults to the global `random` module generator.
     """
-    last_roll = None
+    __slots__ = ('last_roll', 'rng', '__weakref__')
+
+    def __init__(self, rng: random.Random = None) -> None:
+        self.last_roll = None
+        self.rng = random if rng is None else rng
 
     @abc.abstractmethod
     def __roll__(self) -> T:
@@ -48,6 +57,68 @@ class Rollable(Iterable[T], abc.ABC):
             n -= 1
             yield self.roll()
 
+    def roll_array(self, n: int) -> Sequence[T]:
+        """Returns the results of `n` rolls of the object in a single call
+
+        The default implementation rolls one at a time, subclasses with a
+        vectorised rolling mechanism should override this and return a packed
+        array. The `last_roll` attribute is updated to the final roll.
+
+        Parameters
+        ----------
+        n : int
+            The number of rolls requested
+
+        Returns
+        -------
+        Sequence[T]
+            The results of the rolls in the order they were rolled
+        """
+        results = [self.__roll__() for _ in range(n)]
+        if results:
+            self.last_roll = results[-1]
+        return results
+
+    def rolls_into(self, buffer) -> int:
+        """Fills a writable buffer of integers in place with rolls of the
+        object, without building the rolls as Python objects
+
+        The rolls come from `roll_array` a bounded chunk at a time and are
+        written straight into the buffer, so any number of rolls can be
+        streamed through fixed memory. The rolls must be integers and the
+        buffer's integer type must be wide enough to hold them.
+
+        Parameters
+        ----------
+        buffer : buffer
+            Any writable buffer of integers, such as an `array`, a
+            `memoryview` or a numpy array
+
+        Returns
+        -------
+        int
+            The number of rolls written, which is the length of the buffer
+        """
+        return fill(buffer, self.roll_array)
+
+    def __getstate__(self) -> dict:
+        # The global `random` module cannot be pickled, so it is stored as
+        # `None` and restored as the default generator on unpickling
+        state = dict(getattr(self, '__dict__', {}))
+        for cls in type(self).__mro__:
+            for name in cls.__dict__.get('__slots__', ()):
+                if name != '__weakref__' and hasattr(self, name):
+                    state[name] = getattr(self, name)
+        if state.get('rng') is random:
+            state['rng'] = None
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+        if self.rng is None:
+            self.rng = random
+
     def __iter__(self) -> T:
         return self
 
@@ -64,8 +135,16 @@ class Drawable(Iterable[T], abc.ABC):
     cannot be instansiated, it is an iterable, and supports a number of basic
     functions once the member `__draw__` function is implemented, likely not
     the default class to subclass unless working on some very unique mechanics.
+
+    Any randomness is drawn from the `rng` attribute, a `random.Random` given
+    on construction, which defaults to the global `random` module generator.
     """
     last_draw = None
+    rng = random
+
+    def __init__(self, rng: random.Random = None) -> None:
+        if rng is not None:
+            self.rng = rng
 
     @abc.abstractmethod
     def __draw__(self) -> T:
@@ -98,6 +177,25 @@ class Drawable(Iterable[T], abc.ABC):
             n -= 1
             yield self.draw()
 
+    def draw_many(self, n: int) -> List[T]:
+        """Returns the results of `n` draws in a single call
+
+        The default implementation draws one at a time, subclasses that can
+        take several elements at once should override this. The `last_draw`
+        attribute is updated to the final draw.
+
+        Parameters
+        ----------
+        n : int
+            The number of draws requested
+
+        Returns
+        -------
+        List[T]
+            The results of the draws in the order they were drawn
+        """
+        return list(self.draws(n))
+
     def __iter__(self) -> T:
         return self
 
@@ -162,6 +260,85 @@ class FiniteDrawable(Drawable[T], Sized):
         undrawn pool"""
         pass
 
+    def deal(self, hands: int, n: int) -> List[List[T]]:
+        """Deals `n` elements to each of a number of hands, one element to
+        each hand in turn, stopping early if the drawable is exhausted
+
+        Parameters
+        ----------
+        hands : int
+            The number of hands to deal
+        n : int
+            The number of elements dealt to each hand
+
+        Returns
+        -------
+        List[List[T]]
+            The dealt hands, in the order they were dealt to
+        """
+        cards = self.draw_many(hands * n)
+        return [cards[i::hands] for i in range(hands)]
+
+    def _target_sizes(self, targets: Mapping[T, int]) -> List[int]:
+        pool = self.pool
+        sizes = []
+        seen = set()
+        for key in targets:
+            cards = key if isinstance(key, frozenset) else frozenset([key])
+            if not seen.isdisjoint(cards):
+                raise ValueError("Card types must not overlap")
+            seen |= cards
+            sizes.append(sum(pool[card] for card in cards))
+        return sizes
+
+    def probability_exactly(self, targets: Mapping[T, int], draws: int
+                            ) -> float:
+        """Returns the exact probability that the next `draws` draws contain
+        exactly the number of each card type given
+
+        Parameters
+        ----------
+        targets : Mapping[T, int]
+            The exact count wanted of each card type, where a type is either
+            a single card or a `frozenset` of cards counted together
+        draws : int
+            The number of upcoming draws, limited to the cards remaining
+
+        Returns
+        -------
+        float
+            The multivariate hypergeometric probability of the counts
+        """
+        # Imported here so the abstract core does not depend on stats
+        from tabletoprandom.stats import hypergeometric
+        return hypergeometric.probability_exactly(
+            len(self), self._target_sizes(targets), list(targets.values()),
+            min(max(draws, 0), len(self)))
+
+    def probability_at_least(self, targets: Mapping[T, int], draws: int
+                             ) -> float:
+        """Returns the exact probability that the next `draws` draws contain
+        at least the number of each card type given
+
+        Parameters
+        ----------
+        targets : Mapping[T, int]
+            The minimum count wanted of each card type, where a type is
+            either a single card or a `frozenset` of cards counted together
+        draws : int
+            The number of upcoming draws, limited to the cards remaining
+
+        Returns
+        -------
+        float
+            The multivariate hypergeometric probability of every minimum
+            being met
+        """
+        from tabletoprandom.stats import hypergeometric
+        return hypergeometric.probability_at_least(
+            len(self), self._target_sizes(targets), list(targets.values()),
+            min(max(draws, 0), len(self)))
+
     def draw_and_replace(self) -> T:
         """A function to draw an element with replacement"""
         self.replace(self.draw())
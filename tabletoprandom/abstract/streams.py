@@ -0,0 +1,63 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from typing import List, Optional, Tuple
+import hashlib
+import random
+import secrets
+
+
+class RandomStreams:
+    """A factory of independent, reproducible random number generators
+
+    Every stream is a `random.Random` seeded from a 256 bit hash of the root
+    seed and the stream's key, in the style of numpy's `SeedSequence`, so a
+    stream can be recreated directly from its index without generating any
+    of the streams before it, and streams never share state. Factories can
+    be split into child factories for hierarchical work, such as one child
+    per worker handing out one stream per game session.
+
+    Attributes:
+        seed: the root seed all streams are derived from
+        key: the path of child indices leading to this factory
+    """
+
+    def __init__(self, seed: Optional[int] = None,
+                 key: Tuple[int, ...] = ()) -> None:
+        if seed is None:
+            seed = secrets.randbits(128)
+        if seed < 0:
+            raise ValueError("A stream seed cannot be negative")
+        self.seed = seed
+        self.key = tuple(key)
+        self._next_index = 0
+
+    def _derive(self, *key: int) -> int:
+        digest = hashlib.blake2b(
+            repr((self.seed,) + self.key + key).encode(),
+            digest_size=32, person=b"tabletoprandom",
+        ).digest()
+        return int.from_bytes(digest, "little")
+
+    def stream(self, index: int) -> random.Random:
+        """Returns a new generator for the substream at `index`, the same
+        index always gives an identically seeded generator"""
+        if index < 0:
+            raise ValueError("A stream index cannot be negative")
+        return random.Random(self._derive(0, index))
+
+    def spawn(self, n: int = 1) -> List[random.Random]:
+        """Returns the generators of the next `n` unused substreams"""
+        start = self._next_index
+        self._next_index += n
+        return [self.stream(i) for i in range(start, start + n)]
+
+    def child(self, index: int) -> 'RandomStreams':
+        """Returns the child factory at `index`, whose streams are
+        independent of the streams of this factory and of other children"""
+        if index < 0:
+            raise ValueError("A stream index cannot be negative")
+        return RandomStreams(self.seed, self.key + (index,))
+
+    def __repr__(self) -> str:
+        return f"RandomStreams(seed={self.seed}, key={self.key})"
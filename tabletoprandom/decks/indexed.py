@@ -0,0 +1,356 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from array import array
+from collections import Counter as counter
+from typing import Counter, Dict, Iterable, Iterator, List, Mapping
+from typing import NamedTuple, Sequence, Tuple, TypeVar
+import random
+from tabletoprandom.abstract.batch import fill
+from tabletoprandom.abstract.primitives import FiniteDrawable
+
+T = TypeVar('T')
+
+
+class CountView(Mapping[T, int]):
+    """A read-only mapping of cards to counts held in a list alongside a card
+    table, cards that are absent or have a count of zero map to `0` in the
+    manner of a `Counter` but are not contained in the view"""
+    __slots__ = ('_index', '_table', '_counts')
+
+    def __init__(self, index: Dict[T, int], table: Sequence[T],
+                 counts: Sequence[int]) -> None:
+        self._index = index
+        self._table = table
+        self._counts = counts
+
+    def __getitem__(self, card: T) -> int:
+        position = self._index.get(card)
+        if position is None:
+            return 0
+        return self._counts[position]
+
+    def __contains__(self, card: object) -> bool:
+        return self[card] > 0
+
+    def __iter__(self) -> Iterator[T]:
+        return (card for card, count in zip(self._table, self._counts)
+                if count > 0)
+
+    def __len__(self) -> int:
+        return sum(1 for count in self._counts if count > 0)
+
+    def __repr__(self) -> str:
+        return f"CountView({dict(self)})"
+
+
+class CardView(Sequence[T]):
+    """A zero-copy, read-only view of a run of positions in a deck's order
+
+    The view reads through to the deck rather than copying its cards, so it
+    is only valid until the deck is next drawn from, shuffled, reset or has
+    cards returned to it, after which reading a card from the view raises a
+    `RuntimeError` rather than giving the wrong cards."""
+    __slots__ = ('_deck', '_version', '_start', '_stop')
+
+    def __init__(self, deck: 'IndexedDeck[T]', start: int, stop: int
+                 ) -> None:
+        self._deck = deck
+        self._version = deck._version
+        self._start = start
+        self._stop = stop
+
+    def _order(self) -> Sequence[int]:
+        if self._deck._version != self._version:
+            raise RuntimeError("The deck has changed since it was peeked")
+        return self._deck._order
+
+    def __getitem__(self, i):
+        order = self._order()
+        table = self._deck._table
+        if isinstance(i, slice):
+            positions = order[self._start:self._stop][i]
+            return [table[j] for j in positions]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("CardView index out of range")
+        return table[order[self._start + i]]
+
+    def __len__(self) -> int:
+        return self._stop - self._start
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Sequence):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"CardView({list(self)})"
+
+
+class IndexedDeckState(NamedTuple):
+    """The state of an `IndexedDeck` saved by a snapshot, where `order` and
+    `initial` hold indices into `table`"""
+    lazy: bool
+    table: List[T]
+    order: Sequence[int]
+    cursor: int
+    fixed: int
+    pending: int
+    initial: Sequence[int]
+    drawn: Mapping[T, int]
+
+
+class IndexedDeck(FiniteDrawable[T]):
+    """A deck stored as an array of indices into an interned card table
+
+    Each distinct card is stored once in `table` and the deck order is an
+    `array` of indices into it, read from a cursor at the top of the deck,
+    so drawing never moves the remaining cards. Shuffles happen in place and
+    a lazy deck shuffles by Fisher–Yates one position at a time, only
+    randomising a position when it is drawn or peeked, so a shuffle followed
+    by a few draws costs only those few draws. The initial order is kept so
+    that `reset` restores the deck with a single array copy.
+
+    Attributes:
+        lazy: whether shuffling is deferred until cards are drawn or peeked
+    """
+
+    def __init__(self, cards: Iterable[T] = (), rng: random.Random = None,
+                 lazy: bool = True) -> None:
+        super().__init__(rng)
+        self.lazy = lazy
+        self._table: List[T] = []
+        self._index: Dict[T, int] = {}
+        self._counts: List[int] = []
+        self._order = array('l', map(self._intern, cards))
+        for position in self._order:
+            self._counts[position] += 1
+        self._initial = array('l', self._order)
+        self._initial_counts = list(self._counts)
+        self._cursor = 0
+        # Positions from `_fixed` up to `_pending` are still waiting to be
+        # randomised by a lazy shuffle, every other position is final
+        self._fixed = self._pending = len(self._order)
+        self._pool_view = CountView(self._index, self._table, self._counts)
+        self._drawn = counter()
+        # Counts the changes to the order, invalidating older card views
+        self._version = 0
+
+    def _intern(self, card: T) -> int:
+        """Returns the table index of a card, adding it to the table if it
+        has not been seen before"""
+        position = self._index.get(card)
+        if position is None:
+            position = self._index[card] = len(self._table)
+            self._table.append(card)
+            self._counts.append(0)
+        return position
+
+    def _fix(self, end: int) -> None:
+        """Randomises every pending position before `end` by Fisher–Yates"""
+        order = self._order
+        pending = self._pending
+        end = min(end, pending)
+        randrange = self.rng.randrange
+        for i in range(self._fixed, end):
+            j = randrange(i, pending)
+            order[i], order[j] = order[j], order[i]
+        self._fixed = max(self._fixed, end)
+
+    def _compact(self) -> None:
+        """Drops the drawn positions above the cursor once they outnumber
+        the undrawn cards, keeping the order array proportional to the deck"""
+        cursor = self._cursor
+        if cursor > len(self._order) - cursor:
+            del self._order[:cursor]
+            self._cursor = 0
+            self._fixed -= cursor
+            self._pending -= cursor
+
+    @property
+    def table(self) -> Tuple[T, ...]:
+        """Returns the interned table of every distinct card of the deck"""
+        return tuple(self._table)
+
+    @property
+    def drawn(self) -> Counter[T]:
+        """Returns a counter of the cards currently drawn from the deck"""
+        return self._drawn
+
+    @property
+    def pool(self) -> Mapping[T, int]:
+        """Returns all the drawable, i.e. undrawn elements as an unordered
+        set, given as a read-only view that follows the deck"""
+        return self._pool_view
+
+    @property
+    def order(self) -> List[T]:
+        """Returns a list of the undrawn cards from top to bottom, fixing the
+        order of any pending lazy shuffle"""
+        self._fix(len(self._order))
+        table = self._table
+        return [table[i] for i in self._order[self._cursor:]]
+
+    def __draw__(self) -> T:
+        """Draws a card from the top of the deck"""
+        cursor = self._cursor
+        if cursor >= len(self._order):
+            raise StopIteration
+        if self._fixed <= cursor < self._pending:
+            self._fix(cursor + 1)
+        position = self._order[cursor]
+        self._cursor = cursor + 1
+        self._version += 1
+        self._counts[position] -= 1
+        card = self._table[position]
+        self._drawn[card] += 1
+        return card
+
+    def _take(self, n: int) -> Sequence[int]:
+        """Draws up to `n` cards from the top of the deck as one slice of
+        the order array, returning their table indices"""
+        start = self._cursor
+        end = min(start + max(n, 0), len(self._order))
+        if start == end:
+            return array('l')
+        self._fix(end)
+        positions = self._order[start:end]
+        self._cursor = end
+        self._version += 1
+        counts = self._counts
+        table = self._table
+        drawn = self._drawn
+        for position, count in counter(positions).items():
+            counts[position] -= count
+            drawn[table[position]] += count
+        self.last_draw = table[positions[-1]]
+        return positions
+
+    def draw_many(self, n: int) -> List[T]:
+        """Draws up to `n` cards from the top of the deck as one slice of
+        the order array with a single update of the drawn counter"""
+        return list(map(self._table.__getitem__, self._take(n)))
+
+    def draws_into(self, buffer) -> int:
+        """Draws cards into a writable buffer of integers in place, writing
+        the index in `table` of each card drawn, stopping early if the deck
+        runs out
+
+        Returns the number of cards drawn into the start of the buffer."""
+        return fill(buffer, self._take)
+
+    def shuffle(self) -> None:
+        """Shuffles the undrawn cards in place, lazy decks defer the work
+        until cards are drawn or peeked"""
+        self._version += 1
+        if self.lazy:
+            self._compact()
+            self._fixed = self._cursor
+            self._pending = len(self._order)
+            return
+        del self._order[:self._cursor]
+        self._cursor = 0
+        self.rng.shuffle(self._order)
+        self._fixed = self._pending = len(self._order)
+
+    def return_cards(self, cards: Iterable[T], place_top: bool = False
+                     ) -> Mapping[T, int]:
+        """Returns an iterable of cards to the deck, they are returned to the
+        bottom of the deck unless the `place_top` flag is set, in which case
+        the last card returned ends on top"""
+        cards = list(cards)
+        positions = [self._intern(card) for card in cards]
+        self._version += 1
+        if place_top:
+            for position in positions:
+                if self._cursor:
+                    self._cursor -= 1
+                    self._order[self._cursor] = position
+                else:
+                    self._order.insert(0, position)
+                    self._fixed += 1
+                    self._pending += 1
+        else:
+            # Cards on the bottom stay below any pending lazy shuffle
+            self._compact()
+            self._order.extend(positions)
+        for position in positions:
+            self._counts[position] += 1
+        self._drawn.subtract(cards)
+        return self.pool
+
+    def return_card(self, card: T, place_top: bool = False
+                    ) -> Mapping[T, int]:
+        """Returns a single card to the deck, it is returned to the bottom of
+        the deck unless the `place_top` flag is set"""
+        return self.return_cards([card], place_top)
+
+    replace = return_card
+
+    def replace_all(self) -> Mapping[T, int]:
+        """Returns all drawn cards to the bottom of the deck and refreshes the
+        drawn counter"""
+        drawn = +self._drawn
+        self._version += 1
+        self._compact()
+        self._order.extend(map(self._index.__getitem__, drawn.elements()))
+        for card, count in drawn.items():
+            self._counts[self._index[card]] += count
+        self._drawn.clear()
+        return self.pool
+
+    def reset(self) -> Mapping[T, int]:
+        """Restores the deck to its initial order and contents, discarding
+        any cards returned to it that it did not start with, and clears the
+        drawn counter"""
+        self._order[:] = self._initial
+        self._version += 1
+        counts = self._counts
+        counts[:len(self._initial_counts)] = self._initial_counts
+        counts[len(self._initial_counts):] = [0] * (
+            len(counts) - len(self._initial_counts))
+        self._cursor = 0
+        self._fixed = self._pending = len(self._order)
+        self._drawn.clear()
+        return self.pool
+
+    def peek(self, n: int = 1) -> CardView[T]:
+        """Returns a zero-copy view of the top N elements of the deck, valid
+        until the deck is next changed, use `list` to keep the cards"""
+        end = min(self._cursor + max(n, 0), len(self._order))
+        self._fix(end)
+        return CardView(self, self._cursor, end)
+
+    def __len__(self) -> int:
+        return len(self._order) - self._cursor
+
+    def _snapshot_state(self) -> IndexedDeckState:
+        """Returns the card table, the order and initial arrays of indices
+        into it, the cursor and lazy shuffle bounds and the drawn counts, the
+        state a snapshot saves, without fixing a pending lazy shuffle"""
+        return IndexedDeckState(
+            self.lazy, list(self._table), array('l', self._order),
+            self._cursor, self._fixed, self._pending,
+            array('l', self._initial), dict(self._drawn))
+
+    @classmethod
+    def _from_snapshot_state(cls, state: IndexedDeckState,
+                             rng: random.Random = None) -> 'IndexedDeck[T]':
+        """Returns a deck restored from the state of `_snapshot_state`"""
+        table = state.table
+        deck = cls((table[i] for i in state.initial), rng, state.lazy)
+        # The initial cards were interned first, so the rest follow in order
+        for card in table[len(deck._table):]:
+            deck._intern(card)
+        deck._order = array('l', state.order)
+        deck._cursor = state.cursor
+        deck._fixed = state.fixed
+        deck._pending = state.pending
+        counts = deck._counts
+        counts[:] = [0] * len(counts)
+        for position in deck._order[deck._cursor:]:
+            counts[position] += 1
+        deck._drawn.update(state.drawn)
+        return deck
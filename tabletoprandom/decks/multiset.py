@@ -0,0 +1,280 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from collections import Counter as counter
+from collections import deque
+from typing import Counter, Deque, Dict, Iterable, List, Mapping, Sequence
+from typing import Tuple, TypeVar
+import random
+from tabletoprandom.abstract.batch import numpy, HAS_NUMPY, fill
+from tabletoprandom.abstract.primitives import FiniteDrawable
+from tabletoprandom.decks.indexed import CountView
+
+T = TypeVar('T')
+
+
+class MultisetDeck(FiniteDrawable[T]):
+    """A randomly ordered deck stored as a count of each distinct card
+
+    The deck never holds its copies of a card individually, only a count
+    per card type alongside a Fenwick, or binary indexed, tree over those
+    counts, so a deck of millions of copies of a few types takes memory in
+    the number of types. Every draw picks a uniformly random undrawn card
+    by a walk down the tree in `O(log k)` for `k` types, which is the same
+    as drawing from the top of a freshly shuffled deck, so no shuffle is
+    ever needed and `pool` and `drawn` are served from the counts.
+
+    As the deck has no fixed order, cards returned to the bottom are mixed
+    back into the undrawn cards. Peeking and returning cards to the top
+    fix the next cards of the deck in a lookahead buffer that is drawn
+    from first, until the deck is next shuffled.
+    """
+
+    def __init__(self, cards: Iterable[T] = (), rng: random.Random = None
+                 ) -> None:
+        super().__init__(rng)
+        self._table: List[T] = []
+        self._index: Dict[T, int] = {}
+        self._counts: List[int] = []
+        for card, count in counter(cards).items():
+            self._counts[self._intern(card)] = count
+        self._initial_counts = list(self._counts)
+        self._lookahead: Deque[int] = deque()
+        self._pool_view = CountView(self._index, self._table, self._counts)
+        self._drawn = counter()
+        self._build()
+
+    @classmethod
+    def from_counts(cls, counts: Mapping[T, int], rng: random.Random = None
+                    ) -> 'MultisetDeck[T]':
+        """Returns a deck holding `counts[card]` copies of each card"""
+        if any(count < 0 for count in counts.values()):
+            raise ValueError("A deck cannot hold a negative number of cards")
+        deck = cls(rng=rng)
+        for card, count in counts.items():
+            deck._counts[deck._intern(card)] = count
+        deck._initial_counts = list(deck._counts)
+        deck._build()
+        return deck
+
+    def _intern(self, card: T) -> int:
+        """Returns the table index of a card, adding it to the table if it
+        has not been seen before"""
+        position = self._index.get(card)
+        if position is None:
+            position = self._index[card] = len(self._table)
+            self._table.append(card)
+            self._counts.append(0)
+        return position
+
+    def _build(self) -> None:
+        """Rebuilds the tree over the counts of the cards not in the
+        lookahead buffer in `O(k)`"""
+        free = self._tree_counts()
+        size = len(free)
+        tree = [0] + free
+        for i in range(1, size + 1):
+            parent = i + (i & -i)
+            if parent <= size:
+                tree[parent] += tree[i]
+        self._tree = tree
+        self._free = sum(free)
+        self._top_bit = 1 << size.bit_length() >> 1 if size else 0
+
+    def _tree_counts(self) -> List[int]:
+        """Returns the count of each card type not in the lookahead"""
+        free = list(self._counts)
+        for position in self._lookahead:
+            free[position] -= 1
+        return free
+
+    def _update(self, position: int, delta: int) -> None:
+        tree = self._tree
+        size = len(tree) - 1
+        i = position + 1
+        while i <= size:
+            tree[i] += delta
+            i += i & -i
+        self._free += delta
+
+    def _find(self, rank: int) -> int:
+        """Returns the index of the card type holding the `rank`th of the
+        free cards, counting from zero in table order"""
+        tree = self._tree
+        size = len(tree) - 1
+        position = 0
+        bit = self._top_bit
+        while bit:
+            following = position + bit
+            if following <= size and tree[following] <= rank:
+                position = following
+                rank -= tree[following]
+            bit >>= 1
+        return position
+
+    def _take(self) -> int:
+        """Removes the next card from the deck, returning its index"""
+        if self._lookahead:
+            return self._lookahead.popleft()
+        position = self._find(self.rng.randrange(self._free))
+        self._update(position, -1)
+        return position
+
+    @property
+    def table(self) -> Tuple[T, ...]:
+        """Returns the interned table of every distinct card of the deck"""
+        return tuple(self._table)
+
+    @property
+    def drawn(self) -> Counter[T]:
+        """Returns a counter of the cards currently drawn from the deck"""
+        return self._drawn
+
+    @property
+    def pool(self) -> Mapping[T, int]:
+        """Returns all the drawable, i.e. undrawn elements as an unordered
+        set, given as a read-only view that follows the deck"""
+        return self._pool_view
+
+    def __draw__(self) -> T:
+        """Draws a uniformly random card from the deck"""
+        if not self._free and not self._lookahead:
+            raise StopIteration
+        position = self._take()
+        self._counts[position] -= 1
+        card = self._table[position]
+        self._drawn[card] += 1
+        return card
+
+    def _take_many(self, n: int) -> Sequence[int]:
+        """Draws up to `n` random cards at once, returning their table
+        indices, large draws take a single multivariate hypergeometric
+        sample of the counts when numpy is installed and put it in a random
+        order"""
+        n = min(max(n, 0), len(self))
+        counts = self._counts
+        table = self._table
+        drawn = self._drawn
+        positions = []
+        while self._lookahead and len(positions) < n:
+            position = self._lookahead.popleft()
+            counts[position] -= 1
+            positions.append(position)
+        rest = n - len(positions)
+        if HAS_NUMPY and rest > len(table):
+            generator = numpy.random.default_rng(self.rng.getrandbits(64))
+            free = numpy.asarray(self._tree_counts(), dtype=numpy.int64)
+            taken = generator.multivariate_hypergeometric(
+                free, rest, method="marginals")
+            order = numpy.repeat(numpy.arange(len(free)), taken)
+            generator.shuffle(order)
+            for position, count in enumerate(taken.tolist()):
+                if count:
+                    counts[position] -= count
+                    drawn[table[position]] += count
+            self._build()
+            for position in positions:
+                drawn[table[position]] += 1
+            if positions:
+                order = numpy.concatenate(
+                    (numpy.asarray(positions, dtype=numpy.int64), order))
+            positions = order
+        else:
+            for _ in range(rest):
+                position = self._take()
+                counts[position] -= 1
+                positions.append(position)
+            for position, count in counter(positions).items():
+                drawn[table[position]] += count
+        if len(positions):
+            self.last_draw = table[positions[-1]]
+        return positions
+
+    def draw_many(self, n: int) -> List[T]:
+        """Draws up to `n` random cards at once, large draws take a single
+        multivariate hypergeometric sample of the counts when numpy is
+        installed and put it in a random order"""
+        positions = self._take_many(n)
+        if not isinstance(positions, list):
+            positions = positions.tolist()
+        return list(map(self._table.__getitem__, positions))
+
+    def draws_into(self, buffer) -> int:
+        """Draws cards into a writable buffer of integers in place, writing
+        the index in `table` of each card drawn, stopping early if the deck
+        runs out
+
+        Returns the number of cards drawn into the start of the buffer."""
+        return fill(buffer, self._take_many)
+
+    def shuffle(self) -> None:
+        """Releases any cards fixed by peeking or returning cards to the top
+        back into the random order of the deck"""
+        for position in self._lookahead:
+            self._update(position, 1)
+        self._lookahead.clear()
+
+    def peek(self, n: int = 1) -> List[T]:
+        """Returns the top N elements of the deck, fixing them as the next
+        cards drawn"""
+        n = min(max(n, 0), len(self))
+        while len(self._lookahead) < n:
+            position = self._find(self.rng.randrange(self._free))
+            self._update(position, -1)
+            self._lookahead.append(position)
+        table = self._table
+        return [table[self._lookahead[i]] for i in range(n)]
+
+    def return_cards(self, cards: Iterable[T], place_top: bool = False
+                     ) -> Mapping[T, int]:
+        """Returns an iterable of cards to the deck, they are mixed back into
+        the deck unless the `place_top` flag is set, in which case the last
+        card returned ends on top"""
+        cards = list(cards)
+        size = len(self._table)
+        positions = [self._intern(card) for card in cards]
+        for position in positions:
+            self._counts[position] += 1
+        if place_top:
+            self._lookahead.extendleft(positions)
+        if len(self._table) != size:
+            self._build()
+        elif not place_top:
+            for position in positions:
+                self._update(position, 1)
+        self._drawn.subtract(cards)
+        return self.pool
+
+    def return_card(self, card: T, place_top: bool = False
+                    ) -> Mapping[T, int]:
+        """Returns a single card to the deck, it is mixed back into the deck
+        unless the `place_top` flag is set"""
+        return self.return_cards([card], place_top)
+
+    replace = return_card
+
+    def replace_all(self) -> Mapping[T, int]:
+        """Returns all drawn cards to the deck and refreshes the drawn
+        counter"""
+        for card, count in self._drawn.items():
+            if count > 0:
+                self._counts[self._index[card]] += count
+        self._drawn.clear()
+        self._build()
+        return self.pool
+
+    def reset(self) -> Mapping[T, int]:
+        """Restores the deck to its initial contents, discarding any cards
+        returned to it that it did not start with, and clears the drawn
+        counter"""
+        counts = self._counts
+        counts[:len(self._initial_counts)] = self._initial_counts
+        counts[len(self._initial_counts):] = [0] * (
+            len(counts) - len(self._initial_counts))
+        self._lookahead.clear()
+        self._drawn.clear()
+        self._build()
+        return self.pool
+
+    def __len__(self) -> int:
+        return self._free + len(self._lookahead)
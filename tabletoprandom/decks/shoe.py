@@ -0,0 +1,183 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from itertools import repeat
+from typing import Dict, Iterable, List, Mapping, Sequence, TypeVar
+import random
+from tabletoprandom.decks.indexed import CountView, IndexedDeck
+
+T = TypeVar('T')
+
+
+class ShoeStatistics:
+    """Running totals of the play from a single shoe
+
+    Attributes:
+        shuffles: the number of times the shoe has been reshuffled
+        forced: the reshuffles forced by running out of cards mid round
+        dealt: the number of cards dealt from the shoe
+        discarded: the number of cards put on the discard pile
+    """
+    __slots__ = ('shuffles', 'forced', 'dealt', 'discarded')
+
+    def __init__(self) -> None:
+        self.shuffles = 0
+        self.forced = 0
+        self.dealt = 0
+        self.discarded = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self) -> str:
+        return (f"ShoeStatistics(shuffles={self.shuffles}, "
+                f"forced={self.forced}, dealt={self.dealt}, "
+                f"discarded={self.discarded})")
+
+
+class Shoe(IndexedDeck[T]):
+    """A dealing shoe of several copies of a deck with a discard pile and a
+    cut card
+
+    Cards dealt from the shoe stay `drawn` while they are in play and are
+    moved to the discard pile by `discard`, which only keeps a count of each
+    card. Once a round ends with the cut card reached, i.e. with more than
+    `penetration` of the shoe dealt since it was last shuffled,
+    `discard_all` gathers the discards back in and reshuffles the shoe in
+    place, lazily unless the shoe is eager. A shoe that runs out of cards
+    mid round reshuffles its discards at once.
+
+    Attributes:
+        decks: the number of copies of the deck the shoe holds
+        penetration: the fraction of the shoe dealt before the cut card
+        auto_shuffle: whether the shoe reshuffles itself at the cut card
+        statistics: the running totals of play from the shoe
+    """
+
+    def __init__(self, cards: Iterable[T] = (), decks: int = 6,
+                 penetration: float = 0.75, rng: random.Random = None,
+                 lazy: bool = True, auto_shuffle: bool = True) -> None:
+        if decks < 1:
+            raise ValueError("A shoe must hold at least one deck")
+        if not 0.0 < penetration <= 1.0:
+            raise ValueError("Penetration must be between 0 and 1")
+        self._discards: List[int] = []
+        super().__init__(list(cards) * decks, rng, lazy)
+        self.decks = decks
+        self.penetration = penetration
+        self.auto_shuffle = auto_shuffle
+        self.statistics = ShoeStatistics()
+        self._discard_view = CountView(self._index, self._table,
+                                       self._discards)
+        self._discard_total = 0
+        self._dealt = 0
+        self._cut = 0
+        self.shuffle()
+
+    def _intern(self, card: T) -> int:
+        position = self._index.get(card)
+        if position is None:
+            self._discards.append(0)
+        return super()._intern(card)
+
+    @property
+    def discarded(self) -> Mapping[T, int]:
+        """Returns the cards of the discard pile, given as a read-only view
+        that follows the shoe"""
+        return self._discard_view
+
+    @property
+    def cut_card(self) -> int:
+        """Returns the number of cards dealt since the last shuffle at which
+        the cut card is reached"""
+        return self._cut
+
+    @property
+    def dealt(self) -> int:
+        """Returns the number of cards dealt since the last shuffle"""
+        return self._dealt
+
+    @property
+    def cut_card_reached(self) -> bool:
+        """Returns whether the shoe is due to be reshuffled"""
+        return self._dealt >= self._cut
+
+    def __draw__(self) -> T:
+        """Deals a card from the shoe, reshuffling the discard pile first if
+        the shoe is empty"""
+        if not len(self) and self.auto_shuffle and self._discard_total:
+            self.statistics.forced += 1
+            self.reshuffle()
+        card = super().__draw__()
+        self._dealt += 1
+        self.statistics.dealt += 1
+        return card
+
+    def _take(self, n: int) -> Sequence[int]:
+        """Deals up to `n` cards from the top of the shoe, reshuffling the
+        discard pile if the shoe runs out first"""
+        positions = super()._take(n)
+        self._dealt += len(positions)
+        while (len(positions) < n and self.auto_shuffle and
+               self._discard_total):
+            self.statistics.forced += 1
+            self.reshuffle()
+            more = super()._take(n - len(positions))
+            self._dealt += len(more)
+            positions += more
+        self.statistics.dealt += len(positions)
+        return positions
+
+    def shuffle(self) -> None:
+        """Shuffles the cards left in the shoe and places the cut card,
+        leaving the discard pile where it is"""
+        super().shuffle()
+        self._dealt = 0
+        self._cut = int(len(self) * self.penetration)
+        self.statistics.shuffles += 1
+
+    def reshuffle(self) -> None:
+        """Returns the discard pile to the shoe in place and shuffles it"""
+        if self._discard_total:
+            # Dropping the drawn positions first reuses their space
+            del self._order[:self._cursor]
+            self._cursor = 0
+            counts = self._counts
+            discards = self._discards
+            for position, count in enumerate(discards):
+                if count:
+                    self._order.extend(repeat(position, count))
+                    counts[position] += count
+                    discards[position] = 0
+            self._discard_total = 0
+        self.shuffle()
+
+    def discard(self, cards: Iterable[T]) -> Mapping[T, int]:
+        """Moves an iterable of cards in play to the discard pile"""
+        cards = list(cards)
+        discards = self._discards
+        for card in cards:
+            discards[self._intern(card)] += 1
+        self._drawn.subtract(cards)
+        self._discard_total += len(cards)
+        self.statistics.discarded += len(cards)
+        return self.discarded
+
+    def discard_all(self) -> Mapping[T, int]:
+        """Ends a round by moving every card in play to the discard pile,
+        reshuffling the shoe if the cut card has been reached"""
+        self.discard((+self._drawn).elements())
+        self._drawn.clear()
+        if self.auto_shuffle and self.cut_card_reached:
+            self.reshuffle()
+        return self.discarded
+
+    def reset(self) -> Mapping[T, int]:
+        """Restores the full shoe and shuffles it, emptying the discard pile
+        but keeping the statistics"""
+        discards = self._discards
+        discards[:] = repeat(0, len(discards))
+        self._discard_total = 0
+        super().reset()
+        self.shuffle()
+        return self.pool
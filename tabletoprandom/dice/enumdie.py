@@ -1,11 +1,16 @@
 from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
-from typing import Set, List, Final
+from functools import lru_cache
+from typing import Final, FrozenSet, List, NamedTuple, Optional, Tuple
 from enum import EnumMeta, IntEnum, Enum, unique, auto
 from tabletoprandom.abstract.dice import FairDie, NumericDie
+from tabletoprandom.stats.moments import Moments
 import random
 
+ENUM_CACHE_SIZE = 256
+"""The number of enum classes whose member tables are kept cached"""
+
 
 @unique
 class ElementValue(Enum):
@@ -30,24 +35,80 @@ class FudgeValue(IntEnum):
         return "F"
 
 
+class _EnumTable(NamedTuple):
+    members: Tuple[Enum, ...]
+    faces: FrozenSet[Enum]
+    face_tuple: Tuple[Enum, ...]
+    face_order: Optional[Tuple[IntEnum, ...]]
+    is_int_enum: bool
+
+
+@lru_cache(maxsize=ENUM_CACHE_SIZE)
+def _enum_table(face_enum: EnumMeta) -> _EnumTable:
+    """Returns the cached member tables of an enum, shared by every die and
+    quick roll of that enum"""
+    members = tuple(face_enum)
+    faces = frozenset(members)
+    is_int_enum = IntEnum.__subclasscheck__(face_enum)
+    return _EnumTable(members, faces, members,
+                      tuple(sorted(faces)) if is_int_enum else None,
+                      is_int_enum)
+
+
+def _int_enum_table(face_enum: EnumMeta) -> _EnumTable:
+    table = _enum_table(face_enum)
+    if not table.is_int_enum:
+        raise ValueError("An IntEnum has not been given")
+    return table
+
+
+@lru_cache(maxsize=ENUM_CACHE_SIZE)
+def _int_enum_moments(face_enum: EnumMeta) -> Moments:
+    """Returns the moments of a fair roll of an IntEnum's members, shared by
+    every die of that enum"""
+    values = [int(member) for member in _int_enum_table(face_enum).faces]
+    n = len(values)
+    mean = sum(values) / n
+    return Moments(mean, sum((x - mean) ** 2 for x in values) / n,
+                   sum((x - mean) ** 3 for x in values) / n)
+
+
 class EnumDie(FairDie[Enum]):
 
+    __slots__ = ('face_enum',)
     face_enum: Final[EnumMeta]
 
-    def __init__(self, face_enum: EnumMeta) -> None:
+    def __init__(self, face_enum: EnumMeta, rng: random.Random = None
+                 ) -> None:
+        super().__init__(rng)
         self.face_enum = face_enum
-
-    @property
-    def faces(self) -> Set[Enum]:
-        return set(self.face_enum)
+        table = _enum_table(face_enum)
+        self._faces = table.faces
+        self._face_tuple = table.face_tuple
+        self._face_order = table.face_order
+        self._moments = None
 
     @property
     def num_faces(self) -> int:
-        return len(self.face_enum)
+        return len(self._face_tuple)
+
+    def roll_array(self, n: int) -> List[Enum]:
+        """Returns the results of `n` rolls of the die in a single call"""
+        results = self.rng.choices(self._face_tuple, k=max(n, 0))
+        if results:
+            self.last_roll = results[-1]
+        return results
+
+    @staticmethod
+    def quick_roll(face_enum: EnumMeta, rng: random.Random = random) -> Enum:
+        return rng.choice(_enum_table(face_enum).members)
 
     @staticmethod
-    def quick_roll(face_enum: EnumMeta) -> Enum:
-        return random.choice(face_enum)
+    def quick_rolls(face_enum: EnumMeta, n: int,
+                    rng: random.Random = random) -> List[Enum]:
+        """A static function returning `n` random rolls of a die with the
+        members of `face_enum` as its faces"""
+        return rng.choices(_enum_table(face_enum).members, k=max(n, 0))
 
     def __str__(self) -> str:
         try:
@@ -58,20 +119,25 @@ class EnumDie(FairDie[Enum]):
 
 class IntEnumDie(EnumDie, NumericDie[IntEnum]):
 
+    __slots__ = ()
     face_enum: Final[EnumMeta]
 
-    def __init__(self, face_enum: EnumMeta) -> None:
-        if not IntEnum.__subclasscheck__(face_enum):
-            raise ValueError("An IntEnum has not been given")
-        self.face_enum = face_enum
+    def __init__(self, face_enum: EnumMeta, rng: random.Random = None
+                 ) -> None:
+        _int_enum_table(face_enum)
+        super().__init__(face_enum, rng)
 
-    @property
-    def face_order(self) -> List[IntEnum]:
-        """Returns an ordered list of the die's faces"""
-        return sorted(list(self.face_enum))
+    def _compute_moments(self) -> Moments:
+        return _int_enum_moments(self.face_enum)
+
+    @staticmethod
+    def quick_roll(face_enum: EnumMeta, rng: random.Random = random
+                   ) -> IntEnum:
+        return rng.choice(_int_enum_table(face_enum).members)
 
     @staticmethod
-    def quick_roll(face_enum: EnumMeta) -> IntEnum:
-        if not IntEnum.__subclasscheck__(face_enum):
-            raise ValueError("An IntEnum has not been given")
-        return random.choice(face_enum)
+    def quick_rolls(face_enum: EnumMeta, n: int,
+                    rng: random.Random = random) -> List[IntEnum]:
+        """A static function returning `n` random rolls of a die with the
+        members of the IntEnum `face_enum` as its faces"""
+        return rng.choices(_int_enum_table(face_enum).members, k=max(n, 0))
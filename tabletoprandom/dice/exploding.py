@@ -0,0 +1,339 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, Optional, Tuple
+import abc
+import math
+import random
+from tabletoprandom.abstract.batch import numpy, HAS_NUMPY, int_array
+from tabletoprandom.abstract.dice import NumericDie
+from tabletoprandom.stats.distribution import Distribution
+
+EPSILON = 1e-12
+"""The default tail probability beyond which exploding dice are truncated"""
+
+_Faces = Tuple[Tuple[int, float], ...]
+_Table = Tuple[Tuple[int, ...], Tuple[float, ...]]
+
+
+def _faces(die: NumericDie) -> _Faces:
+    faces = []
+    for face in die.face_order:
+        if int(face) != face:
+            raise ValueError("A wrapped die must have integer faces")
+        if die.probability(face):
+            faces.append((int(face), die.probability(face)))
+    return tuple(faces)
+
+
+def _table(faces: Iterable[Tuple[int, float]]) -> _Table:
+    """Returns the values and cumulative weights of some faces, the form
+    `random.choices` and the numpy sampler both take"""
+    values = []
+    cumulative = []
+    total = 0.0
+    for face, probability in faces:
+        total += probability
+        values.append(face)
+        cumulative.append(total)
+    return tuple(values), tuple(cumulative)
+
+
+def _sample(generator, table: _Table, n: int):
+    """Returns `n` values drawn from a table by a numpy generator"""
+    values, cumulative = table
+    cumulative = numpy.asarray(cumulative)
+    indices = numpy.searchsorted(cumulative,
+                                 generator.random(n) * cumulative[-1],
+                                 side="right")
+    numpy.minimum(indices, len(values) - 1, out=indices)
+    return numpy.asarray(values, dtype=numpy.int64)[indices]
+
+
+def _distribution(outcomes: Dict[int, float]) -> Distribution:
+    offset = min(outcomes)
+    total = math.fsum(outcomes.values())
+    probabilities = [0.0] * (max(outcomes) - offset + 1)
+    for value, p in outcomes.items():
+        probabilities[value - offset] = p / total
+    return Distribution(offset, probabilities)
+
+
+def _accumulate(outcomes: Dict[int, float], part: Distribution) -> None:
+    for value, p in zip(part.values, part.probabilities):
+        outcomes[value] = outcomes.get(value, 0.0) + p
+
+
+def _part(faces: Iterable[Tuple[int, float]], shift: int = 0
+          ) -> Optional[Distribution]:
+    """Returns the unnormalised distribution of some of a die's faces"""
+    faces = list(faces)
+    if not faces:
+        return None
+    offset = faces[0][0]
+    probabilities = [0.0] * (faces[-1][0] - offset + 1)
+    for face, p in faces:
+        probabilities[face - offset] = p
+    return Distribution(offset + shift, probabilities)
+
+
+@lru_cache(maxsize=256)
+def _explode(faces: _Faces, explode_on: FrozenSet[int], limit: Optional[int],
+             penetrating: bool, epsilon: float) -> Distribution:
+    """Returns the distribution of an exploding die by summing the chains of
+    each number of explosions until their total probability is below
+    `epsilon`, the remaining tail is dropped and the rest renormalised"""
+    shift = -1 if penetrating else 0
+    exploding = [(f, p) for f, p in faces if f in explode_on]
+    final = [(f, p) for f, p in faces if f not in explode_on]
+    # Penetrating dice count one less on every roll after the first
+    first = (_part(exploding), _part(final), _part(faces))
+    later = (_part(exploding, shift), _part(final, shift),
+             _part(faces, shift))
+    outcomes: Dict[int, float] = {}
+    chain = Distribution.constant(0)
+    explosions = 0
+    while True:
+        explode, stop, any_face = later if explosions else first
+        if explosions == limit:
+            _accumulate(outcomes, chain + any_face)
+            break
+        if stop is not None:
+            _accumulate(outcomes, chain + stop)
+        if explode is None:
+            break
+        chain = chain + explode
+        explosions += 1
+        if math.fsum(chain.probabilities) < epsilon:
+            break
+    return _distribution(outcomes)
+
+
+@lru_cache(maxsize=256)
+def _reroll(faces: _Faces, reroll_on: FrozenSet[int], once: bool
+            ) -> Distribution:
+    reroll_chance = math.fsum(p for f, p in faces if f in reroll_on)
+    if once:
+        outcomes = {f: (p if f not in reroll_on else 0.0) + reroll_chance * p
+                    for f, p in faces}
+    else:
+        outcomes = {f: p for f, p in faces if f not in reroll_on}
+    return _distribution(outcomes)
+
+
+class _ModifiedDie(NumericDie[int]):
+    """A die whose rolls are built from the rolls of a wrapped numeric die,
+    with an exact distribution computed once on construction
+
+    The wrapped die is only used for its faces and their probabilities,
+    rolls are drawn from this die's own generator, which defaults to the
+    generator of the wrapped die."""
+    __slots__ = ('die', '_distribution', '_probabilities', '_mode', '_base')
+    is_fair = False
+
+    def __init__(self, die: NumericDie, rng: random.Random = None) -> None:
+        super().__init__(die.rng if rng is None else rng)
+        self.die = die
+        self._base = _table(_faces(die))
+
+    def _set_distribution(self, distribution: Distribution) -> None:
+        self._distribution = distribution
+        self._probabilities = {
+            value: p for value, p in zip(distribution.values,
+                                         distribution.probabilities) if p
+        }
+        self._index_faces(self._probabilities)
+        most = max(self._probabilities.values())
+        self._mode = frozenset(
+            face for face, p in self._probabilities.items() if p == most
+        )
+
+    def _draw(self, table: _Table) -> int:
+        return self.rng.choices(table[0], cum_weights=table[1])[0]
+
+    @property
+    def distribution(self) -> Distribution:
+        """Returns the exact distribution of a roll of the die"""
+        return self._distribution
+
+    @property
+    def num_faces(self) -> int:
+        return len(self._face_tuple)
+
+    @property
+    def mode(self) -> FrozenSet[int]:
+        """Returns a set containing the most commonly rolled value(s)"""
+        return self._mode
+
+    def probability(self, face: int) -> float:
+        """Returns the probability of a given value being rolled
+
+        Parameters
+        ----------
+        face : int
+            The potential value to be tested
+
+        Returns
+        -------
+        float
+            The probablity of `roll` returning that value
+        """
+        return self._probabilities.get(face, 0.0)
+
+    def roll_array(self, n: int):
+        """Returns the results of `n` rolls of the die in a single call as
+        an integer array"""
+        n = max(n, 0)
+        if HAS_NUMPY:
+            generator = numpy.random.default_rng(self.rng.getrandbits(64))
+            results = self._sample_array(generator, n)
+        else:
+            results = int_array([self.__roll__() for _ in range(n)])
+        if len(results):
+            self.last_roll = int(results[-1])
+        return results
+
+    @abc.abstractmethod
+    def _sample_array(self, generator, n: int):
+        """Override with the vectorised rolling of the die"""
+        pass
+
+
+class ExplodingDie(_ModifiedDie):
+    """A die that is rolled again and added on whenever it shows one of its
+    exploding faces, by default its best roll
+
+    The explosions of a single die compound onto its value. The exact
+    distribution is truncated where the chance of a longer chain of
+    explosions falls below `epsilon` and renormalised, so `faces` and
+    `probability` cover the values that are not vanishingly unlikely,
+    although rolls themselves are never truncated. Batches of rolls draw
+    the length of every explosion chain at once from a geometric
+    distribution rather than rolling one die at a time.
+
+    Attributes:
+        die: the wrapped die
+        explode_on: the set of faces that explode
+        limit: the greatest number of explosions, or `None` for no limit
+        penetrating: whether every roll after the first counts one less
+        epsilon: the tail probability the distribution is truncated at
+    """
+    __slots__ = ('explode_on', 'limit', 'penetrating', 'epsilon',
+                 '_explode_chance', '_exploding', '_final')
+
+    def __init__(self, die: NumericDie, explode_on: Iterable[int] = None,
+                 limit: int = None, penetrating: bool = False,
+                 epsilon: float = EPSILON, rng: random.Random = None
+                 ) -> None:
+        super().__init__(die, rng)
+        faces = _faces(die)
+        self.explode_on = frozenset(
+            (die.best_roll,) if explode_on is None else explode_on)
+        if not self.explode_on <= {face for face, _ in faces}:
+            raise ValueError("Only faces of the die can explode")
+        if limit is not None and limit < 0:
+            raise ValueError("A die cannot explode a negative number of times")
+        if not 0.0 < epsilon < 1.0:
+            raise ValueError("Epsilon must be between 0 and 1")
+        self.limit = limit
+        self.penetrating = penetrating
+        self.epsilon = epsilon
+        self._exploding = _table(
+            (f, p) for f, p in faces if f in self.explode_on)
+        self._final = _table(
+            (f, p) for f, p in faces if f not in self.explode_on)
+        self._explode_chance = math.fsum(
+            p for f, p in faces if f in self.explode_on)
+        if not self._final[0] and limit is None:
+            raise ValueError("A die that always explodes needs a limit")
+        self._set_distribution(
+            _explode(faces, self.explode_on, limit, penetrating, epsilon))
+
+    def __roll__(self) -> int:
+        total = 0
+        explosions = 0
+        while True:
+            face = self._draw(self._base)
+            total += face
+            if explosions and self.penetrating:
+                total -= 1
+            if face not in self.explode_on or explosions == self.limit:
+                return total
+            explosions += 1
+
+    def _sample_array(self, generator, n: int):
+        if not self._final[0]:
+            explosions = numpy.full(n, self.limit, dtype=numpy.int64)
+        else:
+            # The number of trials up to the first face that stops the chain
+            explosions = generator.geometric(
+                1.0 - self._explode_chance, n).astype(numpy.int64) - 1
+        if self._final[0]:
+            final = _sample(generator, self._final, n)
+        else:
+            final = numpy.zeros(n, dtype=numpy.int64)
+        if self.limit is not None:
+            capped = explosions >= self.limit
+            numpy.minimum(explosions, self.limit, out=explosions)
+            final[capped] = _sample(generator, self._base,
+                                    int(capped.sum()))
+        if len(self._exploding[0]) == 1:
+            exploded = explosions * self._exploding[0][0]
+        else:
+            samples = _sample(generator, self._exploding,
+                              int(explosions.sum()))
+            owners = numpy.repeat(numpy.arange(n), explosions)
+            exploded = numpy.bincount(owners, weights=samples, minlength=n)
+            exploded = numpy.rint(exploded).astype(numpy.int64)
+        results = exploded + final
+        if self.penetrating:
+            results -= explosions
+        return results
+
+    def __str__(self) -> str:
+        return f"{self.die}!"
+
+
+class RerollDie(_ModifiedDie):
+    """A die that is rerolled when it shows one of its reroll faces, by
+    default its worst roll, either once, keeping the second roll, or until
+    it shows another face
+
+    Attributes:
+        die: the wrapped die
+        reroll_on: the set of faces that are rerolled
+        once: whether a die is only rerolled once
+    """
+    __slots__ = ('reroll_on', 'once', '_kept')
+
+    def __init__(self, die: NumericDie, reroll_on: Iterable[int] = None,
+                 once: bool = True, rng: random.Random = None) -> None:
+        super().__init__(die, rng)
+        faces = _faces(die)
+        self.reroll_on = frozenset(
+            (die.worst_roll,) if reroll_on is None else reroll_on)
+        self.once = once
+        kept = [(f, p) for f, p in faces if f not in self.reroll_on]
+        if not kept and not once:
+            raise ValueError("A die cannot be rerolled on every face")
+        self._kept = _table(kept)
+        self._set_distribution(_reroll(faces, self.reroll_on, once))
+
+    def __roll__(self) -> int:
+        face = self._draw(self._base)
+        if face in self.reroll_on:
+            # Rerolling until a kept face is drawing from the kept faces
+            return self._draw(self._base if self.once else self._kept)
+        return face
+
+    def _sample_array(self, generator, n: int):
+        if not self.once:
+            return _sample(generator, self._kept, n)
+        first = _sample(generator, self._base, n)
+        second = _sample(generator, self._base, n)
+        rerolled = numpy.isin(first, list(self.reroll_on))
+        return numpy.where(rerolled, second, first)
+
+    def __str__(self) -> str:
+        return f"{self.die}{'r' if self.once else 'rr'}"
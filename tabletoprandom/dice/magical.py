@@ -1,35 +1,98 @@
 from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
+from array import array
+from tabletoprandom.abstract.batch import numpy, HAS_NUMPY
 from tabletoprandom.dice.traditional import TraditionalDie
+from tabletoprandom.stats.distribution import Distribution
+import random
+import threading
 
 
 class MagicalDie(TraditionalDie):
+    """A traditional die that rolls its best roll while it holds charge,
+    spending one charge per roll
 
+    Charge is spent under a lock, so a die shared between threads never
+    gives out more best rolls than it was charged with, and rolls of an
+    uncharged die take no lock."""
+
+    __slots__ = ('charge', '_lock')
     charge: int
 
-    def __init__(self, n: int = 6, charge: int = 0) -> None:
+    def __init__(self, n: int = 6, charge: int = 0,
+                 rng: random.Random = None) -> None:
         if charge < 0:
             raise ValueError("A magical die cannot have negative charge")
         self.charge = charge
+        self._lock = threading.Lock()
+
+        super().__init__(n, rng)
+
+    def __getstate__(self) -> dict:
+        state = super().__getstate__()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        super().__setstate__(state)
+        self._lock = threading.Lock()
 
-        super().__init__(n)
+    def _spend(self, n: int) -> int:
+        """Spends up to `n` charge, returning the amount spent"""
+        if not self.charge:
+            return 0
+        with self._lock:
+            spent = min(self.charge, n)
+            self.charge -= spent
+        return spent
 
     def __roll__(self) -> int:
-        if self.charge:
-            self.charge -= 1
+        if self._spend(1):
             return self.best_roll
 
         return super().__roll__()
 
+    def roll_array(self, n: int):
+        """Returns the results of `n` rolls of the die in a single call
+
+        The first `min(charge, n)` rolls are best rolls, spending that charge
+        at once, and the rest come from the vectorised traditional roller.
+        The charge spent and the distribution of the rolls match rolling one
+        at a time, but not the exact rolls for a given seed, as the
+        vectorised roller draws from the generator differently."""
+        n = max(n, 0)
+        charged = self._spend(n)
+        rolls = super().roll_array(n - charged)
+        if not charged:
+            return rolls
+        if n == charged:
+            self.last_roll = self.best_roll
+        if HAS_NUMPY:
+            return numpy.concatenate(
+                (numpy.full(charged, self.best_roll, dtype=numpy.int64),
+                 rolls))
+        return array('l', [self.best_roll]) * charged + rolls
+
+    def distribution(self, n: int = 1) -> Distribution:
+        """Returns the exact distribution of the sum of the next `n` rolls,
+        given the die's current charge"""
+        if n < 0:
+            raise ValueError("A die cannot be rolled negatively")
+        charged = min(self.charge, n)
+        return (Distribution.from_die(TraditionalDie(self.num_faces))
+                .repeat(n - charged) + charged * self.best_roll)
+
     def empower(self, charge: int = 1) -> int:
         if charge < 0:
             raise ValueError("A magical die cannot have negative charge")
-        self.charge += charge
-        return self.charge
+        with self._lock:
+            self.charge += charge
+            return self.charge
 
     def dispell(self) -> None:
-        self.charge = 0
+        with self._lock:
+            self.charge = 0
 
     def __str__(self) -> str:
         return super().__str__() + f"({self.charge})"
@@ -0,0 +1,433 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from functools import lru_cache
+from typing import List, Optional
+import abc
+import operator
+import random
+import re
+from tabletoprandom.abstract.batch import numpy, HAS_NUMPY, int_array
+from tabletoprandom.abstract.dice import NumericDie
+from tabletoprandom.abstract.primitives import Rollable
+from tabletoprandom.dice.enumdie import IntEnumDie, FudgeValue
+from tabletoprandom.dice.traditional import TraditionalDie
+from tabletoprandom.stats import orderstats
+from tabletoprandom.stats.distribution import Distribution
+
+CACHE_SIZE = 1024
+"""The number of compiled expressions kept by `compile_notation`"""
+MAX_FACES = 10000
+"""The most faces a die in a notation expression may have, as every face of
+a traditional die is indexed when the expression is compiled"""
+MAX_DICE = 10000
+"""The most dice a single pool in a notation expression may roll"""
+
+_TOKEN = re.compile(r"\d+|kh|kl|dh|dl|[dkf%()+\-*/]")
+
+_KEEP_MODES = {"k": "kh", "kh": "kh", "kl": "kl", "d": "dl", "dl": "dl",
+               "dh": "dh"}
+
+
+def _floordiv(left, right):
+    if HAS_NUMPY:
+        if numpy.any(right == 0):
+            raise ZeroDivisionError("Dice notation divided by zero")
+        return numpy.floor_divide(left, right)
+    return [a // b for a, b in zip(left, right)]
+
+
+def _elementwise(function):
+    if HAS_NUMPY:
+        return function
+    return lambda left, right: [function(a, b) for a, b in zip(left, right)]
+
+
+_OPERATORS = {
+    "+": _elementwise(operator.add),
+    "-": _elementwise(operator.sub),
+    "*": _elementwise(operator.mul),
+    "/": _floordiv,
+}
+
+
+def _combine(left: Distribution, right: Distribution, function
+             ) -> Distribution:
+    """Returns the distribution of a function of two independent values by
+    enumerating every pair of them"""
+    outcomes = {}
+    for a, p in zip(left.values, left.probabilities):
+        if p:
+            for b, q in zip(right.values, right.probabilities):
+                if q:
+                    value = function(a, b)
+                    outcomes[value] = outcomes.get(value, 0.0) + p * q
+    offset = min(outcomes)
+    probabilities = [0.0] * (max(outcomes) - offset + 1)
+    for value, p in outcomes.items():
+        probabilities[value - offset] = p
+    return Distribution(offset, probabilities)
+
+
+class _Node(abc.ABC):
+    """A node of a compiled dice notation expression"""
+    __slots__ = ()
+
+    @abc.abstractmethod
+    def evaluate(self, n: int, rng: random.Random):
+        """Returns `n` independent evaluations of the node, rolling any dice
+        with `rng`"""
+        pass
+
+    @abc.abstractmethod
+    def distribution(self) -> Distribution:
+        """Returns the exact distribution of the node's value"""
+        pass
+
+    @property
+    @abc.abstractmethod
+    def dice(self) -> int:
+        """Returns the number of dice rolled by one evaluation"""
+        pass
+
+
+class _Constant(_Node):
+    __slots__ = ('value',)
+
+    def __init__(self, value: int) -> None:
+        self.value = value
+
+    def evaluate(self, n: int, rng: random.Random):
+        if HAS_NUMPY:
+            return numpy.full(n, self.value, dtype=numpy.int64)
+        return [self.value] * n
+
+    def distribution(self) -> Distribution:
+        return Distribution.constant(self.value)
+
+    @property
+    def dice(self) -> int:
+        return 0
+
+
+class _Negate(_Node):
+    __slots__ = ('operand',)
+
+    def __init__(self, operand: _Node) -> None:
+        self.operand = operand
+
+    def evaluate(self, n: int, rng: random.Random):
+        values = self.operand.evaluate(n, rng)
+        if HAS_NUMPY:
+            return -values
+        return [-value for value in values]
+
+    def distribution(self) -> Distribution:
+        return -self.operand.distribution()
+
+    @property
+    def dice(self) -> int:
+        return self.operand.dice
+
+
+class _BinaryOperation(_Node):
+    __slots__ = ('symbol', 'left', 'right')
+
+    def __init__(self, symbol: str, left: _Node, right: _Node) -> None:
+        self.symbol = symbol
+        self.left = left
+        self.right = right
+
+    def evaluate(self, n: int, rng: random.Random):
+        return _OPERATORS[self.symbol](self.left.evaluate(n, rng),
+                                       self.right.evaluate(n, rng))
+
+    @property
+    def dice(self) -> int:
+        return self.left.dice + self.right.dice
+
+    def distribution(self) -> Distribution:
+        left = self.left.distribution()
+        right = self.right.distribution()
+        if self.symbol == "+":
+            return left + right
+        if self.symbol == "-":
+            return left - right
+        if self.symbol == "*":
+            if left.minimum == left.maximum:
+                return right * left.minimum
+            if right.minimum == right.maximum:
+                return left * right.minimum
+            return _combine(left, right, operator.mul)
+        if right.pmf(0):
+            raise ZeroDivisionError("Dice notation divided by zero")
+        return _combine(left, right, operator.floordiv)
+
+
+class _Pool(_Node):
+    """A pool of identical dice, optionally keeping or dropping some of the
+    highest or lowest results"""
+    __slots__ = ('count', 'die', 'keep', 'amount', 'keep_slice')
+
+    def __init__(self, count: int, die: NumericDie,
+                 mode: Optional[str] = None, amount: int = 0) -> None:
+        self.count = count
+        self.die = die
+        self.keep = mode
+        amount = self.amount = min(max(amount, 0), count)
+        self.keep_slice = {
+            None: slice(None),
+            "kh": slice(count - amount, None),
+            "kl": slice(None, amount),
+            "dh": slice(None, count - amount),
+            "dl": slice(amount, None),
+        }[mode]
+
+    def _sample(self, size: int, rng: random.Random):
+        # The die is shared by every expression compiled from the same
+        # notation, so its rolls are made statically with the caller's rng
+        die = self.die
+        if isinstance(die, TraditionalDie):
+            return die.quick_roll_array(size, die.num_faces, rng)
+        return die.quick_rolls(die.face_enum, size, rng)
+
+    def evaluate(self, n: int, rng: random.Random):
+        rolls = self._sample(self.count * n, rng)
+        if HAS_NUMPY:
+            rolls = numpy.asarray(rolls, dtype=numpy.int64)
+            rolls = rolls.reshape(n, self.count)
+            if self.keep is not None:
+                rolls.sort(axis=1)
+                rolls = rolls[:, self.keep_slice]
+            return rolls.sum(axis=1)
+        count = self.count
+        if self.keep is None:
+            return [sum(rolls[i:i+count]) for i in range(0, count * n, count)]
+        return [sum(sorted(rolls[i:i+count])[self.keep_slice])
+                for i in range(0, count * n, count)]
+
+    def distribution(self) -> Distribution:
+        if self.keep is None:
+            return Distribution.from_die(self.die).repeat(self.count)
+        return {
+            "kh": orderstats.keep_highest,
+            "kl": orderstats.keep_lowest,
+            "dh": orderstats.drop_highest,
+            "dl": orderstats.drop_lowest,
+        }[self.keep](self.die, self.count, self.amount)
+
+    @property
+    def dice(self) -> int:
+        return self.count
+
+
+class CompiledExpression(Rollable[int]):
+    """A compiled, reusable roller for a dice notation expression
+
+    Instances are built by `compile_notation`, each roll evaluates the whole
+    expression and `roll_array` evaluates it many times at once using the
+    batched rolling of the underlying dice. The parsed expression is shared
+    between every roller of the same notation, while each roller has its own
+    generator and `last_roll`.
+
+    Attributes:
+        notation: the normalized notation the expression was compiled from
+    """
+    __slots__ = ('notation', '_root')
+
+    def __init__(self, notation: str, root: _Node,
+                 rng: random.Random = None) -> None:
+        super().__init__(rng)
+        self.notation = notation
+        self._root = root
+
+    def __roll__(self) -> int:
+        return int(self._root.evaluate(1, self.rng)[0])
+
+    def roll_array(self, n: int):
+        """Returns the results of `n` evaluations of the expression as an
+        integer array"""
+        results = self._root.evaluate(max(n, 0), self.rng)
+        if not HAS_NUMPY:
+            results = int_array(results)
+        if len(results):
+            self.last_roll = int(results[-1])
+        return results
+
+    @property
+    def distribution(self) -> Distribution:
+        """Returns the exact distribution of the expression, computed on
+        first use, with kept and dropped dice resolved by order statistics
+
+        Raises a `ZeroDivisionError` if the expression can divide by zero."""
+        return _distribution(self.notation)
+
+    @property
+    def dice(self) -> int:
+        """Returns the number of dice rolled by one evaluation of the
+        expression"""
+        return self._root.dice
+
+    def __str__(self) -> str:
+        return self.notation
+
+    def __repr__(self) -> str:
+        return f"CompiledExpression({self.notation!r})"
+
+
+class _Parser:
+    """A recursive descent parser over the tokens of a normalized
+    expression"""
+
+    def __init__(self, notation: str) -> None:
+        self.notation = notation
+        self.tokens: List[str] = _TOKEN.findall(notation)
+        if "".join(self.tokens) != notation:
+            self.error()
+        self.position = 0
+
+    def error(self):
+        raise ValueError(f"Invalid dice notation: {self.notation!r}")
+
+    def peek(self) -> Optional[str]:
+        if self.position < len(self.tokens):
+            return self.tokens[self.position]
+        return None
+
+    def take(self) -> str:
+        token = self.peek()
+        if token is None:
+            self.error()
+        self.position += 1
+        return token
+
+    def number(self) -> int:
+        token = self.take()
+        if not token.isdigit():
+            self.error()
+        return int(token)
+
+    def parse(self) -> _Node:
+        node = self.expression()
+        if self.peek() is not None:
+            self.error()
+        return node
+
+    def expression(self) -> _Node:
+        node = self.term()
+        while self.peek() in ("+", "-"):
+            node = _BinaryOperation(self.take(), node, self.term())
+        return node
+
+    def term(self) -> _Node:
+        node = self.unary()
+        while self.peek() in ("*", "/"):
+            node = _BinaryOperation(self.take(), node, self.unary())
+        return node
+
+    def unary(self) -> _Node:
+        if self.peek() == "-":
+            self.take()
+            return _Negate(self.unary())
+        return self.atom()
+
+    def atom(self) -> _Node:
+        token = self.peek()
+        if token == "(":
+            self.take()
+            node = self.expression()
+            if self.take() != ")":
+                self.error()
+            return node
+        count = None
+        if token is not None and token.isdigit():
+            count = self.number()
+            if self.peek() != "d":
+                return _Constant(count)
+        if self.take() != "d":
+            self.error()
+        return self.pool(1 if count is None else count)
+
+    def pool(self, count: int) -> _Node:
+        if count < 1:
+            raise ValueError("A dice pool must have at least one die")
+        if count > MAX_DICE:
+            raise ValueError(
+                f"A dice pool must have at most {MAX_DICE} dice")
+        size = self.take()
+        if size == "f":
+            die = IntEnumDie(FudgeValue)
+        elif size == "%":
+            die = TraditionalDie(100)
+        elif size.isdigit():
+            if int(size) > MAX_FACES:
+                raise ValueError(
+                    f"A die must have at most {MAX_FACES} sides")
+            die = TraditionalDie(int(size))
+        else:
+            self.error()
+        mode = _KEEP_MODES.get(self.peek())
+        if mode is None:
+            return _Pool(count, die)
+        self.take()
+        amount = 1
+        if self.peek() is not None and self.peek().isdigit():
+            amount = self.number()
+        return _Pool(count, die, mode, amount)
+
+
+def normalize_notation(notation: str) -> str:
+    """Returns the canonical form of a notation string, lower case with all
+    whitespace removed"""
+    return "".join(notation.split()).lower()
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _parse(notation: str) -> _Node:
+    return _Parser(notation).parse()
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _distribution(notation: str) -> Distribution:
+    return _parse(notation).distribution()
+
+
+def compile_notation(notation: str, rng: random.Random = None
+                     ) -> CompiledExpression:
+    """Compiles a dice notation expression into a reusable roller
+
+    Supports pools of traditional dice (`4d6`, `d20`, `d%`), fudge dice
+    (`4dF`), keeping or dropping the highest or lowest results (`4d6kh3`,
+    `2d20kl1`, `4d6dl1`, with `k` and `d` short for `kh` and `dl`), integer
+    constants, parentheses and the `+`, `-`, `*` and `/` operators, where
+    division rounds down. Parsed expressions are held in a bounded LRU
+    cache keyed by their normalized notation, so repeated expressions are
+    only parsed once, while every call returns a new roller.
+
+    Parameters
+    ----------
+    notation : str
+        The dice notation expression to compile
+    rng : random.Random, optional
+        The generator every die of the expression is rolled with, which
+        defaults to the global `random` module generator
+
+    Returns
+    -------
+    CompiledExpression
+        A rollable evaluating the expression
+
+    Raises
+    ------
+    ValueError
+        If the notation cannot be parsed, names a die with more than
+        `MAX_FACES` sides or a pool of more than `MAX_DICE` dice
+    """
+    notation = normalize_notation(notation)
+    return CompiledExpression(notation, _parse(notation), rng)
+
+
+def roll_notation(notation: str, rng: random.Random = None) -> int:
+    """Rolls a dice notation expression once, parsing it if it is not
+    already cached"""
+    return compile_notation(notation, rng).roll()
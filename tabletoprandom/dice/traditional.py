@@ -1,8 +1,11 @@
 from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
-from typing import Set, Final, List
+from typing import Final
 from tabletoprandom.abstract.dice import NumericDie, FairDie
+from tabletoprandom.abstract.batch import randint_array
+from tabletoprandom.stats.moments import Moments
+import math
 import random
 
 
@@ -15,34 +18,62 @@ class TraditionalDie(NumericDie[int], FairDie[int]):
         face_order: a list of the die's faces in ascending order
         mode: set of all the most common faces to be rolled
         mean: geometric average roll of the die
+        variance: variance of a roll of the die
+        median: the lower median roll of the die
         is_fair: boolean describing whether or not a die is fair
         best_roll: the numberical best/highest roll on the die
         worst_roll: the numberical worst/lowest roll on the die """
 
+    __slots__ = ('num_faces',)
     num_faces: Final[int]
 
-    def __init__(self, n: int = 6) -> None:
+    def __init__(self, n: int = 6, rng: random.Random = None) -> None:
         if n < 1:
             raise ValueError("A die must have at least one side")
+        super().__init__(rng)
         self.num_faces = n
+        self._index_faces(range(1, n+1))
 
-    @property
-    def faces(self) -> Set[int]:
-        """Returns an unordered set of the die's faces"""
-        return set(range(1, self.num_faces+1))
+    def _compute_moments(self) -> Moments:
+        """Returns the closed form moments of a fair die numbered from one,
+        which is symmetric and so has no skew"""
+        n = self.num_faces
+        return Moments((n + 1) / 2, (n * n - 1) / 12, 0.0)
 
-    @property
-    def face_order(self) -> List[int]:
-        """Returns an ordered list of the die's faces"""
-        return list(range(1, self.num_faces+1))
+    def percentile(self, q: float) -> int:
+        """Returns the lowest face with at least a `q` chance of rolling at
+        or below it"""
+        if not 0.0 <= q <= 1.0:
+            raise ValueError("A percentile must be between 0 and 1")
+        return max(math.ceil(q * self.num_faces - 1e-9), 1)
 
     @staticmethod
-    def quick_roll(n: int = 6) -> int:
+    def quick_roll(n: int = 6, rng: random.Random = random) -> int:
         """A static function returning a random die roll for a traditional die
         of size n"""
         if n < 1:
             raise ValueError("A die must have at least one side")
-        return random.randint(1, n)
+        return rng.randint(1, n)
+
+    def roll_array(self, n: int):
+        """Returns the results of `n` rolls of the die in a single call
+
+        The rolls are generated by the vectorised numpy backend when it is
+        installed, returning an `int64` array, and otherwise fall back to an
+        `array('l')` filled in pure python. The `last_roll` attribute is
+        updated to the final roll."""
+        results = randint_array(1, self.num_faces, n, self.rng)
+        if len(results):
+            self.last_roll = int(results[-1])
+        return results
+
+    @staticmethod
+    def quick_roll_array(n: int, size: int = 6, rng: random.Random = random):
+        """A static function returning `n` random die rolls for a
+        traditional die of size `size`"""
+        if size < 1:
+            raise ValueError("A die must have at least one side")
+        return randint_array(1, size, n, rng)
 
     def __str__(self) -> str:
         return f"d{self.num_faces}"
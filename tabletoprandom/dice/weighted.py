@@ -0,0 +1,183 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from array import array
+from enum import Enum, EnumMeta
+from typing import FrozenSet, Mapping, TypeVar
+import random
+from tabletoprandom.abstract.batch import numpy, HAS_NUMPY
+from tabletoprandom.abstract.dice import Die, NumericDie
+
+T = TypeVar('T')
+
+
+class WeightedDie(Die[T]):
+    """A die whose faces are rolled in proportion to given weights
+
+    The die builds a Walker/Vose alias table once on construction, so every
+    roll, single or batched, costs one uniform draw and one table lookup
+    regardless of the number of faces. Probabilities and the mode are served
+    from tables built at the same time.
+
+    Attributes:
+        num_faces: the number of faces on the die
+        faces: set of all the faces on the die, including any of zero weight
+        mode: set of all the most common faces to be rolled
+        is_fair: always `False`, even when the weights are equal
+    """
+    __slots__ = ('_probabilities', '_mode', '_columns', '_accept', '_alias')
+    is_fair = False
+
+    def __init__(self, weights: Mapping[T, float], rng: random.Random = None
+                 ) -> None:
+        if any(weight < 0 for weight in weights.values()):
+            raise ValueError("A face cannot have a negative weight")
+        total = sum(weights.values())
+        if not total > 0:
+            raise ValueError("A die must have a face with positive weight")
+        super().__init__(rng)
+        self._index_faces(weights)
+        self._probabilities = {
+            face: weight / total for face, weight in weights.items()
+        }
+        most = max(self._probabilities.values())
+        self._mode = frozenset(
+            face for face, p in self._probabilities.items() if p == most
+        )
+        self._build_alias()
+
+    def _build_alias(self) -> None:
+        """Builds the alias table by Vose's method, each column `i` keeps
+        face `_columns[i]` with probability `_accept[i]` and gives the face of
+        column `_alias[i]` otherwise. Columns follow the order the weights
+        were given in, so seeded rolls do not depend on set ordering"""
+        self._columns = tuple(self._probabilities)
+        size = len(self._columns)
+        scaled = [self._probabilities[face] * size for face in self._columns]
+        accept = [1.0] * size
+        alias = list(range(size))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            less = small.pop()
+            more = large.pop()
+            accept[less] = scaled[less]
+            alias[less] = more
+            scaled[more] -= 1.0 - scaled[less]
+            if scaled[more] < 1.0:
+                small.append(more)
+            else:
+                large.append(more)
+        # Anything left over is within rounding error of a full column
+        self._accept = tuple(accept)
+        self._alias = tuple(alias)
+
+    @property
+    def num_faces(self) -> int:
+        return len(self._face_tuple)
+
+    @property
+    def mode(self) -> FrozenSet[T]:
+        """Returns a set containing the most commonly rolled side(s)"""
+        return self._mode
+
+    def probability(self, face: T) -> float:
+        """Returns the probability of a given value, or face, being rolled
+
+        Parameters
+        ----------
+        face : T
+            The potential face value to be tested
+
+        Returns
+        -------
+        float
+            The probablity of `roll` returning that face
+        """
+        return self._probabilities.get(face, 0.0)
+
+    def __roll__(self) -> T:
+        """Returns a face from a weighted roll of the die"""
+        column = self.rng.random() * len(self._accept)
+        i = int(column)
+        if column - i < self._accept[i]:
+            return self._columns[i]
+        return self._columns[self._alias[i]]
+
+    def _roll_indices(self, n: int):
+        """Returns the face indices of `n` rolls, as a numpy array when numpy
+        is installed and a list otherwise"""
+        n = max(n, 0)
+        size = len(self._accept)
+        if HAS_NUMPY:
+            generator = numpy.random.default_rng(self.rng.getrandbits(64))
+            columns = generator.random(n) * size
+            indices = columns.astype(numpy.int64)
+            keep = (columns - indices) < numpy.asarray(self._accept)[indices]
+            return numpy.where(keep, indices,
+                               numpy.asarray(self._alias)[indices])
+        accept = self._accept
+        alias = self._alias
+        indices = []
+        for column in (self.rng.random() * size for _ in range(n)):
+            i = int(column)
+            indices.append(i if column - i < accept[i] else alias[i])
+        return indices
+
+    def roll_array(self, n: int):
+        """Returns the results of `n` rolls of the die in a single call,
+        sampling the alias table in bulk"""
+        faces = self._columns
+        results = [faces[i] for i in self._roll_indices(n)]
+        if results:
+            self.last_roll = results[-1]
+        return results
+
+
+N = TypeVar('N', float, int)
+
+
+class WeightedNumericDie(WeightedDie[N], NumericDie[N]):
+    """A weighted die with numeric faces, whose moments are computed once
+    from its probability table"""
+    __slots__ = ()
+
+    def __init__(self, weights: Mapping[N, float], rng: random.Random = None
+                 ) -> None:
+        super().__init__(weights, rng)
+        self._moments = self._compute_moments()
+
+    def roll_array(self, n: int):
+        """Returns the results of `n` rolls of the die in a single call as a
+        packed numeric array"""
+        indices = self._roll_indices(n)
+        faces = self._columns
+        if HAS_NUMPY:
+            results = numpy.asarray(faces)[indices]
+        else:
+            integral = all(isinstance(face, int) for face in faces)
+            results = array('l' if integral else 'd',
+                            [faces[i] for i in indices])
+        if len(results):
+            self.last_roll = faces[indices[-1]]
+        return results
+
+
+class WeightedEnumDie(WeightedDie[Enum]):
+    """A weighted die with the members of an enum as its faces, members that
+    are not given a weight can never be rolled"""
+    __slots__ = ('face_enum',)
+
+    def __init__(self, face_enum: EnumMeta, weights: Mapping[Enum, float],
+                 rng: random.Random = None) -> None:
+        if not all(isinstance(face, face_enum) for face in weights):
+            raise ValueError("Weights must be given for members of the enum")
+        self.face_enum = face_enum
+        super().__init__({face: weights.get(face, 0) for face in face_enum},
+                         rng)
+
+    def __str__(self) -> str:
+        try:
+            return f"dW{self.face_enum.die_string()}"
+        except AttributeError:
+            return f"dW({self.face_enum.__name__})"
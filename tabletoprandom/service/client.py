@@ -0,0 +1,93 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from typing import Dict
+import asyncio
+import itertools
+import json
+from tabletoprandom.service.server import DEFAULT_HOST, DEFAULT_PORT
+
+
+class RollClient:
+    """An asyncio client of a `RollService`
+
+    Requests may be made concurrently over the one connection, each is
+    tagged with an id and its reply is matched back to it, so concurrent
+    requests for the same die can be coalesced by the service. Errors
+    reported by the service are raised as `ValueError`.
+    """
+
+    def __init__(self, reader: asyncio.StreamReader,
+                 writer: asyncio.StreamWriter) -> None:
+        self._reader = reader
+        self._writer = writer
+        self._ids = itertools.count()
+        self._waiting: Dict[int, asyncio.Future] = {}
+        self._lock = asyncio.Lock()
+        self._listener = asyncio.ensure_future(self._listen())
+
+    @classmethod
+    async def connect(cls, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT
+                      ) -> 'RollClient':
+        """Returns a client connected to a service over TCP"""
+        return cls(*await asyncio.open_connection(host, port))
+
+    @classmethod
+    async def connect_unix(cls, path: str) -> 'RollClient':
+        """Returns a client connected to a service on a Unix socket"""
+        return cls(*await asyncio.open_unix_connection(path))
+
+    async def _listen(self) -> None:
+        try:
+            while True:
+                line = await self._reader.readline()
+                if not line:
+                    break
+                response = json.loads(line)
+                future = self._waiting.pop(response.get("id"), None)
+                if future is not None and not future.done():
+                    future.set_result(response)
+        finally:
+            for future in self._waiting.values():
+                if not future.done():
+                    future.set_exception(
+                        ConnectionError("The service closed the connection"))
+            self._waiting.clear()
+
+    async def request(self, **fields: object) -> list:
+        """Sends a request to the service and returns its results"""
+        if self._listener.done():
+            raise ConnectionError("The client is not connected")
+        identifier = fields["id"] = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._waiting[identifier] = future
+        self._writer.write(json.dumps(fields).encode() + b"\n")
+        async with self._lock:
+            await self._writer.drain()
+        response = await future
+        if "error" in response:
+            raise ValueError(response["error"])
+        return response["results"]
+
+    async def roll(self, die: str, n: int = 1) -> list:
+        """Returns `n` rolls of a named die or a dice notation expression"""
+        return await self.request(op="roll", die=die, n=n)
+
+    async def draw(self, deck: str, n: int = 1) -> list:
+        """Returns up to `n` cards drawn from a named deck"""
+        return await self.request(op="draw", deck=deck, n=n)
+
+    async def close(self) -> None:
+        """Closes the connection, failing any requests still waiting"""
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except ConnectionError:
+            pass
+        await self._listener
+
+    async def __aenter__(self) -> 'RollClient':
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
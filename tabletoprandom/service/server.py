@@ -0,0 +1,257 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from enum import Enum
+from typing import Awaitable, Callable, Dict, List, Mapping, Optional
+from typing import Sequence, Tuple
+import argparse
+import asyncio
+import json
+from tabletoprandom.abstract.primitives import FiniteDrawable, Rollable
+from tabletoprandom.dice.notation import compile_notation
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 7337
+MAX_PENDING = 1024
+"""The number of requests a service works on before it stops reading"""
+MAX_COUNT = 100000
+"""The largest number of dice rolled or cards drawn for a single request or
+a single batch"""
+MAX_LINE = 2 ** 16
+"""The longest request line, in bytes, that a service reads"""
+
+_Waiting = List[Tuple[int, asyncio.Future]]
+
+
+def _plain(value: object) -> object:
+    """Returns a JSON serialisable form of a roll or card"""
+    if isinstance(value, Enum):
+        return value.name
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return str(value)
+
+
+class RollService:
+    """Serves rolls and draws to many clients over newline delimited JSON
+
+    Each request is a JSON object on one line, such as
+    `{"id": 1, "op": "roll", "die": "3d6+2", "n": 4}` or
+    `{"id": 2, "op": "draw", "deck": "tarot", "n": 1}`, answered by a line
+    of `{"id": 1, "results": [...]}` or `{"id": 1, "error": "..."}`. Dice
+    are either named on construction or given in dice notation.
+
+    Concurrent requests for the same die or deck are coalesced: the first
+    request schedules a flush for the next pass of the event loop, and every
+    request arriving before it shares one call to `roll_array` or
+    `draw_many`, until a batch would roll more than `max_count` dice and a
+    new batch is started. Once `max_pending` requests are in progress the
+    service stops reading from its connections, so clients are slowed by the
+    transport rather than queueing without bound, and replies wait on the
+    transport draining.
+
+    Attributes:
+        dice: the named dice, looked up before parsing a notation
+        decks: the named decks that can be drawn from
+        requests: the number of roll and draw requests served
+        batches: the number of batched rolls and draws they were served by
+    """
+
+    def __init__(self, dice: Mapping[str, Rollable] = None,
+                 decks: Mapping[str, FiniteDrawable] = None,
+                 max_pending: int = MAX_PENDING,
+                 max_count: int = MAX_COUNT) -> None:
+        self.dice = dict(dice or {})
+        self.decks = dict(decks or {})
+        self.max_count = max_count
+        self.requests = 0
+        self.batches = 0
+        self._max_pending = max_pending
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._pending: Dict[Tuple[str, str], _Waiting] = {}
+        self._costs: Dict[Tuple[str, str], int] = {}
+
+    def _submit(self, key: Tuple[str, str], bulk: Callable[[int], Sequence],
+                n: int, cost: int) -> Awaitable[list]:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        if self._costs.get(key, 0) + cost > self.max_count:
+            self._flush(key, bulk)
+        waiting = self._pending.get(key)
+        if waiting is None:
+            waiting = self._pending[key] = []
+            self._costs[key] = 0
+            loop.call_soon(self._flush, key, bulk)
+        waiting.append((n, future))
+        self._costs[key] += cost
+        self.requests += 1
+        return future
+
+    def _flush(self, key: Tuple[str, str], bulk: Callable[[int], Sequence]
+               ) -> None:
+        # A batch flushed early for its size leaves its scheduled flush with
+        # nothing to do
+        waiting = self._pending.pop(key, None)
+        if waiting is None:
+            return
+        del self._costs[key]
+        self.batches += 1
+        try:
+            results = bulk(sum(n for n, _ in waiting))
+            if hasattr(results, "tolist"):
+                results = results.tolist()
+        except Exception as error:
+            for _, future in waiting:
+                if not future.done():
+                    future.set_exception(error)
+            return
+        start = 0
+        for n, future in waiting:
+            if not future.done():
+                future.set_result(
+                    [_plain(value) for value in results[start:start + n]])
+            start += n
+
+    def _count(self, n: object) -> int:
+        if not isinstance(n, int) or not 0 <= n <= self.max_count:
+            raise ValueError(
+                f"A request must be for 0 to {self.max_count} results")
+        return n
+
+    async def roll(self, die: str, n: int = 1) -> list:
+        """Returns `n` rolls of a named die or a dice notation expression,
+        which may roll at most `max_count` dice in total"""
+        n = self._count(n)
+        roller = self.dice.get(die)
+        if roller is None:
+            roller = compile_notation(die)
+        cost = n * getattr(roller, "dice", 1)
+        if cost > self.max_count:
+            raise ValueError(
+                f"A request must roll at most {self.max_count} dice")
+        return await self._submit(("roll", die), roller.roll_array, n, cost)
+
+    async def draw(self, deck: str, n: int = 1) -> list:
+        """Returns up to `n` cards drawn from a named deck"""
+        n = self._count(n)
+        try:
+            drawable = self.decks[deck]
+        except KeyError:
+            raise ValueError(f"Unknown deck {deck!r}")
+        return await self._submit(("draw", deck), drawable.draw_many, n, n)
+
+    async def _dispatch(self, request: object) -> list:
+        if not isinstance(request, dict):
+            raise ValueError("A request must be a JSON object")
+        op = request.get("op")
+        if op == "roll":
+            return await self.roll(str(request.get("die")),
+                                   request.get("n", 1))
+        if op == "draw":
+            return await self.draw(str(request.get("deck")),
+                                   request.get("n", 1))
+        raise ValueError(f"Unknown operation {op!r}")
+
+    @staticmethod
+    async def _send(response: dict, writer: asyncio.StreamWriter,
+                    lock: asyncio.Lock) -> None:
+        writer.write(json.dumps(response).encode() + b"\n")
+        async with lock:
+            await writer.drain()
+
+    async def _respond(self, line: bytes, writer: asyncio.StreamWriter,
+                       lock: asyncio.Lock) -> None:
+        try:
+            identifier = None
+            try:
+                request = json.loads(line)
+                if isinstance(request, dict):
+                    identifier = request.get("id")
+                response = {"id": identifier,
+                            "results": await self._dispatch(request)}
+            except Exception as error:
+                # Every request is answered, so no client waits forever
+                response = {"id": identifier,
+                            "error": str(error) or type(error).__name__}
+            await self._send(response, writer, lock)
+        except ConnectionError:
+            pass
+        finally:
+            self._slots.release()
+
+    async def handle(self, reader: asyncio.StreamReader,
+                     writer: asyncio.StreamWriter) -> None:
+        """Serves the requests of a single connection until it closes
+
+        A request line longer than `MAX_LINE` is answered with an error and
+        closes the connection, as the rest of the line cannot be told apart
+        from the requests after it."""
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self._max_pending)
+        lock = asyncio.Lock()
+        tasks = set()
+        try:
+            overlong = False
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    overlong = True
+                    break
+                if not line:
+                    break
+                await self._slots.acquire()
+                task = asyncio.ensure_future(
+                    self._respond(line, writer, lock))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+            if overlong:
+                await self._send(
+                    {"id": None, "error":
+                     f"A request must be at most {MAX_LINE} bytes"},
+                    writer, lock)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT
+                    ) -> asyncio.AbstractServer:
+        """Starts serving on a TCP socket, a `port` of 0 picks a free one"""
+        return await asyncio.start_server(self.handle, host, port,
+                                          limit=MAX_LINE)
+
+    async def start_unix(self, path: str) -> asyncio.AbstractServer:
+        """Starts serving on a Unix domain socket at `path`"""
+        return await asyncio.start_unix_server(self.handle, path,
+                                               limit=MAX_LINE)
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    service = RollService(max_pending=args.max_pending)
+    if args.unix:
+        server = await service.start_unix(args.unix)
+    else:
+        server = await service.start(args.host, args.port)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m tabletoprandom.service.server",
+        description="Serves dice rolls over newline delimited JSON")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", help="serve on this Unix socket instead")
+    parser.add_argument("--max-pending", type=int, default=MAX_PENDING)
+    try:
+        asyncio.run(_serve(parser.parse_args(argv)))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
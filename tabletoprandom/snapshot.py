@@ -0,0 +1,380 @@
+"""A compact binary format for saving the state of dice and decks
+
+A snapshot holds any number of objects in one buffer laid out as
+
+    header | object offsets | object records | generator states | table
+
+Every card, face and class is interned into a single table that is pickled
+once at the end of the buffer, so records are fixed width integers indexing
+into it, and each distinct `random.Random` is stored once however many of
+the objects share it. The offsets let `SnapshotReader.open` restore any
+one object straight from a memory-mapped file without reading the others.
+
+As the table is pickled, snapshots must only be loaded from trusted sources.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from array import array
+from typing import Callable, Dict, Iterable, List, NamedTuple, Sequence
+from typing import Tuple
+import math
+import mmap
+import pickle
+import random
+import struct
+import sys
+from tabletoprandom.abstract.deck import Deck, DeckState
+from tabletoprandom.abstract.primitives import Rollable
+from tabletoprandom.decks.indexed import IndexedDeck, IndexedDeckState
+from tabletoprandom.dice.enumdie import EnumDie, IntEnumDie
+from tabletoprandom.dice.magical import MagicalDie
+from tabletoprandom.dice.traditional import TraditionalDie
+
+MAGIC = b"TTRS"
+VERSION = 1
+
+_HEADER = struct.Struct("<4sHxxIIQQ")
+_OBJECT = struct.Struct("<B3xiii")
+_RNG = struct.Struct("<iid")
+_RNG_WORDS = 625
+_RNG_SIZE = _RNG.size + 4 * _RNG_WORDS
+_GLOBAL_RNG = -1
+
+
+def _pack_ints(code: str, values: Iterable[int]) -> bytes:
+    packed = array(code, values)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def _unpack_ints(code: str, buffer: memoryview, offset: int, count: int
+                 ) -> Tuple[array, int]:
+    unpacked = array(code)
+    end = offset + unpacked.itemsize * count
+    unpacked.frombytes(buffer[offset:end])
+    if sys.byteorder == "big":
+        unpacked.byteswap()
+    return unpacked, end
+
+
+class _Encoder:
+    """Interns the values and generators of the objects being saved"""
+
+    def __init__(self) -> None:
+        self.table: List[object] = []
+        self.rngs: List[bytes] = []
+        self._index: Dict[Tuple[type, object], int] = {}
+        self._rng_index: Dict[int, int] = {}
+
+    def intern(self, value: object) -> int:
+        # Values are keyed with their type so that `True` and `1` differ
+        key = (type(value), value)
+        position = self._index.get(key)
+        if position is None:
+            position = self._index[key] = len(self.table)
+            self.table.append(value)
+        return position
+
+    def rng(self, rng: random.Random) -> int:
+        if rng is random:
+            return _GLOBAL_RNG
+        position = self._rng_index.get(id(rng))
+        if position is not None:
+            return position
+        try:
+            version, words, gauss = rng.getstate()
+        except (AttributeError, NotImplementedError, ValueError):
+            raise ValueError(f"The state of {rng!r} cannot be saved")
+        if len(words) != _RNG_WORDS:
+            raise ValueError(f"The state of {rng!r} cannot be saved")
+        self.rngs.append(
+            _RNG.pack(self.intern(type(rng)), version,
+                      math.nan if gauss is None else gauss)
+            + _pack_ints('I', words))
+        position = self._rng_index[id(rng)] = len(self.rngs) - 1
+        return position
+
+
+class _Codec(NamedTuple):
+    tag: int
+    encode: Callable[[_Encoder, object], bytes]
+    decode: Callable[['SnapshotReader', type, random.Random, memoryview],
+                     object]
+
+
+_CODECS: Dict[type, _Codec] = {}
+_TAGS: Dict[int, _Codec] = {}
+
+
+def register(cls: type, tag: int,
+             encode: Callable[[_Encoder, object], bytes],
+             decode: Callable[['SnapshotReader', type, random.Random,
+                               memoryview], object]) -> None:
+    """Registers how objects of exactly the type `cls` are saved
+
+    `encode` returns the payload of an object, interning values through
+    the encoder it is given, and `decode` rebuilds an object of the class
+    from the payload, a reader giving access to the table and a generator.
+    Each class needs its own tag, the generator and the last roll or draw
+    are saved for every object without any work by the codec."""
+    if tag in _TAGS and _TAGS[tag].encode is not encode:
+        raise ValueError(f"The snapshot tag {tag} is already registered")
+    codec = _Codec(tag, encode, decode)
+    _CODECS[cls] = codec
+    _TAGS[tag] = codec
+
+
+def _encode_traditional(encoder: _Encoder, die: TraditionalDie) -> bytes:
+    return struct.pack("<q", die.num_faces)
+
+
+def _decode_traditional(reader: 'SnapshotReader', cls: type,
+                        rng: random.Random, payload: memoryview
+                        ) -> TraditionalDie:
+    n, = struct.unpack_from("<q", payload)
+    return cls(n, rng=rng)
+
+
+def _encode_magical(encoder: _Encoder, die: MagicalDie) -> bytes:
+    return struct.pack("<qq", die.num_faces, die.charge)
+
+
+def _decode_magical(reader: 'SnapshotReader', cls: type, rng: random.Random,
+                    payload: memoryview) -> MagicalDie:
+    n, charge = struct.unpack_from("<qq", payload)
+    return cls(n, charge, rng)
+
+
+def _encode_enum(encoder: _Encoder, die: EnumDie) -> bytes:
+    return struct.pack("<i", encoder.intern(die.face_enum))
+
+
+def _decode_enum(reader: 'SnapshotReader', cls: type, rng: random.Random,
+                 payload: memoryview) -> EnumDie:
+    face_enum, = struct.unpack_from("<i", payload)
+    return cls(reader.table[face_enum], rng)
+
+
+_DECK = struct.Struct("<III")
+
+
+def _encode_deck(encoder: _Encoder, deck: Deck) -> bytes:
+    intern = encoder.intern
+    state = deck._snapshot_state()
+    drawn = list(state.drawn.items())
+    return b"".join((
+        _DECK.pack(len(state.cards), len(state.initial), len(drawn)),
+        _pack_ints('I', map(intern, state.cards)),
+        _pack_ints('I', map(intern, state.initial)),
+        _pack_ints('I', (intern(card) for card, _ in drawn)),
+        _pack_ints('q', (count for _, count in drawn)),
+    ))
+
+
+def _decode_deck(reader: 'SnapshotReader', cls: type, rng: random.Random,
+                 payload: memoryview) -> Deck:
+    size, initial_size, drawn_size = _DECK.unpack_from(payload)
+    table = reader.table
+    cards, offset = _unpack_ints('I', payload, _DECK.size, size)
+    initial, offset = _unpack_ints('I', payload, offset, initial_size)
+    drawn, offset = _unpack_ints('I', payload, offset, drawn_size)
+    counts, offset = _unpack_ints('q', payload, offset, drawn_size)
+    return cls._from_snapshot_state(DeckState(
+        [table[card] for card in cards],
+        tuple(table[card] for card in initial),
+        {table[card]: count for card, count in zip(drawn, counts)}), rng)
+
+
+_INDEXED = struct.Struct("<?3xIIIIIII")
+
+
+def _encode_indexed(encoder: _Encoder, deck: IndexedDeck) -> bytes:
+    state = deck._snapshot_state()
+    drawn = list(state.drawn.items())
+    return b"".join((
+        _INDEXED.pack(state.lazy, len(state.table), len(state.order),
+                      state.cursor, state.fixed, state.pending,
+                      len(state.initial), len(drawn)),
+        _pack_ints('I', map(encoder.intern, state.table)),
+        _pack_ints('I', state.order),
+        _pack_ints('I', state.initial),
+        _pack_ints('I', (encoder.intern(card) for card, _ in drawn)),
+        _pack_ints('q', (count for _, count in drawn)),
+    ))
+
+
+def _decode_indexed(reader: 'SnapshotReader', cls: type,
+                    rng: random.Random, payload: memoryview) -> IndexedDeck:
+    (lazy, table_size, size, cursor, fixed, pending, initial_size,
+     drawn_size) = _INDEXED.unpack_from(payload)
+    table = reader.table
+    local, offset = _unpack_ints('I', payload, _INDEXED.size, table_size)
+    order, offset = _unpack_ints('I', payload, offset, size)
+    initial, offset = _unpack_ints('I', payload, offset, initial_size)
+    drawn, offset = _unpack_ints('I', payload, offset, drawn_size)
+    counts, offset = _unpack_ints('q', payload, offset, drawn_size)
+    return cls._from_snapshot_state(IndexedDeckState(
+        lazy, [table[card] for card in local], order, cursor, fixed,
+        pending, initial,
+        {table[card]: count for card, count in zip(drawn, counts)}), rng)
+
+
+register(TraditionalDie, 1, _encode_traditional, _decode_traditional)
+register(MagicalDie, 2, _encode_magical, _decode_magical)
+register(EnumDie, 3, _encode_enum, _decode_enum)
+register(IntEnumDie, 3, _encode_enum, _decode_enum)
+register(Deck, 4, _encode_deck, _decode_deck)
+register(IndexedDeck, 5, _encode_indexed, _decode_indexed)
+
+
+def pack(objects: Iterable[object]) -> bytes:
+    """Returns a snapshot of any number of registered dice and decks
+
+    Raises a `ValueError` for an object of an unregistered type, or one
+    whose generator cannot be saved, such as a `random.SystemRandom`."""
+    encoder = _Encoder()
+    records = []
+    for subject in objects:
+        codec = _CODECS.get(type(subject))
+        if codec is None:
+            raise ValueError(
+                f"Objects of type {type(subject).__name__} cannot be saved")
+        last = (subject.last_roll if isinstance(subject, Rollable)
+                else subject.last_draw)
+        records.append(
+            _OBJECT.pack(codec.tag, encoder.intern(type(subject)),
+                         encoder.rng(subject.rng), encoder.intern(last))
+            + codec.encode(encoder, subject))
+    offset = _HEADER.size + 8 * (len(records) + 1)
+    offsets = [offset]
+    for record in records:
+        offset += len(record)
+        offsets.append(offset)
+    rng_offset = offset
+    table_offset = rng_offset + _RNG_SIZE * len(encoder.rngs)
+    return b"".join((
+        _HEADER.pack(MAGIC, VERSION, len(records), len(encoder.rngs),
+                     rng_offset, table_offset),
+        _pack_ints('Q', offsets),
+        *records,
+        *encoder.rngs,
+        pickle.dumps(tuple(encoder.table), pickle.HIGHEST_PROTOCOL),
+    ))
+
+
+class SnapshotReader(Sequence[object]):
+    """Restores the objects of a snapshot held in any buffer, such as
+    `bytes` or a memory map, each object being restored when indexed
+
+    The card table is unpickled on first use, and objects that shared a
+    generator when saved share one restored generator when restored by the
+    same reader."""
+
+    def __init__(self, buffer) -> None:
+        self._buffer = memoryview(buffer)
+        try:
+            (magic, version, count, self._rng_count, self._rng_offset,
+             self._table_offset) = _HEADER.unpack_from(self._buffer)
+        except struct.error:
+            raise ValueError("The buffer is not a snapshot")
+        if magic != MAGIC:
+            raise ValueError("The buffer is not a snapshot")
+        if version != VERSION:
+            raise ValueError(f"Unsupported snapshot version {version}")
+        self._offsets, _ = _unpack_ints('Q', self._buffer, _HEADER.size,
+                                        count + 1)
+        self._table = None
+        self._rngs: Dict[int, random.Random] = {}
+        self._map = None
+
+    @property
+    def table(self) -> Tuple[object, ...]:
+        """Returns the interned table of every value in the snapshot"""
+        if self._table is None:
+            self._table = pickle.loads(self._buffer[self._table_offset:])
+        return self._table
+
+    def _rng(self, position: int) -> random.Random:
+        if position == _GLOBAL_RNG:
+            return random
+        rng = self._rngs.get(position)
+        if rng is None:
+            offset = self._rng_offset + _RNG_SIZE * position
+            cls, version, gauss = _RNG.unpack_from(self._buffer, offset)
+            words, _ = _unpack_ints('I', self._buffer, offset + _RNG.size,
+                                    _RNG_WORDS)
+            rng = self._rngs[position] = self.table[cls]()
+            rng.setstate((version, tuple(words),
+                          None if math.isnan(gauss) else gauss))
+        return rng
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("Snapshot index out of range")
+        start, end = self._offsets[i], self._offsets[i + 1]
+        tag, cls, rng, last = _OBJECT.unpack_from(self._buffer, start)
+        subject = _TAGS[tag].decode(
+            self, self.table[cls], self._rng(rng),
+            self._buffer[start + _OBJECT.size:end])
+        if isinstance(subject, Rollable):
+            subject.last_roll = self.table[last]
+        else:
+            subject.last_draw = self.table[last]
+        return subject
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    @classmethod
+    def open(cls, path: str) -> 'SnapshotReader':
+        """Returns a reader of a snapshot file mapped into memory, which is
+        unmapped when the reader is closed"""
+        with open(path, "rb") as fh:
+            mapped = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        reader = cls(mapped)
+        reader._map = mapped
+        return reader
+
+    def close(self) -> None:
+        """Releases the buffer, after which no more objects can be read"""
+        self._buffer.release()
+        if self._map is not None:
+            self._map.close()
+
+    def __enter__(self) -> 'SnapshotReader':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def unpack(buffer) -> List[object]:
+    """Returns every object restored from a snapshot"""
+    reader = SnapshotReader(buffer)
+    try:
+        return list(reader)
+    finally:
+        reader.close()
+
+
+def dumps(subject: object) -> bytes:
+    """Returns a snapshot of a single die or deck"""
+    return pack([subject])
+
+
+def loads(buffer) -> object:
+    """Returns the single object restored from a snapshot"""
+    return unpack(buffer)[0]
+
+
+def save(objects: Iterable[object], path: str) -> None:
+    """Writes a snapshot of any number of dice and decks to a file"""
+    data = pack(objects)
+    with open(path, "wb") as fh:
+        fh.write(data)
@@ -0,0 +1,279 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from bisect import bisect_left
+from functools import lru_cache
+from itertools import accumulate
+from typing import Iterable, Sequence, Tuple, Union
+import math
+import random
+from tabletoprandom.abstract.batch import numpy, HAS_NUMPY, int_array
+from tabletoprandom.abstract.dice import NumericDie
+from tabletoprandom.stats.moments import Moments
+
+
+def _convolve(a: Sequence[float], b: Sequence[float]) -> Tuple[float, ...]:
+    """Returns the direct convolution of two probability vectors, which
+    repeated squaring keeps short enough to stay exact at every size"""
+    if HAS_NUMPY:
+        return tuple(numpy.convolve(a, b).tolist())
+    result = [0.0] * (len(a) + len(b) - 1)
+    for i, p in enumerate(a):
+        if p:
+            for j, q in enumerate(b):
+                result[i + j] += p * q
+    return tuple(result)
+
+
+class Distribution:
+    """An exact probability distribution over a range of integers
+
+    Distributions are immutable and hashable, they can be built from any
+    `NumericDie` with integer faces and combined with `+`, `-` and `*`, where
+    adding two distributions gives the distribution of the sum of independent
+    values, adding an integer offsets the values and multiplying by an
+    integer scales them. Sums of many copies of the same distribution are
+    built by `repeat`, which memoizes its intermediate results.
+
+    Zero probabilities are trimmed from the ends of the given probabilities
+    unless `trim` is false, which combining distributions uses to keep the
+    full range of a sum whose least likely values underflow to zero.
+
+    Attributes:
+        offset: the lowest possible value
+        probabilities: a tuple of the probability of each value from `offset`
+            upwards
+    """
+    __slots__ = ('offset', 'probabilities', '_cdf', '_sf')
+
+    def __init__(self, offset: int, probabilities: Iterable[float],
+                 trim: bool = True) -> None:
+        probabilities = tuple(probabilities)
+        start = 0
+        end = len(probabilities)
+        if trim:
+            while start < end and not probabilities[start]:
+                start += 1
+            while end > start and not probabilities[end - 1]:
+                end -= 1
+        if start == end:
+            raise ValueError("A distribution must have a possible value")
+        self.offset = offset + start
+        self.probabilities = probabilities[start:end]
+        self._cdf = None
+        self._sf = None
+
+    @staticmethod
+    def constant(value: int) -> 'Distribution':
+        """Returns the distribution of a single certain value"""
+        return Distribution(value, (1.0,))
+
+    @staticmethod
+    def from_die(die: NumericDie) -> 'Distribution':
+        """Returns the distribution of a single roll of a numeric die
+
+        The distribution of identical dice is only built once. Raises a
+        `ValueError` if the die has a face that is not an integer."""
+        faces = []
+        for face in die.face_order:
+            if int(face) != face:
+                raise ValueError("A distribution requires integer faces")
+            faces.append((int(face), die.probability(face)))
+        return _from_faces(tuple(faces))
+
+    @property
+    def minimum(self) -> int:
+        """Returns the lowest possible value"""
+        return self.offset
+
+    @property
+    def maximum(self) -> int:
+        """Returns the highest possible value"""
+        return self.offset + len(self.probabilities) - 1
+
+    @property
+    def values(self) -> range:
+        """Returns the range of values covered by the distribution"""
+        return range(self.minimum, self.maximum + 1)
+
+    @property
+    def cumulative(self) -> Tuple[float, ...]:
+        """Returns a tuple of cumulative probabilities matching `values`"""
+        if self._cdf is None:
+            self._cdf = tuple(accumulate(self.probabilities))
+        return self._cdf
+
+    def pmf(self, value: int) -> float:
+        """Returns the probability of exactly `value`"""
+        index = value - self.offset
+        if 0 <= index < len(self.probabilities):
+            return self.probabilities[index]
+        return 0.0
+
+    def cdf(self, value: int) -> float:
+        """Returns the probability of a value less than or equal to `value`"""
+        index = math.floor(value) - self.offset
+        if index < 0:
+            return 0.0
+        if index >= len(self.probabilities) - 1:
+            return 1.0
+        return min(self.cumulative[index], 1.0)
+
+    def at_least(self, value: int) -> float:
+        """Returns the probability of a value greater than or equal to
+        `value`, summed from the upper tail so small tails stay accurate"""
+        index = math.ceil(value) - self.offset
+        if index <= 0:
+            return 1.0
+        if index >= len(self.probabilities):
+            return 0.0
+        if self._sf is None:
+            self._sf = tuple(accumulate(reversed(self.probabilities)))[::-1]
+        return min(self._sf[index], 1.0)
+
+    def quantile(self, q: float) -> int:
+        """Returns the smallest value whose cumulative probability is at
+        least `q`"""
+        if not 0.0 <= q <= 1.0:
+            raise ValueError("A quantile must be between 0 and 1")
+        cumulative = self.cumulative
+        # Guard against the final cumulative sum rounding to just below one
+        index = bisect_left(cumulative, q * cumulative[-1])
+        return self.offset + min(index, len(cumulative) - 1)
+
+    @property
+    def median(self) -> int:
+        """Returns the lower median of the distribution"""
+        return self.quantile(0.5)
+
+    @property
+    def mean(self) -> float:
+        """Returns the expected value of the distribution"""
+        return self.offset + sum(
+            i * p for i, p in enumerate(self.probabilities)
+        )
+
+    @property
+    def variance(self) -> float:
+        """Returns the variance of the distribution"""
+        mean = self.mean - self.offset
+        return sum(
+            (i - mean) ** 2 * p for i, p in enumerate(self.probabilities)
+        )
+
+    @property
+    def std(self) -> float:
+        """Returns the standard deviation of the distribution"""
+        return math.sqrt(self.variance)
+
+    @property
+    def moments(self) -> Moments:
+        """Returns the moments of the distribution"""
+        return Moments.from_probabilities(zip(self.values,
+                                              self.probabilities))
+
+    def sample(self, rng: random.Random = random) -> int:
+        """Returns a value drawn at random from the distribution"""
+        return rng.choices(self.values, cum_weights=self.cumulative)[0]
+
+    def sample_array(self, n: int, rng: random.Random = random):
+        """Returns `n` values drawn at random from the distribution, as a
+        numpy `int64` array when numpy is installed and an `array('l')`
+        otherwise, the numpy backend being seeded from `rng`"""
+        n = max(n, 0)
+        if HAS_NUMPY:
+            cumulative = numpy.asarray(self.cumulative)
+            generator = numpy.random.default_rng(rng.getrandbits(64))
+            indices = numpy.searchsorted(
+                cumulative, generator.random(n) * cumulative[-1],
+                side="right")
+            numpy.minimum(indices, len(cumulative) - 1, out=indices)
+            return indices.astype(numpy.int64) + self.offset
+        return int_array(rng.choices(self.values,
+                                     cum_weights=self.cumulative, k=n))
+
+    def repeat(self, n: int) -> 'Distribution':
+        """Returns the distribution of the sum of `n` independent values,
+        built by memoized repeated squaring"""
+        if n < 0:
+            raise ValueError("A distribution cannot be repeated negatively")
+        return _repeat(self, n)
+
+    def __add__(self, other: Union['Distribution', int]) -> 'Distribution':
+        if isinstance(other, Distribution):
+            return _add(self, other)
+        if isinstance(other, int):
+            return Distribution(self.offset + other, self.probabilities,
+                                trim=False)
+        return NotImplemented
+
+    __radd__ = __add__
+
+    def __neg__(self) -> 'Distribution':
+        return Distribution(-self.maximum, reversed(self.probabilities),
+                            trim=False)
+
+    def __sub__(self, other: Union['Distribution', int]) -> 'Distribution':
+        if isinstance(other, (Distribution, int)):
+            return self + (-other)
+        return NotImplemented
+
+    def __rsub__(self, other: int) -> 'Distribution':
+        if isinstance(other, int):
+            return (-self) + other
+        return NotImplemented
+
+    def __mul__(self, scale: int) -> 'Distribution':
+        if not isinstance(scale, int):
+            return NotImplemented
+        if scale == 0:
+            return Distribution.constant(0)
+        if scale < 0:
+            return -(self * -scale)
+        probabilities = [0.0] * ((len(self.probabilities) - 1) * scale + 1)
+        probabilities[::scale] = self.probabilities
+        return Distribution(self.offset * scale, probabilities, trim=False)
+
+    __rmul__ = __mul__
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Distribution):
+            return NotImplemented
+        return (self.offset == other.offset
+                and self.probabilities == other.probabilities)
+
+    def __hash__(self) -> int:
+        return hash((self.offset, self.probabilities))
+
+    def __repr__(self) -> str:
+        return (f"Distribution({self.minimum}..{self.maximum}, "
+                f"mean={self.mean:.4g})")
+
+
+@lru_cache(maxsize=256)
+def _from_faces(faces: Tuple[Tuple[int, float], ...]) -> Distribution:
+    offset = faces[0][0]
+    probabilities = [0.0] * (faces[-1][0] - offset + 1)
+    for face, probability in faces:
+        probabilities[face - offset] += probability
+    return Distribution(offset, probabilities)
+
+
+@lru_cache(maxsize=1024)
+def _add(a: Distribution, b: Distribution) -> Distribution:
+    return Distribution(a.offset + b.offset,
+                        _convolve(a.probabilities, b.probabilities),
+                        trim=False)
+
+
+@lru_cache(maxsize=1024)
+def _repeat(distribution: Distribution, n: int) -> Distribution:
+    if n == 0:
+        return Distribution.constant(0)
+    if n == 1:
+        return distribution
+    half = _repeat(distribution, n // 2)
+    result = _add(half, half)
+    if n % 2:
+        result = _add(result, distribution)
+    return result
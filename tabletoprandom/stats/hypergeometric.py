@@ -0,0 +1,133 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from functools import lru_cache
+from typing import List, Sequence, Tuple
+import math
+import threading
+
+_log_factorials: List[float] = [0.0]
+_log_factorials_lock = threading.Lock()
+
+
+def log_factorial(n: int) -> float:
+    """Returns the natural log of `n` factorial from a table that grows to
+    the largest value asked for, under a lock so that threads growing it at
+    once cannot append out of order"""
+    table = _log_factorials
+    if n >= len(table):
+        with _log_factorials_lock:
+            value = table[-1]
+            for i in range(len(table), n + 1):
+                value += math.log(i)
+                table.append(value)
+    return table[n]
+
+
+def log_comb(n: int, k: int) -> float:
+    """Returns the natural log of `n` choose `k`, which must be possible"""
+    return log_factorial(n) - log_factorial(k) - log_factorial(n - k)
+
+
+def _check(population: int, sizes: Sequence[int], draws: int) -> None:
+    if min(sizes, default=0) < 0 or sum(sizes) > population:
+        raise ValueError("Card types cannot outnumber the population")
+    if not 0 <= draws <= population:
+        raise ValueError("Draws must be between zero and the population")
+
+
+def _log_exactly(population: int, sizes: Sequence[int],
+                 counts: Sequence[int], draws: int) -> float:
+    others = population - sum(sizes)
+    rest = draws - sum(counts)
+    if rest < 0 or rest > others or any(
+            not 0 <= k <= size for k, size in zip(counts, sizes)):
+        return -math.inf
+    return (sum(log_comb(size, k) for size, k in zip(sizes, counts))
+            + log_comb(others, rest) - log_comb(population, draws))
+
+
+def probability_exactly(population: int, sizes: Sequence[int],
+                        counts: Sequence[int], draws: int) -> float:
+    """Returns the multivariate hypergeometric probability of drawing
+    exactly `counts[i]` of each card type
+
+    Parameters
+    ----------
+    population : int
+        The number of cards drawn from
+    sizes : Sequence[int]
+        The number of cards of each type of interest in the population, any
+        remaining cards are of no interest
+    counts : Sequence[int]
+        The exact number of each type wanted
+    draws : int
+        The number of cards drawn without replacement
+
+    Returns
+    -------
+    float
+        The probability of the draws containing exactly the counts given
+    """
+    _check(population, sizes, draws)
+    return math.exp(_log_exactly(population, sizes, counts, draws))
+
+
+@lru_cache(maxsize=4096)
+def _at_least(population: int, sizes: Tuple[int, ...],
+              targets: Tuple[int, ...], draws: int) -> float:
+    if sum(targets) > draws:
+        return 0.0
+    if len(sizes) == 1:
+        # The single type case sums whichever tail is shorter
+        size, target = sizes[0], targets[0]
+        low = max(0, draws - (population - size))
+        high = min(size, draws)
+        if target <= low:
+            return 1.0
+        below = range(low, target)
+        above = range(target, high + 1)
+        terms = below if len(below) < len(above) else above
+        total = sum(math.exp(_log_exactly(population, sizes, (k,), draws))
+                    for k in terms)
+        return 1.0 - total if terms is below else total
+    # Condition on the count of the first type and recurse on the others
+    size, target = sizes[0], targets[0]
+    total = 0.0
+    for k in range(target, min(size, draws) + 1):
+        first = _log_exactly(population, (size,), (k,), draws)
+        if first == -math.inf:
+            continue
+        # The remaining draws come from the cards not of the first type
+        total += math.exp(first) * _at_least(
+            population - size, sizes[1:], targets[1:], draws - k)
+    return total
+
+
+def probability_at_least(population: int, sizes: Sequence[int],
+                         targets: Sequence[int], draws: int) -> float:
+    """Returns the multivariate hypergeometric probability of drawing at
+    least `targets[i]` of every card type
+
+    Parameters
+    ----------
+    population : int
+        The number of cards drawn from
+    sizes : Sequence[int]
+        The number of cards of each type of interest in the population
+    targets : Sequence[int]
+        The minimum number of each type wanted
+    draws : int
+        The number of cards drawn without replacement
+
+    Returns
+    -------
+    float
+        The probability of the draws meeting every target
+    """
+    _check(population, sizes, draws)
+    if not sizes:
+        return 1.0
+    probability = _at_least(population, tuple(sizes),
+                            tuple(max(t, 0) for t in targets), draws)
+    return min(max(probability, 0.0), 1.0)
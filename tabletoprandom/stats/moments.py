@@ -0,0 +1,94 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from typing import Iterable, Tuple, Union
+import math
+
+Number = Union[int, float]
+
+
+class Moments:
+    """The mean, variance and third central moment of a random value
+
+    These three are cumulants, so the moments of a sum of independent values
+    are the sums of their moments, which lets the moments of any pool of dice
+    be found without enumerating its outcomes. Adding a constant shifts the
+    mean and multiplying by a constant scales each moment by a power of it.
+
+    Attributes:
+        mean: the expected value
+        variance: the second central moment
+        third: the third central moment
+    """
+    __slots__ = ('mean', 'variance', 'third')
+
+    def __init__(self, mean: float, variance: float = 0.0,
+                 third: float = 0.0) -> None:
+        self.mean = mean
+        self.variance = variance
+        self.third = third
+
+    @staticmethod
+    def from_probabilities(outcomes: Iterable[Tuple[Number, float]]
+                           ) -> 'Moments':
+        """Returns the moments of a distribution given as pairs of values
+        and their probabilities"""
+        outcomes = list(outcomes)
+        mean = sum(value * p for value, p in outcomes)
+        variance = sum((value - mean) ** 2 * p for value, p in outcomes)
+        third = sum((value - mean) ** 3 * p for value, p in outcomes)
+        return Moments(mean, variance, third)
+
+    @property
+    def std(self) -> float:
+        """Returns the standard deviation"""
+        return math.sqrt(self.variance)
+
+    @property
+    def skewness(self) -> float:
+        """Returns the skewness, taken as zero for a constant value"""
+        if not self.variance:
+            return 0.0
+        return self.third / self.variance ** 1.5
+
+    def repeat(self, n: int) -> 'Moments':
+        """Returns the moments of the sum of `n` independent values"""
+        if n < 0:
+            raise ValueError("Moments cannot be repeated negatively")
+        return Moments(self.mean * n, self.variance * n, self.third * n)
+
+    def __add__(self, other: Union['Moments', Number]) -> 'Moments':
+        if isinstance(other, Moments):
+            return Moments(self.mean + other.mean,
+                           self.variance + other.variance,
+                           self.third + other.third)
+        if isinstance(other, (int, float)):
+            return Moments(self.mean + other, self.variance, self.third)
+        return NotImplemented
+
+    __radd__ = __add__
+
+    def __mul__(self, scale: Number) -> 'Moments':
+        if not isinstance(scale, (int, float)):
+            return NotImplemented
+        return Moments(self.mean * scale, self.variance * scale ** 2,
+                       self.third * scale ** 3)
+
+    __rmul__ = __mul__
+
+    def __neg__(self) -> 'Moments':
+        return self * -1
+
+    def __sub__(self, other: Union['Moments', Number]) -> 'Moments':
+        if isinstance(other, (Moments, int, float)):
+            return self + (-other)
+        return NotImplemented
+
+    def __rsub__(self, other: Number) -> 'Moments':
+        if isinstance(other, (int, float)):
+            return (-self) + other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return (f"Moments(mean={self.mean:.6g}, variance={self.variance:.6g},"
+                f" skewness={self.skewness:.6g})")
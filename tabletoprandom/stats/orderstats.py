@@ -0,0 +1,148 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from functools import lru_cache
+from typing import Dict, List, Tuple
+import math
+from tabletoprandom.abstract.batch import numpy, HAS_NUMPY
+from tabletoprandom.abstract.dice import NumericDie
+from tabletoprandom.stats.distribution import Distribution
+
+
+def _faces(die: NumericDie) -> Tuple[Tuple[int, float], ...]:
+    faces = []
+    for face in die.face_order:
+        if int(face) != face:
+            raise ValueError("A distribution requires integer faces")
+        if die.probability(face):
+            faces.append((int(face), die.probability(face)))
+    return tuple(faces)
+
+
+def _binomial(n: int, q: float, limit: int) -> List[float]:
+    """Returns the probabilities of 0 to `limit` - 1 successes in `n`
+    trials, followed by the probability of `limit` or more"""
+    def term(c: int) -> float:
+        return math.comb(n, c) * q ** c * (1.0 - q) ** (n - c)
+
+    terms = [term(c) for c in range(min(limit, n + 1))]
+    if limit <= n:
+        terms.append(math.fsum(term(c) for c in range(limit, n + 1)))
+    return terms
+
+
+def _accumulate(target, shift: int, weight: float, sums) -> None:
+    """Adds `weight` times the kept sums to `target` moved up by `shift`"""
+    width = len(sums) - shift
+    if HAS_NUMPY:
+        target[shift:] += weight * sums[:width]
+        return
+    for i, p in enumerate(sums[:width]):
+        if p:
+            target[shift + i] += weight * p
+
+
+@lru_cache(maxsize=256)
+def _keep_highest(faces: Tuple[Tuple[int, float], ...], count: int,
+                  keep: int) -> Distribution:
+    """Returns the distribution of the sum of the highest `keep` of `count`
+    rolls of a die with faces and probabilities given in ascending order
+
+    Faces are visited from the highest down, conditioning on every die left
+    being no higher than the current face, so the number showing that face
+    is binomial. The state is the number of dice left with a dense vector of
+    kept sums, measured up from `keep` lowest faces, and dice stop being
+    tracked once `keep` of them are placed, giving roughly
+    `faces * keep ** 2` vector operations rather than `faces ** count`."""
+    lowest = faces[0][0]
+    width = keep * (faces[-1][0] - lowest) + 1
+
+    def zeros():
+        return numpy.zeros(width) if HAS_NUMPY else [0.0] * width
+
+    cumulative = []
+    total = 0.0
+    for _, probability in faces:
+        total += probability
+        cumulative.append(total)
+    # The kept sums of every state, keyed by the number of dice left
+    start = zeros()
+    start[0] = 1.0
+    states = {count: start}
+    done = zeros()
+    for (face, probability), below in zip(reversed(faces),
+                                          reversed(cumulative)):
+        q = min(probability / below, 1.0) if below > 0 else 1.0
+        following: Dict[int, object] = {}
+        for left, sums in states.items():
+            needed = keep - (count - left)
+            for shown, weight in enumerate(_binomial(left, q, needed)):
+                if not weight:
+                    continue
+                kept = min(shown, needed)
+                if kept == needed:
+                    target = done
+                elif left - shown in following:
+                    target = following[left - shown]
+                else:
+                    target = following[left - shown] = zeros()
+                _accumulate(target, kept * (face - lowest), weight, sums)
+        states = following
+    if HAS_NUMPY:
+        done = done.tolist()
+    return Distribution(keep * lowest, done)
+
+
+def keep_highest(die: NumericDie, count: int, keep: int) -> Distribution:
+    """Returns the exact distribution of the sum of the highest `keep` of
+    `count` rolls of a die, such as `4d6kh3` or advantage, `2d20kh1`
+
+    Parameters
+    ----------
+    die : NumericDie
+        The die rolled, which must have integer faces
+    count : int
+        The number of dice rolled
+    keep : int
+        The number of the highest results summed
+
+    Returns
+    -------
+    Distribution
+        The distribution of the kept sum
+    """
+    if count < 0 or keep < 0:
+        raise ValueError("Dice cannot be rolled or kept negatively")
+    keep = min(keep, count)
+    if not keep:
+        return Distribution.constant(0)
+    if keep == count:
+        return Distribution.from_die(die).repeat(count)
+    return _keep_highest(_faces(die), count, keep)
+
+
+def keep_lowest(die: NumericDie, count: int, keep: int) -> Distribution:
+    """Returns the exact distribution of the sum of the lowest `keep` of
+    `count` rolls of a die, such as disadvantage, `2d20kl1`"""
+    if count < 0 or keep < 0:
+        raise ValueError("Dice cannot be rolled or kept negatively")
+    keep = min(keep, count)
+    if not keep:
+        return Distribution.constant(0)
+    if keep == count:
+        return Distribution.from_die(die).repeat(count)
+    # The lowest of the faces are the highest of the negated faces
+    faces = tuple((-face, p) for face, p in reversed(_faces(die)))
+    return -_keep_highest(faces, count, keep)
+
+
+def drop_lowest(die: NumericDie, count: int, drop: int) -> Distribution:
+    """Returns the exact distribution of `count` rolls of a die summed after
+    dropping the lowest `drop`, such as `4d6dl1`"""
+    return keep_highest(die, count, max(count - max(drop, 0), 0))
+
+
+def drop_highest(die: NumericDie, count: int, drop: int) -> Distribution:
+    """Returns the exact distribution of `count` rolls of a die summed after
+    dropping the highest `drop`"""
+    return keep_lowest(die, count, max(count - max(drop, 0), 0))
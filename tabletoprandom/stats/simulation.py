@@ -0,0 +1,190 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from collections import Counter as counter
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+from typing import Callable, Counter, Hashable, Optional, Tuple, TypeVar
+import math
+import os
+import random
+from tabletoprandom.abstract.streams import RandomStreams
+
+S = TypeVar('S')
+
+
+def _run_chunk(trial: Callable[[S], Hashable],
+               setup: Callable[[random.Random], S],
+               seed: int, index: int, size: int) -> Counter[Hashable]:
+    """Runs one chunk of trials against a subject built on the chunk's own
+    stream"""
+    subject = setup(RandomStreams(seed).stream(index))
+    return counter(trial(subject) for _ in range(size))
+
+
+def _z_score(confidence: float) -> float:
+    if not 0.0 < confidence < 1.0:
+        raise ValueError("A confidence level must be between 0 and 1")
+    return NormalDist().inv_cdf((1 + confidence) / 2)
+
+
+class SimulationResult:
+    """The merged outcome counts of a Monte Carlo simulation
+
+    Attributes:
+        counts: a counter of how many trials gave each outcome
+        trials: the total number of trials run
+        stopped_early: whether the target precision was reached before all
+            the requested trials were run
+    """
+
+    def __init__(self, counts: Counter[Hashable], trials: int,
+                 stopped_early: bool = False) -> None:
+        self.counts = counts
+        self.trials = trials
+        self.stopped_early = stopped_early
+
+    def frequency(self, outcome: Hashable) -> float:
+        """Returns the observed frequency of an outcome"""
+        if not self.trials:
+            return 0.0
+        return self.counts[outcome] / self.trials
+
+    def interval(self, outcome: Hashable, confidence: float = 0.95
+                 ) -> Tuple[float, float]:
+        """Returns the Wilson score confidence interval of the probability of
+        an outcome"""
+        z = _z_score(confidence)
+        n = self.trials
+        if not n:
+            return 0.0, 1.0
+        p = self.counts[outcome] / n
+        denominator = 1 + z * z / n
+        centre = (p + z * z / (2 * n)) / denominator
+        spread = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n))
+        spread /= denominator
+        return max(centre - spread, 0.0), min(centre + spread, 1.0)
+
+    def half_width(self, confidence: float = 0.95) -> float:
+        """Returns the widest half width of any outcome's confidence
+        interval, a bound on the precision of every frequency"""
+        if not self.trials:
+            return math.inf
+        z = _z_score(confidence)
+        # p(1 - p) is largest for the outcome whose frequency is closest to
+        # a half, which bounds the normal approximation of every interval
+        p = min((self.frequency(outcome) for outcome in self.counts),
+                key=lambda f: abs(f - 0.5), default=0.0)
+        return z * math.sqrt(max(p * (1 - p), 1 / self.trials) / self.trials)
+
+    @property
+    def mean(self) -> float:
+        """Returns the mean of numeric outcomes"""
+        return sum(value * count for value, count in self.counts.items()
+                   ) / self.trials
+
+    def mean_interval(self, confidence: float = 0.95) -> Tuple[float, float]:
+        """Returns a normal confidence interval of the mean of numeric
+        outcomes"""
+        mean = self.mean
+        variance = sum((value - mean) ** 2 * count
+                       for value, count in self.counts.items())
+        variance /= max(self.trials - 1, 1)
+        spread = _z_score(confidence) * math.sqrt(variance / self.trials)
+        return mean - spread, mean + spread
+
+    def __repr__(self) -> str:
+        return (f"SimulationResult(trials={self.trials}, "
+                f"outcomes={len(self.counts)})")
+
+
+class MonteCarlo:
+    """A Monte Carlo simulation of a trial over a rollable or drawable
+
+    Trials are split into chunks and sharded across a process pool. Each
+    chunk builds its own subject by calling `setup` with an independent
+    generator from `RandomStreams`, keyed by the chunk's index, and runs
+    `trial` on it `chunk_size` times, so a seeded simulation gives the same
+    counts regardless of how chunks are scheduled. As process pools pickle
+    their work, `trial` and `setup` must be module level functions unless
+    `workers` is 1, which runs every chunk in the calling process.
+
+    Example:
+        def setup(rng):
+            return MagicalDie(6, charge=2, rng=rng)
+
+        def trial(die):
+            return sum(die.rolls(3))
+
+        result = MonteCarlo(trial, setup, seed=1).run(10**6)
+    """
+
+    def __init__(self, trial: Callable[[S], Hashable],
+                 setup: Callable[[random.Random], S],
+                 seed: Optional[int] = None, workers: Optional[int] = None,
+                 chunk_size: int = 10000) -> None:
+        if chunk_size < 1:
+            raise ValueError("A chunk must contain at least one trial")
+        self.trial = trial
+        self.setup = setup
+        self.streams = RandomStreams(seed)
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+
+    def run(self, trials: int, precision: Optional[float] = None,
+            confidence: float = 0.95) -> SimulationResult:
+        """Runs up to `trials` trials and returns the merged counts
+
+        Parameters
+        ----------
+        trials : int
+            The maximum number of trials to run
+        precision : float, optional
+            When given, the simulation stops once the confidence interval of
+            every outcome's frequency has a half width of at most this
+        confidence : float
+            The confidence level used for early stopping
+
+        Returns
+        -------
+        SimulationResult
+            The merged outcome counts of every chunk that was run
+
+        Raises
+        ------
+        ValueError
+            If fewer than one trial is requested
+        """
+        if trials < 1:
+            raise ValueError("A simulation must run at least one trial")
+        sizes = [self.chunk_size] * (trials // self.chunk_size)
+        if trials % self.chunk_size:
+            sizes.append(trials % self.chunk_size)
+        if self.workers == 1:
+            return self._run(sizes, map, precision, confidence)
+        with ProcessPoolExecutor(self.workers) as executor:
+            return self._run(sizes, executor.map, precision, confidence)
+
+    def _run(self, sizes, mapper, precision, confidence) -> SimulationResult:
+        counts = counter()
+        done = 0
+        # With a target precision chunks are dispatched in rounds of one
+        # chunk per worker, checking the precision between rounds
+        step = self.workers if precision is not None else len(sizes) or 1
+        for start in range(0, len(sizes), step):
+            batch = range(start, min(start + step, len(sizes)))
+            chunks = mapper(
+                _run_chunk,
+                [self.trial] * len(batch), [self.setup] * len(batch),
+                [self.streams.seed] * len(batch), batch,
+                [sizes[i] for i in batch],
+            )
+            for chunk in chunks:
+                counts.update(chunk)
+            done += sum(sizes[i] for i in batch)
+            result = SimulationResult(counts, done)
+            if (precision is not None and done < sum(sizes)
+                    and result.half_width(confidence) <= precision):
+                result.stopped_early = True
+                return result
+        return SimulationResult(counts, done)
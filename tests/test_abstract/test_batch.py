@@ -0,0 +1,115 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+import ctypes
+import os
+import subprocess
+import sys
+import unittest
+from array import array
+from tabletoprandom.abstract.batch import fill, int_array, randint_array
+from tabletoprandom.abstract.batch import writable_view
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))))
+
+# Run with numpy blocked, as HAS_NUMPY is fixed when the modules are imported
+FALLBACK = """
+import sys
+sys.modules['numpy'] = None
+import random
+import ctypes
+from array import array
+from tabletoprandom.abstract import batch
+from tabletoprandom.dice.traditional import TraditionalDie
+from tabletoprandom.dice.magical import MagicalDie
+assert not batch.HAS_NUMPY
+values = batch.randint_array(1, 6, 1000, random.Random(1))
+assert isinstance(values, array) and values.typecode == 'l'
+assert set(values) == set(range(1, 7))
+assert batch.randint_array(1, 6, 1000, random.Random(1)) == values
+assert isinstance(batch.int_array([1, 2]), array)
+die = TraditionalDie(20, rng=random.Random(2))
+rolls = die.roll_array(500)
+assert isinstance(rolls, array) and all(1 <= x <= 20 for x in rolls)
+assert die.last_roll == rolls[-1]
+charged = MagicalDie(6, charge=3, rng=random.Random(3)).roll_array(10)
+assert isinstance(charged, array) and list(charged[:3]) == [6, 6, 6]
+buffer = array('b', bytes(batch.CHUNK + 5))
+assert die.rolls_into(buffer) == len(buffer)
+assert all(1 <= x <= 20 for x in buffer)
+assert batch.fill(array('H', [0] * 4), lambda n: [7] * min(n, 3)) == 3
+try:
+    batch.fill(array('b', [0] * 4), lambda n: [200] * n)
+except ValueError:
+    pass
+else:
+    raise AssertionError('an out of range value was written')
+prefixed = (ctypes.c_int32 * 8)()
+assert batch.fill(prefixed, lambda n: range(n)) == 8
+assert list(prefixed) == list(range(8))
+print('ok')
+"""
+
+
+class Batch_TestCase(unittest.TestCase):
+
+    def test_fill(self):
+        buffer = array("i", [0] * 10)
+        self.assertEqual(fill(buffer, lambda n: range(n), chunk=4), 10)
+        self.assertListEqual(list(buffer), [0, 1, 2, 3, 0, 1, 2, 3, 0, 1])
+        self.assertEqual(fill(buffer, lambda n: [9] * min(n, 2)), 2)
+        self.assertListEqual(list(buffer[:3]), [9, 9, 2])
+
+    def test_fill_out_of_range(self):
+        for buffer, value in ((array("b", [0] * 4), 200),
+                              (array("B", [0] * 4), -1),
+                              ((ctypes.c_int16 * 4)(), 1 << 15)):
+            with self.subTest(buffer=buffer, value=value):
+                with self.assertRaises(ValueError):
+                    fill(buffer, lambda n: [value] * n)
+                self.assertListEqual(list(buffer), [0] * 4)
+        wide = int_array([5, 500, 5, 5])
+        with self.assertRaises(ValueError):
+            fill(array("b", [0] * 4), lambda n: wide[:n])
+        self.assertEqual(fill(array("b", [0] * 4), lambda n: [-128] * n), 4)
+
+    def test_fill_prefixed(self):
+        # ctypes arrays report standard size formats such as '<i' and '<q'
+        for ctype in (ctypes.c_int32, ctypes.c_int64, ctypes.c_uint16):
+            with self.subTest(ctype=ctype):
+                buffer = (ctype * 8)()
+                self.assertEqual(fill(buffer, lambda n: range(n)), 8)
+                self.assertListEqual(list(buffer), list(range(8)))
+                grid = ((ctype * 3) * 2)()
+                self.assertEqual(fill(grid, lambda n: range(n)), 6)
+                self.assertListEqual(list(grid[1]), [3, 4, 5])
+
+    def test_writable_view(self):
+        self.assertEqual(len(writable_view(bytearray(4))), 4)
+        with self.assertRaises(TypeError):
+            writable_view(bytes(4))
+        with self.assertRaises(TypeError):
+            writable_view(array("f", [0.0]))
+        if sys.byteorder == "little":
+            swapped = ctypes.c_int32.__ctype_be__
+        else:
+            swapped = ctypes.c_int32.__ctype_le__
+        with self.assertRaises(TypeError):
+            writable_view((swapped * 2)())
+
+    def test_randint_array(self):
+        values = randint_array(3, 5, 200)
+        self.assertEqual(len(values), 200)
+        self.assertEqual(set(values), {3, 4, 5})
+        self.assertEqual(len(randint_array(1, 6, -1)), 0)
+
+    def test_fallback(self):
+        result = subprocess.run([sys.executable, "-c", FALLBACK], cwd=ROOT,
+                                capture_output=True, text=True, timeout=60)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.strip(), "ok")
+
+
+if __name__ == '__main__':
+    unittest.main()
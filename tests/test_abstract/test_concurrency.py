@@ -0,0 +1,181 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+import math
+import random
+import unittest
+import threading
+from collections import Counter
+from tabletoprandom.abstract.concurrency import LockedDeck
+from tabletoprandom.abstract.concurrency import ThreadLocalRandom
+from tabletoprandom.abstract.concurrency import ThreadSafeRollable
+from tabletoprandom.abstract.streams import RandomStreams
+from tabletoprandom.decks.indexed import IndexedDeck
+from tabletoprandom.decks.shoe import Shoe
+from tabletoprandom.dice.magical import MagicalDie
+from tabletoprandom.dice.traditional import TraditionalDie
+from tabletoprandom.stats import hypergeometric
+
+THREADS = 8
+
+
+def run_threads(target, threads=THREADS):
+    results = [None] * threads
+
+    def worker(index):
+        results[index] = target()
+
+    workers = [threading.Thread(target=worker, args=(i,))
+               for i in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return results
+
+
+class ThreadLocalRandom_TestCase(unittest.TestCase):
+
+    def test_per_thread(self):
+        rng = ThreadLocalRandom(RandomStreams(1))
+        generators = run_threads(lambda: rng.generator)
+        self.assertEqual(len({id(g) for g in generators}), THREADS)
+        self.assertIs(rng.generator, rng.generator)
+
+    def test_streams(self):
+        rng = ThreadLocalRandom(RandomStreams(1))
+        self.assertEqual(rng.random(), RandomStreams(1).stream(0).random())
+        self.assertListEqual(run_threads(lambda: rng.random(), 1),
+                             [RandomStreams(1).stream(1).random()])
+
+    def test_missing(self):
+        with self.assertRaises(AttributeError):
+            ThreadLocalRandom().not_a_method
+
+    def test_methods(self):
+        rng = ThreadLocalRandom(RandomStreams(3))
+        reference = RandomStreams(3).stream(0)
+        self.assertEqual(rng.randint(1, 20), reference.randint(1, 20))
+        self.assertEqual(rng.randrange(0, 10, 2),
+                         reference.randrange(0, 10, 2))
+        self.assertEqual(rng.choice("abcdef"), reference.choice("abcdef"))
+        self.assertListEqual(rng.choices(range(6), k=4),
+                             reference.choices(range(6), k=4))
+        self.assertListEqual(rng.sample(range(10), 3),
+                             reference.sample(range(10), 3))
+        cards, expected = list(range(10)), list(range(10))
+        rng.shuffle(cards)
+        reference.shuffle(expected)
+        self.assertListEqual(cards, expected)
+        self.assertEqual(rng.getrandbits(64), reference.getrandbits(64))
+        self.assertEqual(rng.uniform(1, 2), reference.uniform(1, 2))
+        self.assertEqual(rng.random(), reference.random())
+        self.assertEqual(rng.gauss(0, 1), reference.gauss(0, 1))
+
+
+class ThreadSafeRollable_TestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.die = ThreadSafeRollable(TraditionalDie(20), RandomStreams(2))
+
+    def test_roll(self):
+        rolls = list(self.die.rolls(500))
+        self.assertTrue(all(1 <= roll <= 20 for roll in rolls))
+        self.assertEqual(self.die.last_roll, rolls[-1])
+        self.assertEqual(len(self.die.roll_array(10)), 10)
+        self.assertEqual(self.die.num_faces, 20)
+        self.assertEqual(str(self.die), "d20")
+
+    def test_last_roll_per_thread(self):
+        def roll():
+            value = self.die.roll()
+            return value == self.die.last_roll
+
+        self.assertTrue(all(run_threads(roll)))
+        self.assertIsNone(self.die.last_roll)
+
+    def test_reproducible(self):
+        other = ThreadSafeRollable(TraditionalDie(20), RandomStreams(2))
+        self.assertListEqual(list(self.die.rolls(20)),
+                             list(other.rolls(20)))
+
+    def test_unwrap(self):
+        rng = random.Random(5)
+        die = TraditionalDie(6, rng=rng)
+        wrapped = ThreadSafeRollable(die, RandomStreams(5))
+        self.assertIsInstance(die.rng, ThreadLocalRandom)
+        self.assertIs(wrapped.unwrap(), die)
+        self.assertIs(die.rng, rng)
+
+    def test_magical_charge(self):
+        die = ThreadSafeRollable(MagicalDie(6, charge=1000),
+                                 RandomStreams(3))
+
+        def roll():
+            best = [die.roll() for _ in range(300)].count(6)
+            return best + list(die.roll_array(50)).count(6)
+
+        results = run_threads(roll)
+        self.assertEqual(die.charge, 0)
+        self.assertGreaterEqual(sum(results), 1000)
+
+
+class LockedDeck_TestCase(unittest.TestCase):
+
+    def test_draws(self):
+        deck = LockedDeck(IndexedDeck(range(8000), rng=RandomStreams(4)
+                                      .stream(0)))
+        deck.shuffle()
+
+        def draw():
+            cards = [deck.draw() for _ in range(500)]
+            cards += deck.draw_many(500)
+            return cards, deck.last_draw == cards[-1]
+
+        results = run_threads(draw)
+        cards = [card for drawn, _ in results for card in drawn]
+        self.assertEqual(sorted(cards), list(range(8000)))
+        self.assertTrue(all(last for _, last in results))
+        self.assertEqual(len(deck), 0)
+        self.assertEqual(deck.drawn, Counter(range(8000)))
+        self.assertDictEqual(deck.replace_all(),
+                             {card: 1 for card in range(8000)})
+
+    def test_delegates(self):
+        deck = LockedDeck(Shoe(range(10), decks=2, rng=RandomStreams(5)
+                               .stream(0)))
+        top = deck.peek(3)
+        self.assertIsInstance(top, list)
+        self.assertListEqual(deck.draw_many(3), top)
+        deck.discard_all()
+        self.assertEqual(sum(deck.discarded.values()), 3)
+        self.assertEqual(deck.decks, 2)
+        self.assertAlmostEqual(deck.probability_at_least({0: 0}, 1), 1.0)
+
+    def test_len_locked(self):
+        deck = LockedDeck(IndexedDeck(range(10)))
+        sizes = []
+        with deck.lock:
+            reader = threading.Thread(target=lambda: sizes.append(len(deck)))
+            reader.start()
+            reader.join(0.05)
+            self.assertTrue(reader.is_alive())
+            deck.draw_many(4)
+        reader.join()
+        self.assertListEqual(sizes, [6])
+
+
+class LogFactorial_TestCase(unittest.TestCase):
+
+    def test_threaded_growth(self):
+        table = hypergeometric._log_factorials
+        del table[1:]
+        values = run_threads(lambda: [hypergeometric.log_factorial(n)
+                                      for n in range(0, 3000, 7)])
+        self.assertEqual(len(table), 2997)
+        self.assertTrue(all(result == values[0] for result in values))
+        self.assertAlmostEqual(table[2996] - table[2995], math.log(2996))
+
+
+if __name__ == '__main__':
+    unittest.main()
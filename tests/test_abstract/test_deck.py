@@ -0,0 +1,123 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+import unittest
+import random
+from collections import Counter
+from tabletoprandom.abstract.deck import Deck
+
+
+class DeckBehaviour:
+    """Tests shared by every deck type, mixed into the test case of each
+    deck, whose `setUp` builds `self.deck` of `self.cards`"""
+    deck_type = Deck
+
+    def test_reset(self):
+        deck = self.deck_type(range(10))
+        deck.shuffle()
+        list(deck.draws(4))
+        deck.return_card("X")
+        pool = deck.reset()
+        self.assertEqual(len(deck), 10)
+        self.assertEqual(deck.drawn, Counter())
+        self.assertEqual(dict(pool), Counter(range(10)))
+        self.assertEqual(pool["X"], 0)
+        self.assertListEqual(list(deck.draws(10)), list(range(10)))
+
+    def test_replace_all_generator(self):
+        list(self.deck.draws(3))
+        self.deck.return_card("A")
+        self.deck.replace_all()
+        self.assertEqual(self.deck.drawn, Counter())
+        self.assertEqual(dict(self.deck.pool), Counter(self.cards))
+        self.assertEqual(len(self.deck), 6)
+
+
+class Deck_TestCase(DeckBehaviour, unittest.TestCase):
+
+    def setUp(self):
+        self.cards = ["A", "B", "B", "C", "C", "C"]
+        self.deck = Deck(self.cards)
+
+    def test_sized(self):
+        self.assertEqual(len(self.deck), 6)
+        self.deck.draw()
+        self.assertEqual(len(self.deck), 5)
+        self.assertEqual(len(Deck()), 0)
+
+    def test_draw(self):
+        self.assertIsNone(self.deck.last_draw)
+        self.assertEqual(self.deck.draw(), "A")
+        self.assertEqual(self.deck.last_draw, "A")
+        self.assertListEqual(list(self.deck.draws(2)), ["B", "B"])
+        self.assertEqual(self.deck.drawn, Counter({"A": 1, "B": 2}))
+        self.assertEqual(dict(self.deck.pool), {"C": 3})
+        self.assertListEqual(list(self.deck.draws(10)), ["C", "C", "C"])
+        self.assertEqual(dict(self.deck.pool), {})
+        with self.assertRaises(StopIteration):
+            self.deck.draw()
+
+    def test_pool(self):
+        self.assertEqual(dict(self.deck.pool), Counter(self.cards))
+        self.assertEqual(self.deck.pool["D"], 0)
+        with self.assertRaises(TypeError):
+            self.deck.pool["A"] = 5
+        pool = self.deck.pool
+        self.deck.draw()
+        self.assertEqual(pool["A"], 0)
+
+    def test_return_cards(self):
+        drawn = list(self.deck.draws(3))
+        self.deck.return_cards(card for card in drawn[:2])
+        self.assertEqual(self.deck.drawn, Counter({"A": 0, "B": 1}))
+        self.assertEqual(self.deck.pool["A"], 1)
+        self.assertEqual(list(self.deck.deck)[-2:], ["A", "B"])
+        self.deck.return_card("B", place_top=True)
+        self.assertEqual(self.deck.peek(), ["B"])
+        self.assertEqual(len(self.deck), 6)
+
+    def test_draw_and_replace(self):
+        for _ in range(20):
+            self.deck.draw_and_replace()
+        self.assertEqual(len(self.deck), 6)
+        self.assertEqual(dict(self.deck.pool), Counter(self.cards))
+        self.assertEqual(+self.deck.drawn, Counter())
+
+    def test_replace_all(self):
+        for _ in self.deck.draws(4):
+            pass
+        pool = self.deck.replace_all()
+        self.assertEqual(dict(pool), Counter(self.cards))
+        self.assertEqual(self.deck.drawn, Counter())
+        self.assertEqual(len(self.deck), 6)
+
+    def test_shuffle(self):
+        deck = Deck(range(52), rng=random.Random(1))
+        same = Deck(range(52), rng=random.Random(1))
+        deck.shuffle()
+        same.shuffle()
+        self.assertListEqual(list(deck.deck), list(same.deck))
+        self.assertNotEqual(list(deck.deck), list(range(52)))
+        self.assertEqual(dict(deck.pool), Counter(range(52)))
+
+    def test_draw_many(self):
+        self.assertListEqual(self.deck.draw_many(4), ["A", "B", "B", "C"])
+        self.assertEqual(self.deck.last_draw, "C")
+        self.assertEqual(self.deck.drawn, Counter("ABBC"))
+        self.assertEqual(dict(self.deck.pool), {"C": 2})
+        self.assertListEqual(self.deck.draw_many(10), ["C", "C"])
+        self.assertListEqual(self.deck.draw_many(1), [])
+
+    def test_deal(self):
+        deck = Deck(range(52))
+        hands = deck.deal(4, 13)
+        self.assertListEqual(hands[0], list(range(0, 52, 4)))
+        self.assertEqual(len(deck), 0)
+
+    def test_peek(self):
+        self.assertListEqual(self.deck.peek(2), ["A", "B"])
+        self.assertListEqual(self.deck.peek(10), self.cards)
+
+
+if __name__ == '__main__':
+    unittest.main()
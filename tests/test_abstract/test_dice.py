@@ -0,0 +1,83 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+import unittest
+import random
+from tabletoprandom.abstract.dice import FairDie, NumericDie
+
+
+class Coin(FairDie[str]):
+    """A fair die written to the original rule of only defining `faces`,
+    without calling `super().__init__`"""
+    num_faces = 2
+
+    def __init__(self):
+        self.last_roll = None
+
+    @property
+    def faces(self):
+        return {"heads", "tails"}
+
+
+class Teetotum(NumericDie[int], FairDie[int]):
+    """A numeric die written to the original rule of only defining
+    `faces`"""
+    num_faces = 4
+
+    def __init__(self):
+        self.last_roll = None
+
+    @property
+    def faces(self):
+        return {4, 1, 3, 2}
+
+
+class FairDie_TestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.coin = Coin()
+
+    def test_roll(self):
+        random.seed(1)
+        rolls = {self.coin.roll() for _ in range(100)}
+        self.assertSetEqual(rolls, {"heads", "tails"})
+        self.assertIn(self.coin.last_roll, rolls)
+        self.assertEqual(len(self.coin.roll_array(10)), 10)
+
+    def test_rng(self):
+        self.coin.rng = random.Random(1)
+        first = [self.coin.roll() for _ in range(20)]
+        self.coin.rng = random.Random(1)
+        self.assertListEqual([self.coin.roll() for _ in range(20)], first)
+
+    def test_probability(self):
+        self.assertEqual(self.coin.probability("heads"), 0.5)
+        self.assertEqual(self.coin.probability("edge"), 0.0)
+        self.assertSetEqual(self.coin.mode, {"heads", "tails"})
+        self.assertEqual(len(self.coin), 2)
+
+
+class NumericDie_TestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.die = Teetotum()
+
+    def test_face_order(self):
+        self.assertListEqual(self.die.face_order, [1, 2, 3, 4])
+        self.assertEqual(self.die.best_roll, 4)
+        self.assertEqual(self.die.worst_roll, 1)
+        self.assertEqual(self.die.median, 2)
+        self.assertIn(self.die.roll(), {1, 2, 3, 4})
+
+    def test_moments(self):
+        self.assertEqual(self.die.mean, 2.5)
+        self.assertAlmostEqual(self.die.variance, 1.25)
+        self.assertIs(self.die.moments, self.die.moments)
+
+    def test_missing_attribute(self):
+        with self.assertRaises(AttributeError):
+            self.die.not_an_attribute
+
+
+if __name__ == '__main__':
+    unittest.main()
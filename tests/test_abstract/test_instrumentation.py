@@ -0,0 +1,123 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+import json
+import random
+import threading
+import unittest
+from tabletoprandom.abstract import instrumentation
+from tabletoprandom.abstract.deck import Deck
+from tabletoprandom.abstract.primitives import Rollable
+from tabletoprandom.decks.indexed import IndexedDeck
+from tabletoprandom.dice.traditional import TraditionalDie
+from tabletoprandom.dice.magical import MagicalDie
+
+
+class Instrumentation_TestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.d6 = TraditionalDie(6, rng=random.Random(1))
+        self.deck = Deck(range(10), rng=random.Random(1))
+        instrumentation.reset()
+        instrumentation.enable()
+
+    def tearDown(self):
+        instrumentation.disable()
+        instrumentation.reset()
+
+    def test_disabled_restores_methods(self):
+        self.assertTrue(instrumentation.is_enabled())
+        self.assertIn('__wrapped__', vars(Rollable.roll))
+        instrumentation.disable()
+        self.assertFalse(instrumentation.is_enabled())
+        self.assertEqual(Rollable.roll.__qualname__, "Rollable.roll")
+        self.assertNotIn('__wrapped__', vars(Rollable.roll))
+        self.d6.roll()
+        self.assertEqual(instrumentation.counters(self.d6).calls, 0)
+
+    def test_roll_counters(self):
+        self.d6.roll()
+        list(self.d6.rolls(3))
+        next(self.d6)
+        self.d6.roll_array(10)
+        counters = instrumentation.counters(self.d6)
+        self.assertEqual(counters.calls, 6)
+        self.assertEqual(counters.items, 15)
+        self.assertEqual(instrumentation.totals("roll").items, 15)
+        self.assertEqual(instrumentation.totals("draw").items, 0)
+        with self.assertRaises(ValueError):
+            instrumentation.totals("shuffle")
+
+    def test_nested_not_counted_twice(self):
+        die = MagicalDie(6, charge=2, rng=random.Random(1))
+        die.roll_array(5)
+        self.deck.draw_many(4)
+        self.assertEqual(instrumentation.counters(die).items, 5)
+        self.assertEqual(instrumentation.counters(self.deck).calls, 1)
+        self.assertEqual(instrumentation.counters(self.deck).items, 4)
+
+    def test_threads(self):
+        dice = [TraditionalDie(6, rng=random.Random(i)) for i in range(4)]
+
+        def roll(die):
+            for _ in range(2000):
+                die.roll()
+                self.d6.roll()
+
+        threads = [threading.Thread(target=roll, args=(die,))
+                   for die in dice * 2]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(instrumentation.totals("roll").calls, 32000)
+        self.assertEqual(instrumentation.counters(self.d6).calls, 16000)
+        for die in dice:
+            self.assertEqual(instrumentation.counters(die).calls, 4000)
+
+    def test_into_counters(self):
+        deck = IndexedDeck(range(10), rng=random.Random(1))
+        buffer = bytearray(10)
+        self.assertEqual(self.d6.rolls_into(buffer), 10)
+        self.assertEqual(deck.draws_into(buffer), 10)
+        self.assertEqual(deck.draws_into(buffer), 0)
+        self.assertEqual(instrumentation.counters(self.d6).calls, 1)
+        self.assertEqual(instrumentation.counters(self.d6).items, 10)
+        self.assertEqual(instrumentation.counters(deck).calls, 2)
+        self.assertEqual(instrumentation.counters(deck).items, 10)
+
+    def test_draw_counters(self):
+        self.deck.draw()
+        list(self.deck.draws(20))
+        counters = instrumentation.counters(self.deck)
+        self.assertEqual(counters.items, 10)
+        self.assertEqual(instrumentation.totals("draw").calls, 10)
+
+    def test_timing_and_callbacks(self):
+        events = []
+        instrumentation.enable(timing=True)
+        instrumentation.subscribe(events.append)
+        try:
+            self.d6.roll()
+            self.deck.draw_many(3)
+        finally:
+            instrumentation.unsubscribe(events.append)
+        self.d6.roll()
+        self.assertEqual([(e.kind, e.method, e.items) for e in events],
+                         [("roll", "roll", 1), ("draw", "draw_many", 3)])
+        self.assertIs(events[0].subject, self.d6)
+        self.assertTrue(all(e.elapsed >= 0 for e in events))
+        counters = instrumentation.counters(self.d6)
+        self.assertEqual(sum(counters.histogram), 2)
+
+    def test_snapshot(self):
+        self.d6.roll()
+        snapshot = json.loads(json.dumps(instrumentation.snapshot()))
+        self.assertTrue(snapshot["enabled"])
+        self.assertEqual(snapshot["totals"]["roll"]["calls"], 1)
+        objects = snapshot["objects"]
+        self.assertEqual(len(objects), 1)
+        self.assertEqual(objects[0]["type"], "TraditionalDie")
+        self.assertEqual(objects[0]["name"], "d6")
+        del self.d6
+        self.assertEqual(instrumentation.snapshot()["objects"], [])
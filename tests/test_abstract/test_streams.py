@@ -0,0 +1,73 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+import unittest
+import random
+from tabletoprandom.abstract.streams import RandomStreams
+from tabletoprandom.dice.traditional import TraditionalDie
+from tabletoprandom.dice.magical import MagicalDie
+from tabletoprandom.dice.enumdie import EnumDie, ElementValue
+
+
+class RandomStreams_TestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.streams = RandomStreams(1234)
+
+    def test_stream_reproducible(self):
+        first = self.streams.stream(3).random()
+        self.assertEqual(first, RandomStreams(1234).stream(3).random())
+        self.assertNotEqual(first, RandomStreams(1235).stream(3).random())
+        self.assertNotEqual(first, self.streams.stream(4).random())
+
+    def test_spawn(self):
+        spawned = self.streams.spawn(3)
+        self.assertEqual(len(spawned), 3)
+        self.assertEqual(len({rng.random() for rng in spawned}), 3)
+        next_stream = self.streams.spawn()[0]
+        self.assertEqual(next_stream.random(),
+                         RandomStreams(1234).stream(3).random())
+
+    def test_child(self):
+        child = self.streams.child(0)
+        self.assertEqual(child.key, (0,))
+        self.assertNotEqual(child.stream(0).random(),
+                            self.streams.stream(0).random())
+        self.assertEqual(child.stream(0).random(),
+                         RandomStreams(1234).child(0).stream(0).random())
+
+    def test_unseeded(self):
+        self.assertNotEqual(RandomStreams().seed, RandomStreams().seed)
+
+    def test_bad_index(self):
+        with self.assertRaises(ValueError):
+            RandomStreams(-1)
+        with self.assertRaises(ValueError):
+            self.streams.stream(-1)
+        with self.assertRaises(ValueError):
+            self.streams.child(-1)
+
+    def test_dice_streams(self):
+        dice = (
+            lambda rng: TraditionalDie(20, rng=rng),
+            lambda rng: MagicalDie(6, 2, rng=rng),
+            lambda rng: EnumDie(ElementValue, rng=rng),
+        )
+        for make_die in dice:
+            with self.subTest(die=str(make_die(None))):
+                first = make_die(self.streams.stream(0))
+                second = make_die(self.streams.stream(0))
+                random.seed(0)
+                first_rolls = list(first.rolls(20))
+                random.seed(1)
+                self.assertListEqual(first_rolls, list(second.rolls(20)))
+        first = TraditionalDie(6, self.streams.stream(1))
+        second = TraditionalDie(6, self.streams.stream(1))
+        self.assertListEqual(list(first.roll_array(100)),
+                             list(second.roll_array(100)))
+        self.assertEqual(TraditionalDie.quick_roll(20, random.Random(5)),
+                         TraditionalDie.quick_roll(20, random.Random(5)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,24 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+import unittest
+from benchmarks.roll_cost import RebuiltDie, compare
+
+
+class RollCost_TestCase(unittest.TestCase):
+
+    def test_reference(self):
+        die = RebuiltDie(6)
+        self.assertIn(die.roll(), die.faces)
+        self.assertEqual(die.best_roll, 6)
+        self.assertEqual(die.probability(7), 0.0)
+
+    def test_compare(self):
+        results = compare(repeat=1, number=3)
+        self.assertIsNotNone(results["d6"]["roll"][1])
+        self.assertIsNone(results["dE"]["roll"][1])
+        self.assertIn("best_roll", results["dF"])
+
+
+if __name__ == '__main__':
+    unittest.main()
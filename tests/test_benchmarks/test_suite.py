@@ -0,0 +1,88 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+from benchmarks.__main__ import main
+from benchmarks.suite import CALIBRATION, Timing, cases, measure
+from benchmarks.suite import combine, regressions, sample
+
+
+class Suite_TestCase(unittest.TestCase):
+
+    def test_cases(self):
+        found = cases()
+        names = [case.name for case in found]
+        self.assertEqual(len(names), len(set(names)))
+        for prefix in ("roll/", "rolls/", "quick_roll/", "draw/",
+                       "shuffle/", "peek/", "pool/"):
+            with self.subTest(prefix=prefix):
+                self.assertTrue(any(name.startswith(prefix)
+                                    for name in names))
+
+    def test_measure(self):
+        for case in cases() + [CALIBRATION]:
+            with self.subTest(case=case.name):
+                self.assertGreater(measure(case, repeat=1, number=3), 0)
+
+    def test_sample(self):
+        timing = sample(cases()[0], runs=3, repeat=1, budget=0.001)
+        self.assertGreater(timing.cost, 0)
+        self.assertGreater(timing.relative, 0)
+        self.assertGreaterEqual(timing.noise, 0)
+
+    def test_combine(self):
+        timing = combine([Timing(10.0, 1.0, 0.01), Timing(30.0, 1.2, 0.02),
+                          Timing(20.0, 0.9, 0.03)])
+        self.assertEqual(timing.cost, 20.0)
+        self.assertEqual(timing.relative, 1.0)
+        self.assertAlmostEqual(timing.noise, 0.2)
+        steady = combine([Timing(10.0, 1.0, 0.05)] * 2)
+        self.assertEqual(steady.noise, 0.05)
+
+    def test_regressions(self):
+        baseline = {"fast": Timing(50.0, 1.0, 0.0),
+                    "slow": Timing(50.0, 1.0, 0.0),
+                    "noisy": Timing(50.0, 1.0, 0.2),
+                    "gone": Timing(0.0, 0.0, 0.0)}
+        results = {"fast": Timing(500.0, 1.1, 0.0),
+                   "slow": Timing(50.0, 1.3, 0.0),
+                   "noisy": Timing(50.0, 1.4, 0.1),
+                   "gone": Timing(5.0, 0.1, 0.0),
+                   "new": Timing(1.0, 1.0, 0.0)}
+        self.assertDictEqual(regressions(results, baseline, 0.25),
+                             {"slow": 1.3})
+        self.assertDictEqual(regressions(results, baseline, 0.0),
+                             {"fast": 1.1, "slow": 1.3, "noisy": 1.4})
+        self.assertDictEqual(regressions(results, baseline, 0.5), {})
+
+    def test_other_host(self):
+        # A baseline of impossibly fast results only fails the gate when it
+        # was recorded on this host
+        fast = {"cost": 1e-6, "relative": 1e-6, "noise": 0.0}
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "baseline.json")
+            with open(path, "w") as fh:
+                json.dump({"python": "0.0.0", "machine": "abacus",
+                           "results": {"roll/d6": fast}}, fh)
+            arguments = ["--baseline", path, "--filter", "roll/d6",
+                         "--runs", "1", "--repeat", "1", "--budget", "0.001"]
+            errors = io.StringIO()
+            with contextlib.redirect_stdout(io.StringIO()), \
+                    contextlib.redirect_stderr(errors):
+                self.assertEqual(main(arguments), 0)
+                self.assertIn("WARNING", errors.getvalue())
+                self.assertEqual(main(arguments + ["--update-baseline"]), 0)
+                with open(path) as fh:
+                    stored = json.load(fh)
+                self.assertNotEqual(stored["python"], "0.0.0")
+                self.assertEqual(set(stored["results"]["roll/d6"]),
+                                 set(fast))
+                stored["results"]["roll/d6"] = fast
+                with open(path, "w") as fh:
+                    json.dump(stored, fh)
+                self.assertEqual(main(arguments), 1)
@@ -0,0 +1,21 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+import unittest
+from benchmarks.threads import cases, gil_enabled, run
+
+
+class Threads_TestCase(unittest.TestCase):
+
+    def test_run(self):
+        for case in cases():
+            for threads in (1, 2):
+                with self.subTest(case=case.name, threads=threads):
+                    self.assertGreater(run(case, threads, 0.01), 0)
+
+    def test_gil(self):
+        self.assertIsInstance(gil_enabled(), bool)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,161 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+import unittest
+import random
+from array import array
+from collections import Counter
+from tabletoprandom.decks.indexed import IndexedDeck
+from tests.test_abstract.test_deck import DeckBehaviour
+
+
+class IndexedDeck_TestCase(DeckBehaviour, unittest.TestCase):
+    deck_type = IndexedDeck
+
+    def setUp(self):
+        self.cards = ["A", "B", "B", "C", "C", "C"]
+        self.deck = IndexedDeck(self.cards)
+        self.lazy = IndexedDeck(range(52), rng=random.Random(1))
+        self.eager = IndexedDeck(range(52), rng=random.Random(1), lazy=False)
+
+    def test_table(self):
+        self.assertEqual(self.deck.table, ("A", "B", "C"))
+        self.assertEqual(len(self.deck), 6)
+        self.assertEqual(len(IndexedDeck()), 0)
+
+    def test_draw(self):
+        self.assertListEqual(list(self.deck.draws(3)), ["A", "B", "B"])
+        self.assertEqual(self.deck.last_draw, "B")
+        self.assertEqual(self.deck.drawn, Counter({"A": 1, "B": 2}))
+        self.assertEqual(dict(self.deck.pool), {"C": 3})
+        self.assertNotIn("A", self.deck.pool)
+        self.assertEqual(self.deck.pool["A"], 0)
+        self.assertEqual(self.deck.pool["Z"], 0)
+        self.assertListEqual(list(self.deck.draws(10)), ["C", "C", "C"])
+        with self.assertRaises(StopIteration):
+            self.deck.draw()
+
+    def test_shuffle(self):
+        for deck in (self.lazy, self.eager):
+            with self.subTest(lazy=deck.lazy):
+                deck.shuffle()
+                self.assertEqual(sorted(deck.peek(52)), list(range(52)))
+                order = deck.order
+                self.assertNotEqual(order, list(range(52)))
+                self.assertListEqual(list(deck.draws(52)), order)
+
+    def test_lazy_reproducible(self):
+        other = IndexedDeck(range(52), rng=random.Random(1))
+        self.lazy.shuffle()
+        other.shuffle()
+        self.assertListEqual(list(self.lazy.peek(3)), list(other.peek(3)))
+        self.assertListEqual(list(self.lazy.draws(5)), list(other.draws(5)))
+        self.assertListEqual(self.lazy.order, other.order)
+
+    def test_lazy_uniform(self):
+        deck = IndexedDeck(range(4), rng=random.Random(2))
+        tops = Counter()
+        for _ in range(4000):
+            deck.shuffle()
+            tops[deck.draw()] += 1
+            deck.replace_all()
+        self.assertEqual(len(deck), 4)
+        for card in range(4):
+            with self.subTest(card=card):
+                self.assertGreater(tops[card], 850)
+                self.assertLess(tops[card], 1150)
+
+    def test_return_cards(self):
+        self.lazy.shuffle()
+        drawn = list(self.lazy.draws(5))
+        self.lazy.return_cards(iter(drawn[:2]))
+        self.assertEqual(self.lazy.order[-2:], drawn[:2])
+        self.lazy.return_card(drawn[2], place_top=True)
+        self.assertEqual(self.lazy.peek(), [drawn[2]])
+        self.assertEqual(len(self.lazy), 50)
+        self.assertEqual(+self.lazy.drawn, Counter(drawn[3:]))
+        self.deck.return_card("D", place_top=True)
+        self.assertEqual(self.deck.draw(), "D")
+        self.assertEqual(self.deck.drawn["D"], 0)
+
+    def test_replace_all(self):
+        for _ in range(100):
+            self.eager.shuffle()
+            list(self.eager.draws(5))
+            pool = self.eager.replace_all()
+        self.assertEqual(dict(pool), Counter(range(52)))
+        self.assertEqual(self.eager.drawn, Counter())
+        self.assertEqual(len(self.eager), 52)
+
+    def test_draw_many(self):
+        self.assertListEqual(self.deck.draw_many(4), ["A", "B", "B", "C"])
+        self.assertEqual(self.deck.last_draw, "C")
+        self.assertEqual(self.deck.drawn, Counter("ABBC"))
+        self.assertEqual(dict(self.deck.pool), {"C": 2})
+        self.assertListEqual(self.deck.draw_many(10), ["C", "C"])
+        self.assertListEqual(self.deck.draw_many(1), [])
+        self.lazy.shuffle()
+        top = list(self.lazy.peek(10))
+        self.assertListEqual(self.lazy.draw_many(10), top)
+
+    def test_deal(self):
+        self.lazy.shuffle()
+        order = self.lazy.order
+        hands = self.lazy.deal(4, 13)
+        self.assertEqual(len(hands), 4)
+        self.assertListEqual(hands[1], order[1::4])
+        self.assertEqual(len(self.lazy), 0)
+        self.assertEqual(sum(self.lazy.drawn.values()), 52)
+
+    def test_peek_view(self):
+        view = self.deck.peek(3)
+        self.assertEqual(len(view), 3)
+        self.assertEqual(view, ["A", "B", "B"])
+        self.assertEqual(view[-1], "B")
+        self.assertEqual(view[1:], ["B", "B"])
+        with self.assertRaises(IndexError):
+            view[3]
+        self.assertEqual(len(self.deck.peek(100)), 6)
+
+    def test_peek_view_invalidated(self):
+        changes = (lambda deck: deck.draw(),
+                   lambda deck: deck.draw_many(2),
+                   lambda deck: deck.shuffle(),
+                   lambda deck: deck.return_card("A", place_top=True),
+                   lambda deck: deck.replace_all(),
+                   lambda deck: deck.reset())
+        for change in changes:
+            with self.subTest(change=change):
+                deck = IndexedDeck(self.cards)
+                view = deck.peek(3)
+                kept = list(view)
+                change(deck)
+                self.assertEqual(len(view), 3)
+                with self.assertRaises(RuntimeError):
+                    view[0]
+                with self.assertRaises(RuntimeError):
+                    list(view)
+                self.assertListEqual(kept, ["A", "B", "B"])
+
+    def test_draw_and_replace(self):
+        for _ in range(200):
+            self.deck.draw_and_replace()
+        self.assertEqual(dict(self.deck.pool), Counter(self.cards))
+        self.assertLessEqual(len(self.deck._order), 12)
+
+    def test_draws_into(self):
+        buffer = array("i", [-1] * 8)
+        self.assertEqual(self.deck.draws_into(buffer), 6)
+        self.assertListEqual(list(buffer), [0, 1, 1, 2, 2, 2, -1, -1])
+        self.assertEqual(self.deck.last_draw, "C")
+        self.assertEqual(self.deck.drawn, Counter(self.cards))
+        self.assertEqual(len(self.deck), 0)
+        self.lazy.shuffle()
+        order = self.lazy.order
+        buffer = array("H", bytes(2 * 52))
+        self.assertEqual(self.lazy.draws_into(memoryview(buffer)), 52)
+        self.assertListEqual([self.lazy.table[i] for i in buffer], order)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+import unittest
+import random
+from array import array
+from collections import Counter
+from tabletoprandom.decks.multiset import MultisetDeck
+
+
+class MultisetDeck_TestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.cards = ["A", "B", "B", "C", "C", "C"]
+        self.deck = MultisetDeck(self.cards, rng=random.Random(1))
+        self.bag = MultisetDeck.from_counts(
+            {"gold": 1000000, "gem": 10, "curse": 0}, rng=random.Random(2))
+
+    def test_counts(self):
+        self.assertEqual(self.deck.table, ("A", "B", "C"))
+        self.assertEqual(len(self.deck), 6)
+        self.assertDictEqual(dict(self.deck.pool), {"A": 1, "B": 2, "C": 3})
+        self.assertEqual(len(self.bag), 1000010)
+        self.assertNotIn("curse", self.bag.pool)
+        self.assertEqual(len(MultisetDeck()), 0)
+        with self.assertRaises(ValueError):
+            MultisetDeck.from_counts({"A": -1})
+
+    def test_draw(self):
+        drawn = list(self.deck.draws(10))
+        self.assertEqual(Counter(drawn), Counter(self.cards))
+        self.assertEqual(self.deck.last_draw, drawn[-1])
+        self.assertEqual(self.deck.drawn, Counter(self.cards))
+        self.assertEqual(dict(self.deck.pool), {})
+        self.assertEqual(len(self.deck), 0)
+        with self.assertRaises(StopIteration):
+            self.deck.draw()
+
+    def test_uniform(self):
+        firsts = Counter()
+        for _ in range(6000):
+            firsts[self.deck.draw()] += 1
+            self.deck.replace_all()
+        for card, count in Counter(self.cards).items():
+            with self.subTest(card=card):
+                self.assertAlmostEqual(firsts[card] / 6000, count / 6,
+                                       delta=0.03)
+
+    def test_draw_many(self):
+        cards = self.bag.draw_many(5000)
+        self.assertEqual(len(cards), 5000)
+        self.assertEqual(self.bag.drawn, Counter(cards))
+        self.assertEqual(len(self.bag), 1000010 - 5000)
+        self.assertEqual(self.bag.pool["gold"] + self.bag.pool["gem"],
+                         len(self.bag))
+        small = self.deck.draw_many(2)
+        self.assertEqual(len(small), 2)
+        rest = self.deck.draw_many(10)
+        self.assertEqual(Counter(small + rest), Counter(self.cards))
+        self.assertListEqual(self.deck.draw_many(1), [])
+
+    def test_peek(self):
+        top = self.deck.peek(3)
+        self.assertListEqual(self.deck.peek(2), top[:2])
+        self.assertEqual(len(self.deck), 6)
+        self.assertListEqual(self.deck.draw_many(2), top[:2])
+        self.assertEqual(self.deck.draw(), top[2])
+        self.assertEqual(len(self.deck.peek(10)), 3)
+        self.deck.shuffle()
+        self.assertEqual(len(self.deck), 3)
+        self.assertEqual(sum(self.deck.pool.values()), 3)
+
+    def test_return(self):
+        self.deck.draw_many(6)
+        self.deck.return_card("B", place_top=True)
+        self.deck.return_cards(["A", "Z"])
+        self.assertEqual(self.deck.draw(), "B")
+        self.assertDictEqual(dict(self.deck.pool), {"A": 1, "Z": 1})
+        self.assertEqual(self.deck.drawn["Z"], -1)
+        self.deck.return_cards(["Y", "X"], place_top=True)
+        self.assertListEqual(self.deck.draw_many(2), ["X", "Y"])
+        self.assertEqual(Counter(self.deck.draw_many(5)),
+                         Counter({"A": 1, "Z": 1}))
+
+    def test_reset(self):
+        self.deck.draw_many(4)
+        self.deck.return_card("Z")
+        self.deck.peek(2)
+        self.assertDictEqual(dict(self.deck.reset()),
+                             {"A": 1, "B": 2, "C": 3})
+        self.assertEqual(len(self.deck), 6)
+        self.assertEqual(self.deck.drawn, Counter())
+
+    def test_probability(self):
+        self.assertAlmostEqual(
+            self.deck.probability_at_least({"C": 1}, 2), 1 - 3 / 15)
+        self.assertEqual(len(self.bag.deal(3, 2)), 3)
+
+    def test_draws_into(self):
+        top = self.deck.peek(2)
+        buffer = array("b", bytes(8))
+        self.assertEqual(self.deck.draws_into(buffer), 6)
+        cards = [self.deck.table[i] for i in buffer[:6]]
+        self.assertListEqual(cards[:2], top)
+        self.assertEqual(Counter(cards), Counter(self.cards))
+        self.assertEqual(self.deck.drawn, Counter(self.cards))
+        buffer = array("l", bytes(8 * 5000))
+        self.assertEqual(self.bag.draws_into(buffer), 5000)
+        drawn = Counter(self.bag.table[i] for i in buffer)
+        self.assertEqual(self.bag.drawn, drawn)
+        self.assertEqual(self.bag.last_draw, self.bag.table[buffer[-1]])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+import unittest
+import random
+from array import array
+from collections import Counter
+from tabletoprandom.decks.shoe import Shoe
+
+
+class Shoe_TestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.shoe = Shoe(range(10), decks=4, penetration=0.5,
+                         rng=random.Random(1))
+
+    def test_contents(self):
+        self.assertEqual(len(self.shoe), 40)
+        self.assertEqual(self.shoe.table, tuple(range(10)))
+        self.assertEqual(dict(self.shoe.pool), {card: 4 for card in range(10)})
+        self.assertEqual(self.shoe.cut_card, 20)
+        self.assertEqual(self.shoe.statistics.shuffles, 1)
+        self.assertNotEqual(self.shoe.order, [card for card in range(10)
+                                              for _ in range(4)])
+        with self.assertRaises(ValueError):
+            Shoe(range(10), decks=0)
+        with self.assertRaises(ValueError):
+            Shoe(range(10), penetration=1.5)
+
+    def test_discard(self):
+        hand = self.shoe.draw_many(5)
+        self.shoe.discard(hand[:2])
+        self.assertEqual(self.shoe.drawn, Counter(hand[2:]))
+        self.assertEqual(Counter(dict(self.shoe.discarded)),
+                         Counter(hand[:2]))
+        self.shoe.discard_all()
+        self.assertEqual(+self.shoe.drawn, Counter())
+        self.assertEqual(Counter(dict(self.shoe.discarded)), Counter(hand))
+        self.assertEqual(len(self.shoe), 35)
+        self.assertEqual(self.shoe.statistics.discarded, 5)
+
+    def test_cut_card(self):
+        for dealt in range(1, 20):
+            self.shoe.draw()
+            self.shoe.discard_all()
+            self.assertEqual(self.shoe.dealt, dealt)
+            self.assertFalse(self.shoe.cut_card_reached)
+        self.shoe.draw()
+        self.assertTrue(self.shoe.cut_card_reached)
+        self.shoe.discard_all()
+        self.assertEqual(len(self.shoe), 40)
+        self.assertEqual(self.shoe.dealt, 0)
+        self.assertEqual(dict(self.shoe.discarded), {})
+        self.assertEqual(self.shoe.statistics.shuffles, 2)
+        self.assertEqual(self.shoe.statistics.dealt, 20)
+        self.assertEqual(Counter(self.shoe.order),
+                         Counter({card: 4 for card in range(10)}))
+
+    def test_in_play_kept(self):
+        self.shoe.draw_many(20)
+        self.shoe.discard_all()
+        in_play = self.shoe.draw_many(3)
+        self.shoe.reshuffle()
+        self.assertEqual(len(self.shoe), 37)
+        self.assertEqual(self.shoe.cut_card, 18)
+        self.assertEqual(self.shoe.drawn, Counter(in_play))
+
+    def test_forced_shuffle(self):
+        cards = self.shoe.draw_many(30)
+        self.shoe.discard(cards)
+        cards = self.shoe.draw_many(25)
+        self.assertEqual(len(cards), 25)
+        self.assertEqual(self.shoe.statistics.forced, 1)
+        self.assertEqual(self.shoe.dealt, 15)
+        self.assertEqual(self.shoe.statistics.dealt, 55)
+        self.assertEqual(len(self.shoe), 15)
+        self.shoe.draw_many(15)
+        self.assertListEqual(self.shoe.draw_many(1), [])
+        with self.assertRaises(StopIteration):
+            self.shoe.draw()
+        self.shoe.discard(self.shoe.drawn.elements())
+        self.shoe.draw()
+        self.assertEqual(self.shoe.statistics.forced, 2)
+
+    def test_manual(self):
+        shoe = Shoe(range(10), decks=2, rng=random.Random(2),
+                    auto_shuffle=False, lazy=False)
+        shoe.draw_many(20)
+        shoe.discard_all()
+        self.assertTrue(shoe.cut_card_reached)
+        self.assertEqual(len(shoe), 0)
+        with self.assertRaises(StopIteration):
+            shoe.draw()
+        shoe.reshuffle()
+        self.assertEqual(len(shoe), 20)
+
+    def test_reset(self):
+        self.shoe.draw_many(10)
+        self.shoe.discard_all()
+        self.shoe.reset()
+        self.assertEqual(len(self.shoe), 40)
+        self.assertEqual(dict(self.shoe.discarded), {})
+        self.assertEqual(self.shoe.statistics.dealt, 10)
+
+    def test_reproducible(self):
+        other = Shoe(range(10), decks=4, penetration=0.5,
+                     rng=random.Random(1))
+        self.assertListEqual(self.shoe.draw_many(40), other.draw_many(40))
+
+    def test_draws_into(self):
+        self.shoe.discard(self.shoe.draw_many(30))
+        buffer = array("l", bytes(8 * 25))
+        self.assertEqual(self.shoe.draws_into(buffer), 25)
+        self.assertEqual(self.shoe.statistics.forced, 1)
+        self.assertEqual(self.shoe.dealt, 15)
+        self.assertEqual(self.shoe.drawn,
+                         Counter(self.shoe.table[i] for i in buffer))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,9 +2,25 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 import unittest
+import os
 import random
+import subprocess
+import sys
 from tabletoprandom.dice.enumdie import EnumDie, ElementValue
 
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))))
+
+SEEDED_ROLLS = """
+import random
+from tabletoprandom.dice.enumdie import EnumDie, ElementValue, FudgeValue
+from tabletoprandom.dice.enumdie import IntEnumDie
+from tabletoprandom.dice.traditional import TraditionalDie
+print(EnumDie(ElementValue, rng=random.Random(42)).roll_array(20))
+print(IntEnumDie(FudgeValue, rng=random.Random(42)).roll_array(20))
+print(list(TraditionalDie(6, rng=random.Random(42)).rolls(20)))
+"""
+
 
 class EnumDie_TestCase(unittest.TestCase):
 
@@ -50,7 +66,7 @@ class EnumDie_TestCase(unittest.TestCase):
         random.seed(seed)
         die_capture = die.roll()
         random.seed(seed)
-        repeat_capture = random.choice(tuple(die.faces))
+        repeat_capture = random.choice(tuple(die.face_enum))
         return die_capture, repeat_capture
 
     def test_rolls(self):
@@ -72,12 +88,45 @@ class EnumDie_TestCase(unittest.TestCase):
         die_captures = list(die.rolls(n))
         random.seed(seed)
         for i in range(n):
-            repeat_captures.append(random.choice(tuple(die.faces)))
+            repeat_captures.append(random.choice(tuple(die.face_enum)))
         return die_captures, repeat_captures
 
+    def test_quick_roll(self):
+        for i in range(10):
+            with self.subTest(i=i):
+                self.assertIn(EnumDie.quick_roll(ElementValue), ElementValue)
+        rolls = EnumDie.quick_rolls(ElementValue, 100)
+        self.assertEqual(len(rolls), 100)
+        self.assertTrue(set(rolls) <= set(ElementValue))
+        self.assertListEqual(EnumDie.quick_rolls(ElementValue, -1), [])
+        self.assertListEqual(
+            EnumDie.quick_rolls(ElementValue, 10, random.Random(1)),
+            EnumDie.quick_rolls(ElementValue, 10, random.Random(1)))
+
+    def test_roll_array(self):
+        rolls = self.dE.roll_array(50)
+        self.assertEqual(len(rolls), 50)
+        self.assertTrue(set(rolls) <= set(ElementValue))
+        self.assertEqual(self.dE.last_roll, rolls[-1])
+
+    def test_shared_faces(self):
+        self.assertIs(EnumDie(ElementValue).faces, self.dE.faces)
+
     def test_str(self):
         self.assertEqual(str(self.dE), "dE")
 
+    def test_hash_seed_independent(self):
+        outputs = set()
+        for hash_seed in ("1", "2", "3"):
+            env = dict(os.environ, PYTHONHASHSEED=hash_seed)
+            result = subprocess.run([sys.executable, "-c", SEEDED_ROLLS],
+                                    cwd=ROOT, env=env, capture_output=True,
+                                    text=True, timeout=60)
+            self.assertEqual(result.returncode, 0, result.stderr)
+            outputs.add(result.stdout)
+        self.assertEqual(len(outputs), 1)
+        self.assertEqual(self.dE._face_tuple, tuple(ElementValue))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,103 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+import random
+import unittest
+from tabletoprandom.dice.exploding import ExplodingDie, RerollDie
+from tabletoprandom.dice.traditional import TraditionalDie
+
+
+class ExplodingDie_TestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.d6 = TraditionalDie(6)
+        self.exploding = ExplodingDie(self.d6, rng=random.Random(1))
+
+    def test_distribution(self):
+        self.assertAlmostEqual(self.exploding.mean, 4.2)
+        self.assertAlmostEqual(self.exploding.probability(5), 1 / 6)
+        self.assertAlmostEqual(self.exploding.probability(7), 1 / 36)
+        self.assertAlmostEqual(self.exploding.probability(14), 1 / 216)
+        self.assertEqual(self.exploding.probability(6), 0.0)
+        self.assertNotIn(12, self.exploding.faces)
+        self.assertAlmostEqual(sum(map(self.exploding.probability,
+                                       self.exploding.faces)), 1.0)
+        self.assertEqual(self.exploding.mode, frozenset(range(1, 6)))
+        self.assertIs(ExplodingDie(self.d6).distribution,
+                      self.exploding.distribution)
+        self.assertEqual(str(self.exploding), "d6!")
+
+    def test_truncation(self):
+        loose = ExplodingDie(self.d6, epsilon=1e-3)
+        self.assertLess(loose.best_roll, self.exploding.best_roll)
+        self.assertGreater(self.exploding.distribution.at_least(30), 0.0)
+        self.assertAlmostEqual(sum(loose.distribution.probabilities), 1.0)
+
+    def test_variants(self):
+        limited = ExplodingDie(TraditionalDie(4), limit=1)
+        self.assertEqual(limited.best_roll, 8)
+        self.assertAlmostEqual(limited.probability(8), 1 / 16)
+        penetrating = ExplodingDie(self.d6, penetrating=True)
+        self.assertAlmostEqual(penetrating.probability(6), 1 / 36)
+        self.assertAlmostEqual(penetrating.mean, 4.0)
+        wide = ExplodingDie(TraditionalDie(10), explode_on={9, 10})
+        self.assertAlmostEqual(wide.mean, 5.5 / 0.8)
+        always = ExplodingDie(TraditionalDie(1), limit=3)
+        self.assertEqual(always.faces, frozenset({4}))
+
+    def test_rolls(self):
+        results = [self.exploding.roll() for _ in range(2000)]
+        self.assertNotIn(6, results)
+        self.assertTrue(all(value % 6 for value in results))
+        array = self.exploding.roll_array(20000)
+        self.assertEqual(len(array), 20000)
+        self.assertEqual(self.exploding.last_roll, array[-1])
+        self.assertAlmostEqual(sum(array) / 20000, 4.2, delta=0.1)
+        self.assertTrue(all(value % 6 for value in array))
+        limited = ExplodingDie(TraditionalDie(4), limit=1)
+        self.assertLessEqual(max(limited.roll_array(1000)), 8)
+        self.assertEqual(set(ExplodingDie(TraditionalDie(1), limit=3)
+                             .roll_array(10)), {4})
+        self.assertEqual(len(self.exploding.roll_array(0)), 0)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            ExplodingDie(self.d6, explode_on={7})
+        with self.assertRaises(ValueError):
+            ExplodingDie(TraditionalDie(1))
+        with self.assertRaises(ValueError):
+            ExplodingDie(self.d6, limit=-1)
+        with self.assertRaises(ValueError):
+            ExplodingDie(self.d6, epsilon=0)
+
+
+class RerollDie_TestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.once = RerollDie(TraditionalDie(6), rng=random.Random(2))
+        self.until = RerollDie(TraditionalDie(6), reroll_on={1, 2},
+                               once=False, rng=random.Random(2))
+
+    def test_distribution(self):
+        self.assertAlmostEqual(self.once.probability(1), 1 / 36)
+        self.assertAlmostEqual(self.once.probability(6), 7 / 36)
+        self.assertAlmostEqual(self.until.probability(3), 1 / 4)
+        self.assertEqual(self.until.faces, frozenset(range(3, 7)))
+        self.assertAlmostEqual(self.until.mean, 4.5)
+        self.assertEqual(str(self.once), "d6r")
+
+    def test_rolls(self):
+        results = self.until.roll_array(1000)
+        self.assertTrue(all(3 <= value <= 6 for value in results))
+        self.assertIn(self.until.roll(), range(3, 7))
+        results = list(self.once.roll_array(36000))
+        self.assertAlmostEqual(results.count(1) / 36000, 1 / 36, delta=0.01)
+        self.assertIn(self.once.roll(), range(1, 7))
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            RerollDie(TraditionalDie(2), reroll_on={1, 2}, once=False)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,7 +3,7 @@ from __future__ import division
 from __future__ import print_function
 import unittest
 import random
-from tabletoprandom.dice.enumdie import IntEnumDie, FudgeValue
+from tabletoprandom.dice.enumdie import IntEnumDie, FudgeValue, ElementValue
 
 
 class IntEnumDie_TestCase(unittest.TestCase):
@@ -23,6 +23,14 @@ class IntEnumDie_TestCase(unittest.TestCase):
     def test_mean(self):
         self.assertEqual(self.dF.mean, FudgeValue.BLANK)
 
+    def test_moments(self):
+        self.assertAlmostEqual(self.dF.variance, 2/3)
+        self.assertEqual(self.dF.skewness, 0.0)
+        self.assertEqual(self.dF.median, FudgeValue.BLANK)
+        self.assertEqual(self.dF.percentile(0.34), FudgeValue.BLANK)
+        self.assertEqual(self.dF.percentile(0.33), FudgeValue.MINUS)
+        self.assertAlmostEqual(self.dF.moments.repeat(4).variance, 8/3)
+
     def test_best_roll(self):
         self.assertEqual(self.dF.best_roll, FudgeValue.PLUS)
 
@@ -59,7 +67,7 @@ class IntEnumDie_TestCase(unittest.TestCase):
         random.seed(seed)
         die_capture = die.roll()
         random.seed(seed)
-        repeat_capture = random.choice(tuple(die.faces))
+        repeat_capture = random.choice(tuple(die.face_enum))
         return die_capture, repeat_capture
 
     def test_rolls(self):
@@ -81,9 +89,23 @@ class IntEnumDie_TestCase(unittest.TestCase):
         die_captures = list(die.rolls(n))
         random.seed(seed)
         for i in range(n):
-            repeat_captures.append(random.choice(tuple(die.faces)))
+            repeat_captures.append(random.choice(tuple(die.face_enum)))
         return die_captures, repeat_captures
 
+    def test_quick_roll(self):
+        self.assertIn(IntEnumDie.quick_roll(FudgeValue), FudgeValue)
+        rolls = IntEnumDie.quick_rolls(FudgeValue, 100)
+        self.assertEqual(len(rolls), 100)
+        self.assertTrue(set(rolls) <= set(FudgeValue))
+        with self.assertRaises(ValueError):
+            IntEnumDie.quick_roll(ElementValue)
+        with self.assertRaises(ValueError):
+            IntEnumDie.quick_rolls(ElementValue, 3)
+
+    def test_bad_initiation(self):
+        with self.assertRaises(ValueError):
+            IntEnumDie(ElementValue)
+
     def test_str(self):
         self.assertEqual(str(self.dF), "dF")
 
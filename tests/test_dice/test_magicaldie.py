@@ -2,6 +2,8 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 import unittest
+import copy
+import pickle
 import random
 from tabletoprandom.dice.magical import MagicalDie
 
@@ -216,11 +218,66 @@ class MagicalDie_TestCase(unittest.TestCase):
                         *self.seed_capture_repeat_capture(i, self.d20)
                     )
 
+    def test_empowered_roll_array(self):
+        self.d6.empower(3)
+        results = list(self.d6.roll_array(10))
+        self.assertListEqual(results[:3], [self.d6.best_roll] * 3)
+        self.assertEqual(self.d6.charge, 0)
+        self.assertEqual(self.d6.last_roll, results[-1])
+        self.d20.empower(5)
+        results = list(self.d20.roll_array(3))
+        self.assertListEqual(results, [20, 20, 20])
+        self.assertEqual(self.d20.charge, 2)
+        self.assertEqual(self.d20.last_roll, 20)
+        results = list(self.d20.roll_array(4))
+        self.assertListEqual(results[:2], [20, 20])
+        self.assertTrue(all(1 <= x <= 20 for x in results))
+        self.assertEqual(self.d20.charge, 0)
+        self.assertEqual(len(self.d3.roll_array(0)), 0)
+
+    def test_roll_array_matches_rolls(self):
+        n = 12000
+        batched = MagicalDie(6, charge=40, rng=random.Random(8))
+        single = MagicalDie(6, charge=40, rng=random.Random(8))
+        batch = list(batched.roll_array(n))
+        rolls = [single.roll() for _ in range(n)]
+        self.assertListEqual(batch[:40], rolls[:40])
+        self.assertEqual(batched.charge, single.charge)
+        for results in (batch[40:], rolls[40:]):
+            for face in range(1, 7):
+                with self.subTest(face=face):
+                    self.assertAlmostEqual(
+                        results.count(face) / len(results), 1 / 6,
+                        delta=0.02)
+
+    def test_distribution(self):
+        self.assertAlmostEqual(self.d6.distribution().mean, 3.5)
+        self.d6.empower(2)
+        distribution = self.d6.distribution(3)
+        self.assertEqual(distribution.minimum, 13)
+        self.assertEqual(distribution.maximum, 18)
+        self.assertAlmostEqual(distribution.pmf(15), 1/6)
+        self.assertEqual(self.d6.distribution(1).pmf(6), 1.0)
+        self.assertEqual(self.d6.charge, 2)
+        with self.assertRaises(ValueError):
+            self.d6.distribution(-1)
+
     def test_face_order(self):
         self.assertEqual(self.d3.face_order, list(range(1, 4)))
         self.assertEqual(self.d6.face_order, list(range(1, 7)))
         self.assertEqual(self.d20.face_order, list(range(1, 21)))
 
+    def test_pickle(self):
+        die = MagicalDie(6, charge=2, rng=random.Random(6))
+        for restored in (pickle.loads(pickle.dumps(die)),
+                         copy.deepcopy(die), pickle.loads(pickle.dumps(
+                             MagicalDie(6, charge=2)))):
+            with self.subTest(restored=restored):
+                self.assertEqual(restored.charge, 2)
+                self.assertListEqual(list(restored.rolls(2)), [6, 6])
+                self.assertEqual(restored.empower(), 1)
+                self.assertEqual(die.charge, 2)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,122 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+import random
+import unittest
+from tabletoprandom.dice.notation import compile_notation, roll_notation
+from tabletoprandom.dice.notation import normalize_notation, MAX_FACES
+from tabletoprandom.dice.notation import MAX_DICE
+
+
+class Notation_TestCase(unittest.TestCase):
+
+    def assertBounds(self, notation, low, high, n=500):
+        results = list(compile_notation(notation).roll_array(n))
+        self.assertEqual(len(results), n)
+        self.assertGreaterEqual(min(results), low)
+        self.assertLessEqual(max(results), high)
+        return results
+
+    def test_normalize(self):
+        self.assertEqual(normalize_notation(" 4D6 kh3 + 2 "), "4d6kh3+2")
+        self.assertEqual(normalize_notation("4dF"), "4df")
+
+    def test_cache(self):
+        expression = compile_notation("4d6kh3+2")
+        other = compile_notation(" 4D6KH3 + 2")
+        self.assertIsNot(other, expression)
+        self.assertIs(other._root, expression._root)
+        self.assertEqual(str(expression), "4d6kh3+2")
+        expression.roll()
+        self.assertIsNone(other.last_roll)
+
+    def test_rng(self):
+        for notation in ("4d6kh3+2", "4df", "d20*2-d%"):
+            with self.subTest(notation=notation):
+                first = compile_notation(notation, random.Random(7))
+                second = compile_notation(notation, random.Random(7))
+                self.assertListEqual(list(first.roll_array(50)),
+                                     list(second.roll_array(50)))
+                self.assertEqual(first.roll(), second.roll())
+                self.assertEqual(roll_notation(notation, random.Random(3)),
+                                 roll_notation(notation, random.Random(3)))
+
+    def test_constants(self):
+        self.assertEqual(roll_notation("7"), 7)
+        self.assertEqual(roll_notation("2+3*4"), 14)
+        self.assertEqual(roll_notation("(2+3)*4"), 20)
+        self.assertEqual(roll_notation("7/2"), 3)
+        self.assertEqual(roll_notation("-7/2"), -4)
+        self.assertEqual(roll_notation("10-2-3"), 5)
+        self.assertEqual(roll_notation("--3"), 3)
+
+    def test_pools(self):
+        self.assertBounds("d6", 1, 6)
+        self.assertBounds("3d6", 3, 18)
+        self.assertBounds("d%", 1, 100)
+        self.assertBounds("4dF", -4, 4)
+        self.assertBounds("2d6+d8*2", 4, 28)
+        results = self.assertBounds("d1+d1", 2, 2)
+        self.assertEqual(set(results), {2})
+
+    def test_keep_and_drop(self):
+        self.assertBounds("4d6kh3", 3, 18)
+        self.assertBounds("4d6k3", 3, 18)
+        self.assertBounds("4d6dl1+2", 5, 20)
+        self.assertBounds("2d20kl1", 1, 20)
+        self.assertBounds("2d20kh", 1, 20)
+        self.assertBounds("5d6dh5", 0, 0)
+        self.assertBounds("3d6kh10", 3, 18)
+        high = sum(compile_notation("2d20kh1").roll_array(4000)) / 4000
+        low = sum(compile_notation("2d20kl1").roll_array(4000)) / 4000
+        self.assertGreater(high, 12.5)
+        self.assertLess(low, 8.5)
+
+    def test_roll(self):
+        expression = compile_notation("3d6+1")
+        self.assertIsNone(expression.last_roll)
+        result = expression.roll()
+        self.assertIn(result, range(4, 20))
+        self.assertEqual(expression.last_roll, result)
+        results = expression.roll_array(10)
+        self.assertEqual(expression.last_roll, results[-1])
+        self.assertEqual(len(expression.roll_array(0)), 0)
+
+    def test_distribution(self):
+        self.assertAlmostEqual(compile_notation("4d6dl1").distribution.mean,
+                               15869 / 1296)
+        advantage = compile_notation("2d20kh1").distribution
+        self.assertAlmostEqual(advantage.pmf(1), 1 / 400)
+        self.assertIs(compile_notation("2d20kh1").distribution, advantage)
+        self.assertEqual(compile_notation("3*d4-1").distribution.values,
+                         range(2, 12))
+        product = compile_notation("d4*d4").distribution
+        self.assertAlmostEqual(product.pmf(4), 3 / 16)
+        self.assertEqual(product.pmf(5), 0.0)
+        self.assertAlmostEqual(compile_notation("d6/2").distribution.pmf(0),
+                               1 / 6)
+        self.assertAlmostEqual(compile_notation("-4df").distribution.mean, 0)
+        with self.assertRaises(ZeroDivisionError):
+            compile_notation("d6/(d2-1)").distribution
+
+    def test_invalid(self):
+        for notation in ("", "d", "4d", "d6+", "(d6", "d6)", "4x6", "0d6",
+                         "d0", "d6kh3x", "2**3"):
+            with self.subTest(notation=notation):
+                with self.assertRaises(ValueError):
+                    compile_notation(notation)
+        with self.assertRaises(ZeroDivisionError):
+            roll_notation("d6/0")
+
+    def test_limits(self):
+        self.assertBounds(f"d{MAX_FACES}", 1, MAX_FACES)
+        self.assertBounds(f"{MAX_DICE}d1", MAX_DICE, MAX_DICE, n=2)
+        for notation in (f"d{MAX_FACES + 1}", "2d1000000000+1",
+                         f"{MAX_DICE + 1}d6", "100000000d6"):
+            with self.subTest(notation=notation):
+                with self.assertRaises(ValueError):
+                    compile_notation(notation)
+
+
+if __name__ == '__main__':
+    unittest.main()
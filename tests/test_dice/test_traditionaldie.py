@@ -2,7 +2,11 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 import unittest
+import copy
+import pickle
 import random
+from array import array
+from tabletoprandom.abstract.batch import CHUNK
 from tabletoprandom.dice.traditional import TraditionalDie
 
 
@@ -35,6 +39,23 @@ class TraditionalDie_TestCase(unittest.TestCase):
         self.assertEqual(self.d6.mean, 3.5)
         self.assertEqual(self.d20.mean, 10.5)
 
+    def test_moments(self):
+        self.assertAlmostEqual(self.d6.variance, 35/12)
+        self.assertAlmostEqual(self.d20.std, (399/12) ** 0.5)
+        self.assertEqual(self.d6.skewness, 0.0)
+        self.assertEqual(self.d3.median, 2)
+        self.assertEqual(self.d6.median, 3)
+        self.assertEqual(self.d20.percentile(0.0), 1)
+        self.assertEqual(self.d20.percentile(0.25), 5)
+        self.assertEqual(self.d20.percentile(0.26), 6)
+        self.assertEqual(self.d20.percentile(1.0), 20)
+        with self.assertRaises(ValueError):
+            self.d6.percentile(2)
+        pool = self.d6.moments.repeat(8) + 3
+        self.assertAlmostEqual(pool.mean, 31.0)
+        self.assertAlmostEqual(pool.variance, 8 * 35/12)
+        self.assertIs(self.d6.moments, self.d6.moments)
+
     def test_best_roll(self):
         self.assertEqual(self.d3.best_roll, 3)
         self.assertEqual(self.d6.best_roll, 6)
@@ -63,6 +84,8 @@ class TraditionalDie_TestCase(unittest.TestCase):
         self.assertEqual(self.d3.faces, set(range(1, 4)))
         self.assertEqual(self.d6.faces, set(range(1, 7)))
         self.assertEqual(self.d20.faces, set(range(1, 21)))
+        self.assertIsInstance(self.d6.faces, frozenset)
+        self.assertIs(self.d6.faces, self.d6.faces)
 
     def test_mode(self):
         self.assertEqual(self.d3.mode, set(range(1, 4)))
@@ -130,6 +153,59 @@ class TraditionalDie_TestCase(unittest.TestCase):
             repeat_captures.append(random.choice(tuple(die.faces)))
         return die_captures, repeat_captures
 
+    def test_roll_array(self):
+        for die in (self.d3, self.d6, self.d20):
+            with self.subTest(die=str(die)):
+                results = die.roll_array(1000)
+                self.assertEqual(len(results), 1000)
+                self.assertTrue(all(x in die.faces for x in results))
+                self.assertEqual(die.last_roll, results[-1])
+                random.seed(die.num_faces)
+                first = list(die.roll_array(50))
+                random.seed(die.num_faces)
+                self.assertListEqual(first, list(die.roll_array(50)))
+        self.assertEqual(len(self.d6.roll_array(0)), 0)
+        self.assertEqual(len(self.d6.roll_array(-10)), 0)
+        self.assertEqual(len(TraditionalDie.quick_roll_array(10, 4)), 10)
+        with self.assertRaises(ValueError):
+            TraditionalDie.quick_roll_array(10, 0)
+
+    def test_rolls_into(self):
+        for typecode in ("b", "H", "l", "q"):
+            with self.subTest(typecode=typecode):
+                buffer = array(typecode, [0]) * (CHUNK + 10)
+                self.assertEqual(self.d20.rolls_into(buffer), len(buffer))
+                self.assertTrue(all(1 <= x <= 20 for x in buffer))
+                self.assertEqual(self.d20.last_roll, buffer[-1])
+        buffer = array("l", [0] * 50)
+        random.seed(3)
+        self.d6.rolls_into(memoryview(buffer)[10:])
+        random.seed(3)
+        self.assertListEqual(list(buffer[10:]), list(self.d6.roll_array(40)))
+        self.assertListEqual(list(buffer[:10]), [0] * 10)
+        self.assertEqual(self.d6.rolls_into(array("l")), 0)
+        with self.assertRaises(TypeError):
+            self.d6.rolls_into(array("d", [0.0]))
+        with self.assertRaises(TypeError):
+            self.d6.rolls_into(bytes(4))
+
+    def test_pickle(self):
+        for die in (self.d6, TraditionalDie(8, rng=random.Random(4))):
+            with self.subTest(die=str(die)):
+                die.roll()
+                restored = pickle.loads(pickle.dumps(die))
+                self.assertEqual(restored.num_faces, die.num_faces)
+                self.assertEqual(restored.faces, die.faces)
+                self.assertEqual(restored.last_roll, die.last_roll)
+                self.assertIn(restored.roll(), die.faces)
+        self.assertIs(pickle.loads(pickle.dumps(self.d6)).rng, random)
+        self.assertIs(copy.deepcopy(self.d6).rng, random)
+        seeded = TraditionalDie(20, rng=random.Random(5))
+        restored = copy.deepcopy(seeded)
+        self.assertIsNot(restored.rng, seeded.rng)
+        self.assertListEqual(list(restored.rolls(10)),
+                             list(seeded.rolls(10)))
+
     def test_bad_initiation(self):
         with self.assertRaises(ValueError):
             TraditionalDie(0)
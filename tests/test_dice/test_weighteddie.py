@@ -0,0 +1,82 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+import unittest
+import random
+from collections import Counter
+from tabletoprandom.dice.enumdie import ElementValue
+from tabletoprandom.dice.weighted import WeightedDie, WeightedNumericDie
+from tabletoprandom.dice.weighted import WeightedEnumDie
+
+
+class WeightedDie_TestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.loot = WeightedDie({"gold": 5, "gem": 1, "junk": 4},
+                                rng=random.Random(1))
+        self.loaded = WeightedNumericDie({1: 1, 2: 1, 3: 1, 4: 1, 5: 1, 6: 5},
+                                         rng=random.Random(2))
+        self.dE = WeightedEnumDie(ElementValue, {ElementValue.FIRE: 3,
+                                                 ElementValue.WATER: 1},
+                                  rng=random.Random(3))
+
+    def test_num_faces(self):
+        self.assertEqual(self.loot.num_faces, 3)
+        self.assertEqual(len(self.loaded), 6)
+        self.assertEqual(len(self.dE), 4)
+
+    def test_probability(self):
+        self.assertAlmostEqual(self.loot.probability("gold"), 0.5)
+        self.assertAlmostEqual(self.loot.probability("gem"), 0.1)
+        self.assertEqual(self.loot.probability("sword"), 0.0)
+        self.assertAlmostEqual(self.loaded.probability(6), 0.5)
+        self.assertEqual(self.dE.probability(ElementValue.AIR), 0.0)
+        self.assertFalse(self.loot.is_fair)
+
+    def test_mode(self):
+        self.assertEqual(self.loot.mode, {"gold"})
+        self.assertEqual(self.loaded.mode, {6})
+        self.assertEqual(WeightedDie({1: 1, 2: 1}).mode, {1, 2})
+
+    def test_numeric(self):
+        self.assertAlmostEqual(self.loaded.mean, 4.5)
+        self.assertEqual(self.loaded.best_roll, 6)
+        self.assertEqual(self.loaded.worst_roll, 1)
+        self.assertEqual(self.loaded.face_order, [1, 2, 3, 4, 5, 6])
+
+    def test_roll_frequencies(self):
+        for die in (self.loot, self.loaded, self.dE):
+            with self.subTest(die=die):
+                n = 20000
+                counts = Counter(die.rolls(n // 2))
+                counts.update(die.roll_array(n // 2))
+                for face in die.faces:
+                    self.assertAlmostEqual(counts[face] / n,
+                                           die.probability(face), delta=0.02)
+
+    def test_roll_array(self):
+        results = self.loaded.roll_array(100)
+        self.assertEqual(len(results), 100)
+        self.assertEqual(self.loaded.last_roll, results[-1])
+        self.assertEqual(len(self.loot.roll_array(0)), 0)
+        first = WeightedDie({"a": 1, "b": 2}, rng=random.Random(4))
+        second = WeightedDie({"a": 1, "b": 2}, rng=random.Random(4))
+        self.assertListEqual(list(first.roll_array(50)),
+                             list(second.roll_array(50)))
+
+    def test_str(self):
+        self.assertEqual(str(self.dE), "dWE")
+
+    def test_bad_initiation(self):
+        with self.assertRaises(ValueError):
+            WeightedDie({1: -1, 2: 2})
+        with self.assertRaises(ValueError):
+            WeightedDie({1: 0})
+        with self.assertRaises(ValueError):
+            WeightedDie({})
+        with self.assertRaises(ValueError):
+            WeightedEnumDie(ElementValue, {1: 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
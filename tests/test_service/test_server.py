@@ -0,0 +1,119 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+import asyncio
+import json
+import random
+import unittest
+from tabletoprandom.abstract.deck import Deck
+from tabletoprandom.dice.enumdie import EnumDie, ElementValue
+from tabletoprandom.service.client import RollClient
+from tabletoprandom.service.server import RollService, MAX_LINE
+
+
+class RollService_TestCase(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.deck = Deck(range(20), rng=random.Random(1))
+        self.service = RollService(
+            dice={"element": EnumDie(ElementValue, rng=random.Random(1))},
+            decks={"numbers": self.deck}, max_count=1000)
+        self.server = await self.service.start("127.0.0.1", 0)
+        port = self.server.sockets[0].getsockname()[1]
+        self.client = await RollClient.connect("127.0.0.1", port)
+
+    async def asyncTearDown(self):
+        await self.client.close()
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def test_roll(self):
+        results = await self.client.roll("2d6+1", 50)
+        self.assertEqual(len(results), 50)
+        self.assertTrue(all(3 <= x <= 13 for x in results))
+        elements = await self.client.roll("element", 10)
+        names = {member.name for member in ElementValue}
+        self.assertTrue(set(elements) <= names)
+
+    async def test_draw(self):
+        first = await self.client.draw("numbers", 5)
+        rest = await self.client.draw("numbers", 50)
+        self.assertListEqual(first, list(range(5)))
+        self.assertListEqual(rest, list(range(5, 20)))
+        self.assertListEqual(await self.client.draw("numbers"), [])
+
+    async def test_errors(self):
+        for request in ({"op": "roll", "die": "3q6"},
+                        {"op": "roll", "die": "1d6", "n": 1001},
+                        {"op": "roll", "die": "1d6", "n": -1},
+                        {"op": "roll", "die": "1000000000d6"},
+                        {"op": "roll", "die": "d1000000000"},
+                        {"op": "roll", "die": "501d6+500d6"},
+                        {"op": "roll", "die": "400d6", "n": 3},
+                        {"op": "draw", "deck": "missing"},
+                        {"op": "shuffle"}):
+            with self.subTest(request=request):
+                with self.assertRaises(ValueError):
+                    await self.client.request(**request)
+        self.assertEqual(len(await self.client.roll("d4")), 1)
+
+    async def test_coalescing(self):
+        results = await asyncio.gather(
+            *(self.client.roll("d20", 3) for _ in range(50)),
+            *(self.client.draw("numbers", 1) for _ in range(10)))
+        self.assertTrue(all(len(r) == 3 for r in results[:50]))
+        drawn = [r[0] for r in results[50:]]
+        self.assertListEqual(sorted(drawn), list(range(10)))
+        self.assertEqual(self.service.requests, 60)
+        self.assertLess(self.service.batches, 60)
+
+    async def test_batch_limit(self):
+        rolls = await asyncio.gather(
+            *(self.service.roll("300d6", 1) for _ in range(7)))
+        self.assertTrue(all(300 <= r[0] <= 1800 for r in rolls))
+        self.assertEqual(self.service.batches, 3)
+
+    async def test_failed_batch(self):
+        class Broken:
+            def roll_array(self, n):
+                raise MemoryError
+
+        self.service.dice["broken"] = Broken()
+        with self.assertRaises(ValueError):
+            await self.client.roll("broken", 10)
+        self.assertEqual(len(await self.client.roll("d4")), 1)
+
+    async def test_direct(self):
+        rolls = await asyncio.gather(
+            *(self.service.roll("1d6", 2) for _ in range(5)))
+        self.assertEqual(self.service.batches, 1)
+        self.assertEqual(sum(map(len, rolls)), 10)
+
+    async def test_malformed_line(self):
+        port = self.server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(b"not json\n[1, 2]\n")
+        await writer.drain()
+        for _ in range(2):
+            response = json.loads(await reader.readline())
+            self.assertIn("error", response)
+        writer.close()
+        await writer.wait_closed()
+
+    async def test_overlong_line(self):
+        port = self.server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(b'{"op": "roll", "die": "d6"}\n')
+        writer.write(b" " * (MAX_LINE + 4000) + b"\n")
+        await writer.drain()
+        responses = [json.loads(await reader.readline()) for _ in range(2)]
+        self.assertIn("results", responses[0])
+        self.assertIn("error", responses[1])
+        self.assertEqual(await reader.readline(), b"")
+        writer.close()
+        await writer.wait_closed()
+
+    async def test_closed(self):
+        await self.client.close()
+        with self.assertRaises(ConnectionError):
+            await self.client.roll("d6")
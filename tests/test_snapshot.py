@@ -0,0 +1,108 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+import os
+import pickle
+import random
+import tempfile
+import unittest
+from tabletoprandom.abstract.deck import Deck
+from tabletoprandom.decks.indexed import IndexedDeck
+from tabletoprandom.dice.enumdie import EnumDie, IntEnumDie
+from tabletoprandom.dice.enumdie import ElementValue, FudgeValue
+from tabletoprandom.dice.magical import MagicalDie
+from tabletoprandom.dice.traditional import TraditionalDie
+from tabletoprandom.snapshot import SnapshotReader, dumps, loads, pack
+from tabletoprandom.snapshot import save, unpack
+
+
+class Snapshot_TestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.rng = random.Random(1234)
+        self.deck = Deck([1, True, "a", "a", (2, 3)] * 4, rng=self.rng)
+        self.deck.shuffle()
+        self.deck.draw_many(7)
+        self.deck.return_card("b", place_top=True)
+        self.indexed = IndexedDeck("abcdef" * 3, rng=random.Random(5))
+        self.indexed.shuffle()
+        self.indexed.draw_many(4)
+        self.indexed.return_card("z", place_top=True)
+        self.magical = MagicalDie(20, charge=3, rng=self.rng)
+        self.magical.roll()
+
+    def test_dice(self):
+        dice = [TraditionalDie(8, rng=random.Random(3)), self.magical,
+                EnumDie(ElementValue, rng=random.Random(4)),
+                IntEnumDie(FudgeValue, rng=random.Random(6))]
+        for die in dice:
+            die.roll()
+        for die in dice:
+            with self.subTest(die=str(die)):
+                restored = loads(dumps(die))
+                self.assertIs(type(restored), type(die))
+                self.assertEqual(restored.faces, die.faces)
+                self.assertEqual(restored.last_roll, die.last_roll)
+                self.assertEqual(list(restored.rolls(20)),
+                                 list(die.rolls(20)))
+        self.assertEqual(loads(dumps(self.magical)).charge, 0)
+        self.assertIs(loads(dumps(TraditionalDie())).rng, random)
+
+    def test_deck(self):
+        restored = loads(dumps(self.deck))
+        self.assertListEqual(list(restored.deck), list(self.deck.deck))
+        self.assertListEqual([type(card) for card in restored.deck],
+                             [type(card) for card in self.deck.deck])
+        self.assertDictEqual(dict(restored.pool), dict(self.deck.pool))
+        self.assertEqual(restored.drawn, self.deck.drawn)
+        self.assertEqual(restored.last_draw, self.deck.last_draw)
+        restored.shuffle()
+        self.deck.shuffle()
+        self.assertListEqual(restored.peek(20), self.deck.peek(20))
+        self.assertDictEqual(dict(restored.reset()), dict(self.deck.reset()))
+
+    def test_indexed_deck(self):
+        restored = loads(dumps(self.indexed))
+        self.assertEqual(restored.table, self.indexed.table)
+        self.assertDictEqual(dict(restored.pool), dict(self.indexed.pool))
+        self.assertEqual(restored.drawn, self.indexed.drawn)
+        # The pending lazy shuffle is kept and fixed identically
+        self.assertListEqual(restored.order, self.indexed.order)
+        self.assertListEqual(restored.draw_many(20),
+                             self.indexed.draw_many(20))
+        restored.reset()
+        self.indexed.reset()
+        self.assertListEqual(restored.order, self.indexed.order)
+
+    def test_shared_generator(self):
+        deck, die = unpack(pack([self.deck, self.magical]))
+        self.assertIs(deck.rng, die.rng)
+        self.assertIsNot(deck.rng, self.rng)
+
+    def test_file(self):
+        objects = [self.deck, self.indexed, self.magical] * 10
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "sessions.ttrs")
+            save(objects, path)
+            with SnapshotReader.open(path) as reader:
+                self.assertEqual(len(reader), 30)
+                self.assertEqual(reader[-1].charge, 2)
+                self.assertEqual(reader[4].drawn, self.indexed.drawn)
+                self.assertEqual(len(reader[3:9:3]), 2)
+                with self.assertRaises(IndexError):
+                    reader[30]
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            dumps(object())
+        with self.assertRaises(ValueError):
+            dumps(TraditionalDie(rng=random.SystemRandom()))
+        with self.assertRaises(ValueError):
+            loads(b"TTRX" + bytes(60))
+        with self.assertRaises(ValueError):
+            loads(b"")
+
+    def test_deck_pickles(self):
+        restored = pickle.loads(pickle.dumps(self.deck))
+        restored.draw()
+        self.assertDictEqual(dict(restored.pool), dict(restored._pool))
@@ -0,0 +1,116 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+import random
+import unittest
+from itertools import product
+from tabletoprandom.dice.traditional import TraditionalDie
+from tabletoprandom.dice.enumdie import IntEnumDie, FudgeValue
+from tabletoprandom.stats.distribution import Distribution
+
+
+class Distribution_TestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.d6 = Distribution.from_die(TraditionalDie(6))
+        self.d20 = Distribution.from_die(TraditionalDie(20))
+        self.dF = Distribution.from_die(IntEnumDie(FudgeValue))
+
+    def test_from_die(self):
+        self.assertEqual(self.d6.minimum, 1)
+        self.assertEqual(self.d6.maximum, 6)
+        for face in range(1, 7):
+            with self.subTest(face=face):
+                self.assertAlmostEqual(self.d6.pmf(face), 1/6)
+        self.assertEqual(self.d6.pmf(0), 0.0)
+        self.assertEqual(self.d6.pmf(7), 0.0)
+        self.assertEqual(self.dF.values, range(-1, 2))
+        self.assertIs(Distribution.from_die(TraditionalDie(6)), self.d6)
+
+    def test_moments(self):
+        self.assertAlmostEqual(self.d6.mean, 3.5)
+        self.assertAlmostEqual(self.d6.variance, 35/12)
+        self.assertAlmostEqual(self.d20.mean, 10.5)
+        self.assertAlmostEqual(self.dF.mean, 0.0)
+        self.assertAlmostEqual(self.dF.variance, 2/3)
+
+    def test_sum_matches_enumeration(self):
+        two_d6 = self.d6 + self.d6
+        counts = [0] * 13
+        for a, b in product(range(1, 7), repeat=2):
+            counts[a + b] += 1
+        for total in range(2, 13):
+            with self.subTest(total=total):
+                self.assertAlmostEqual(two_d6.pmf(total), counts[total]/36)
+        self.assertEqual(self.d6.repeat(2), two_d6)
+
+    def test_repeat(self):
+        eight_d6 = self.d6.repeat(8)
+        self.assertEqual(eight_d6.minimum, 8)
+        self.assertEqual(eight_d6.maximum, 48)
+        self.assertAlmostEqual(eight_d6.mean, 28.0)
+        self.assertAlmostEqual(eight_d6.variance, 8 * 35/12)
+        self.assertAlmostEqual(sum(eight_d6.probabilities), 1.0)
+        hundred_d20 = self.d20.repeat(100)
+        self.assertAlmostEqual(hundred_d20.mean, 1050.0)
+        self.assertAlmostEqual(hundred_d20.variance, 100 * 399/12)
+        self.assertEqual(hundred_d20.minimum, 100)
+        self.assertEqual(hundred_d20.maximum, 2000)
+        self.assertAlmostEqual(hundred_d20.pmf(2000) / 20.0 ** -100, 1.0)
+        self.assertAlmostEqual(hundred_d20.pmf(100) / 20.0 ** -100, 1.0)
+        hundred_d6 = self.d6.repeat(100)
+        self.assertAlmostEqual(hundred_d6.pmf(100) / 6.0 ** -100, 1.0)
+        self.assertAlmostEqual(hundred_d6.at_least(600) / 6.0 ** -100, 1.0)
+        self.assertLess(hundred_d6.at_least(550), 1e-30)
+        self.assertEqual(self.d20.repeat(30).minimum, 30)
+        self.assertIs(self.d20.repeat(100), hundred_d20)
+        self.assertEqual(self.d6.repeat(0), Distribution.constant(0))
+        with self.assertRaises(ValueError):
+            self.d6.repeat(-1)
+
+    def test_offset_and_scale(self):
+        shifted = self.d6.repeat(8) + 3
+        self.assertEqual(shifted.minimum, 11)
+        self.assertAlmostEqual(shifted.at_least(51), 1/6**8)
+        self.assertAlmostEqual(shifted.at_least(11), 1.0)
+        self.assertEqual(shifted.at_least(52), 0.0)
+        doubled = 2 * self.d6
+        self.assertEqual(list(doubled.values), list(range(2, 13)))
+        self.assertAlmostEqual(doubled.pmf(4), 1/6)
+        self.assertEqual(doubled.pmf(5), 0.0)
+        negated = -self.d6
+        self.assertEqual(negated.minimum, -6)
+        self.assertAlmostEqual((self.d6 - self.d6).mean, 0.0)
+        self.assertAlmostEqual((10 - self.d6).mean, 6.5)
+
+    def test_cdf_and_quantile(self):
+        self.assertEqual(self.d6.cdf(0), 0.0)
+        self.assertAlmostEqual(self.d6.cdf(3), 0.5)
+        self.assertEqual(self.d6.cdf(6), 1.0)
+        self.assertEqual(self.d6.quantile(0.5), 3)
+        self.assertEqual(self.d6.quantile(0.51), 4)
+        self.assertEqual(self.d6.quantile(1.0), 6)
+        self.assertEqual(self.d6.quantile(0.0), 1)
+        self.assertEqual((self.d6 + self.d6).median, 7)
+        with self.assertRaises(ValueError):
+            self.d6.quantile(1.5)
+
+    def test_sample(self):
+        rng = random.Random(7)
+        skewed = Distribution(-2, [0.5, 0.0, 0.25, 0.25])
+        self.assertIn(skewed.sample(rng), (-2, 0, 1))
+        samples = list(skewed.sample_array(4000, rng))
+        self.assertEqual(len(samples), 4000)
+        self.assertSetEqual(set(samples), {-2, 0, 1})
+        self.assertAlmostEqual(samples.count(-2) / 4000, 0.5, delta=0.05)
+        self.assertEqual(len(self.d6.sample_array(0, rng)), 0)
+        self.assertEqual(list(Distribution.constant(3).sample_array(2)),
+                         [3, 3])
+
+    def test_bad_distribution(self):
+        with self.assertRaises(ValueError):
+            Distribution(0, [0.0, 0.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
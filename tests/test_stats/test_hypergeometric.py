@@ -0,0 +1,84 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+import unittest
+from itertools import combinations
+from math import comb, log
+from tabletoprandom.abstract.deck import Deck
+from tabletoprandom.decks.indexed import IndexedDeck
+from tabletoprandom.stats import hypergeometric
+
+
+def brute_force(cards, draws, accept):
+    hands = list(combinations(cards, draws))
+    return sum(1 for hand in hands if accept(hand)) / len(hands)
+
+
+class Hypergeometric_TestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.cards = ["A"] * 4 + ["K"] * 3 + ["Q"] * 2 + list("xyzw")
+        self.deck = Deck(self.cards)
+
+    def test_log_factorial(self):
+        self.assertAlmostEqual(hypergeometric.log_factorial(0), 0.0)
+        self.assertAlmostEqual(hypergeometric.log_factorial(10),
+                               log(3628800))
+        self.assertAlmostEqual(hypergeometric.log_comb(52, 5),
+                               log(comb(52, 5)))
+
+    def test_single_type(self):
+        for draws in range(0, 14):
+            for target in range(0, 5):
+                with self.subTest(draws=draws, target=target):
+                    self.assertAlmostEqual(
+                        self.deck.probability_at_least({"A": target}, draws),
+                        brute_force(self.cards, draws,
+                                    lambda h: h.count("A") >= target))
+                    self.assertAlmostEqual(
+                        self.deck.probability_exactly({"A": target}, draws),
+                        brute_force(self.cards, draws,
+                                    lambda h: h.count("A") == target))
+
+    def test_several_types(self):
+        for draws in range(0, 8):
+            with self.subTest(draws=draws):
+                self.assertAlmostEqual(
+                    self.deck.probability_at_least({"A": 1, "K": 2}, draws),
+                    brute_force(self.cards, draws, lambda h: (
+                        h.count("A") >= 1 and h.count("K") >= 2)))
+                self.assertAlmostEqual(
+                    self.deck.probability_exactly({"A": 2, "Q": 1}, draws),
+                    brute_force(self.cards, draws, lambda h: (
+                        h.count("A") == 2 and h.count("Q") == 1)))
+
+    def test_groups(self):
+        royals = frozenset("KQ")
+        self.assertAlmostEqual(
+            self.deck.probability_at_least({royals: 2, "A": 1}, 5),
+            brute_force(self.cards, 5, lambda h: (
+                h.count("K") + h.count("Q") >= 2 and h.count("A") >= 1)))
+        with self.assertRaises(ValueError):
+            self.deck.probability_at_least({royals: 1, "K": 1}, 5)
+
+    def test_live_deck(self):
+        deck = IndexedDeck(range(52))
+        aces = frozenset(range(0, 52, 13))
+        before = deck.probability_at_least({aces: 2}, 7)
+        deck.draw_many(4)
+        self.assertNotAlmostEqual(
+            deck.probability_at_least({aces: 2}, 7), before)
+        self.assertAlmostEqual(deck.probability_at_least({aces: 1}, 100),
+                               1.0)
+        self.assertEqual(deck.probability_exactly({aces: 5}, 7), 0.0)
+        self.assertEqual(deck.probability_at_least({"missing": 1}, 7), 0.0)
+
+    def test_bad_arguments(self):
+        with self.assertRaises(ValueError):
+            hypergeometric.probability_at_least(10, [11], [1], 3)
+        with self.assertRaises(ValueError):
+            hypergeometric.probability_exactly(10, [4], [1], 11)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+import unittest
+from tabletoprandom.dice.traditional import TraditionalDie
+from tabletoprandom.dice.weighted import WeightedNumericDie
+from tabletoprandom.stats.distribution import Distribution
+from tabletoprandom.stats.moments import Moments
+
+
+class Moments_TestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.d4 = TraditionalDie(4)
+        self.d8 = TraditionalDie(8)
+        self.skewed = WeightedNumericDie({1: 6, 2: 3, 3: 1})
+
+    def test_generic_matches_closed_form(self):
+        generic = Moments.from_probabilities(
+            (x, self.d8.probability(x)) for x in self.d8.faces)
+        self.assertAlmostEqual(generic.mean, self.d8.mean)
+        self.assertAlmostEqual(generic.variance, self.d8.variance)
+        self.assertAlmostEqual(generic.third, 0.0)
+
+    def test_skewed(self):
+        self.assertAlmostEqual(self.skewed.mean, 1.5)
+        self.assertAlmostEqual(self.skewed.variance, 0.45)
+        self.assertGreater(self.skewed.skewness, 0)
+        self.assertEqual(self.skewed.median, 1)
+        self.assertEqual(self.skewed.percentile(0.61), 2)
+        self.assertEqual(self.skewed.percentile(0.95), 3)
+
+    def test_sums_match_distribution(self):
+        pool = self.d4.moments.repeat(3) + self.d8.moments * 2 - 1
+        distribution = (Distribution.from_die(self.d4).repeat(3)
+                        + 2 * Distribution.from_die(self.d8) - 1)
+        exact = distribution.moments
+        self.assertAlmostEqual(pool.mean, exact.mean)
+        self.assertAlmostEqual(pool.variance, exact.variance)
+        self.assertAlmostEqual(pool.third, exact.third)
+        skewed = self.skewed.moments.repeat(5)
+        exact = Distribution.from_die(self.skewed).repeat(5).moments
+        self.assertAlmostEqual(skewed.skewness, exact.skewness)
+
+    def test_arithmetic(self):
+        moments = Moments(2.0, 1.0, 0.5)
+        self.assertAlmostEqual((-moments).third, -0.5)
+        self.assertAlmostEqual((10 - moments).mean, 8.0)
+        self.assertEqual(Moments(3.0).skewness, 0.0)
+        self.assertEqual(moments.repeat(0).variance, 0.0)
+        with self.assertRaises(ValueError):
+            moments.repeat(-1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+import unittest
+from collections import Counter
+from itertools import product
+from tabletoprandom.dice.enumdie import IntEnumDie, FudgeValue
+from tabletoprandom.dice.traditional import TraditionalDie
+from tabletoprandom.dice.weighted import WeightedNumericDie
+from tabletoprandom.stats.distribution import Distribution
+from tabletoprandom.stats.orderstats import drop_highest, drop_lowest
+from tabletoprandom.stats.orderstats import keep_highest, keep_lowest
+
+
+def enumerate_keep(die, count, keep, highest=True):
+    """Returns the distribution of a kept sum by enumerating every roll"""
+    outcomes = Counter()
+    faces = die.face_order
+    for rolls in product(faces, repeat=count):
+        probability = 1.0
+        for face in rolls:
+            probability *= die.probability(face)
+        ordered = sorted(int(face) for face in rolls)
+        kept = ordered[len(ordered) - keep:] if highest else ordered[:keep]
+        outcomes[sum(kept)] += probability
+    offset = min(outcomes)
+    return Distribution(offset, [outcomes[offset + i] for i in
+                                 range(max(outcomes) - offset + 1)])
+
+
+class OrderStatistics_TestCase(unittest.TestCase):
+
+    def assertDistributionAlmostEqual(self, first, second):
+        self.assertEqual(first.values, second.values)
+        for a, b in zip(first.probabilities, second.probabilities):
+            self.assertAlmostEqual(a, b)
+
+    def test_against_enumeration(self):
+        dice = [TraditionalDie(6), TraditionalDie(4),
+                IntEnumDie(FudgeValue),
+                WeightedNumericDie({1: 1, 2: 0, 3: 5, 7: 2})]
+        for die in dice:
+            for count, keep in ((2, 1), (4, 3), (5, 2)):
+                with self.subTest(die=str(die), count=count, keep=keep):
+                    self.assertDistributionAlmostEqual(
+                        keep_highest(die, count, keep),
+                        enumerate_keep(die, count, keep))
+                    self.assertDistributionAlmostEqual(
+                        keep_lowest(die, count, keep),
+                        enumerate_keep(die, count, keep, highest=False))
+
+    def test_common_mechanics(self):
+        d6 = TraditionalDie(6)
+        d20 = TraditionalDie(20)
+        self.assertAlmostEqual(drop_lowest(d6, 4, 1).mean, 15869 / 1296)
+        self.assertAlmostEqual(keep_highest(d20, 2, 1).pmf(20), 39 / 400)
+        self.assertAlmostEqual(keep_lowest(d20, 2, 1).pmf(20), 1 / 400)
+        self.assertEqual(drop_highest(d6, 3, 1), keep_lowest(d6, 3, 2))
+        large = keep_highest(TraditionalDie(10), 20, 5)
+        self.assertEqual(large.values, range(5, 51))
+        self.assertAlmostEqual(sum(large.probabilities), 1.0)
+
+    def test_edges(self):
+        d6 = TraditionalDie(6)
+        self.assertEqual(keep_highest(d6, 3, 0), Distribution.constant(0))
+        self.assertEqual(keep_lowest(d6, 3, 5),
+                         Distribution.from_die(d6).repeat(3))
+        self.assertEqual(drop_lowest(d6, 2, 2), Distribution.constant(0))
+        with self.assertRaises(ValueError):
+            keep_highest(d6, -1, 1)
+        with self.assertRaises(ValueError):
+            keep_lowest(WeightedNumericDie({0.5: 1, 1: 1}), 2, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+import unittest
+from tabletoprandom.dice.magical import MagicalDie
+from tabletoprandom.dice.traditional import TraditionalDie
+from tabletoprandom.stats.simulation import MonteCarlo, SimulationResult
+
+
+def setup_d6(rng):
+    return TraditionalDie(6, rng=rng)
+
+
+def roll(die):
+    return die.roll()
+
+
+def setup_magical(rng):
+    return MagicalDie(6, charge=1, rng=rng)
+
+
+def roll_twice(die):
+    return die.roll() + die.roll()
+
+
+class MonteCarlo_TestCase(unittest.TestCase):
+
+    def test_run(self):
+        result = MonteCarlo(roll, setup_d6, seed=1, workers=1,
+                            chunk_size=1000).run(6000)
+        self.assertEqual(result.trials, 6000)
+        self.assertEqual(sum(result.counts.values()), 6000)
+        self.assertEqual(set(result.counts), set(range(1, 7)))
+        for face in range(1, 7):
+            with self.subTest(face=face):
+                low, high = result.interval(face, 0.999)
+                self.assertLess(low, 1/6)
+                self.assertGreater(high, 1/6)
+        low, high = result.mean_interval(0.999)
+        self.assertLess(low, 3.5)
+        self.assertGreater(high, 3.5)
+        self.assertFalse(result.stopped_early)
+
+    def test_reproducible(self):
+        first = MonteCarlo(roll, setup_d6, seed=7, workers=1,
+                           chunk_size=100).run(1050)
+        second = MonteCarlo(roll, setup_d6, seed=7, workers=1,
+                            chunk_size=100).run(1050)
+        self.assertEqual(first.counts, second.counts)
+        self.assertEqual(first.trials, 1050)
+
+    def test_processes(self):
+        serial = MonteCarlo(roll_twice, setup_magical, seed=3, workers=1,
+                            chunk_size=500).run(2000)
+        parallel = MonteCarlo(roll_twice, setup_magical, seed=3, workers=2,
+                              chunk_size=500).run(2000)
+        self.assertEqual(serial.counts, parallel.counts)
+        self.assertEqual(parallel.trials, 2000)
+
+    def test_early_stopping(self):
+        result = MonteCarlo(roll, setup_d6, seed=1, workers=1,
+                            chunk_size=1000).run(10**6, precision=0.01)
+        self.assertTrue(result.stopped_early)
+        self.assertLess(result.trials, 10**6)
+        self.assertLessEqual(result.half_width(), 0.01)
+
+    def test_bad_arguments(self):
+        with self.assertRaises(ValueError):
+            MonteCarlo(roll, setup_d6, chunk_size=0)
+        for trials in (0, -5):
+            with self.subTest(trials=trials):
+                with self.assertRaises(ValueError):
+                    MonteCarlo(roll, setup_d6, seed=1, workers=1).run(trials)
+        with self.assertRaises(ValueError):
+            SimulationResult({}, 0).interval(1, confidence=1.5)
+
+
+if __name__ == '__main__':
+    unittest.main()